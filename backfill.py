@@ -0,0 +1,112 @@
+"""Backfill the local announcement archive from the announcements index
+
+    python backfill.py                      # every locale of ANNOUNCEMENT_FEEDS
+    python backfill.py --locale en-US --concurrency 8 --rate 10
+"""
+import argparse
+import asyncio
+import math
+import time
+import aiohttp
+from modules.announcements import ANNOUNCEMENTS_PATH, parse_feeds
+from modules.archive import AnnouncementArchive
+from utils.logger import setup_logger
+from config.settings import settings
+
+logger = setup_logger('backfill')
+
+class RateLimiter:
+    """Spaces request starts at least 1/rate seconds apart"""
+
+    def __init__(self, rate):
+        self.interval = 1 / rate
+        self.next_at = 0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        async with self._lock:
+            now = time.monotonic()
+            if self.next_at > now:
+                await asyncio.sleep(self.next_at - now)
+            self.next_at = max(now, self.next_at) + self.interval
+
+async def fetch_page(session, url, limiter, locale, page, limit, retries=3):
+    """Fetch one page, backing off on rate-limit errors"""
+    params = {'locale': locale, 'page': page, 'limit': limit}
+    for attempt in range(retries + 1):
+        await limiter.wait()
+        try:
+            async with session.get(url, params=params) as response:
+                data = await response.json(content_type=None) if response.status == 200 else None
+
+            if data and data.get('retCode') == 0:
+                return data['result']
+            logger.warning(f"Page {page} ({locale}) failed: {data.get('retMsg') if data else response.status}")
+
+        except Exception as e:
+            logger.warning(f"Page {page} ({locale}) error: {str(e)}")
+
+        await asyncio.sleep(2 ** attempt)
+
+    logger.error(f"Giving up on page {page} ({locale})")
+    return None
+
+async def backfill_locale(session, url, archive, limiter, locale, limit, concurrency):
+    """Archive every page of one locale, return (pages, new announcements)"""
+    first = await fetch_page(session, url, limiter, locale, 1, limit)
+    if first is None:
+        return 0, 0
+
+    added = archive.add_many(first.get('list', []), locale)
+    pages = math.ceil(int(first.get('total', 0)) / limit)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(page):
+        async with semaphore:
+            result = await fetch_page(session, url, limiter, locale, page, limit)
+        if result is None:
+            return 0
+        return await asyncio.to_thread(archive.add_many, result.get('list', []), locale)
+
+    added += sum(await asyncio.gather(*(run(page) for page in range(2, pages + 1))))
+    logger.info(f"Backfilled {locale}: {pages} pages, {added} new announcements")
+    return pages, added
+
+async def backfill(archive, base_url=None, locales=None, limit=20, concurrency=None, rate=None):
+    """Page through the announcements index of each locale into the archive"""
+    url = (base_url or settings.ANNOUNCEMENTS_BASE_URL).rstrip('/') + ANNOUNCEMENTS_PATH
+    locales = locales or sorted({feed['locale'] for feed in parse_feeds(settings.ANNOUNCEMENT_FEEDS)})
+    limiter = RateLimiter(rate or settings.BACKFILL_RATE)
+    concurrency = concurrency or settings.BACKFILL_CONCURRENCY
+
+    async with aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=concurrency),
+        timeout=aiohttp.ClientTimeout(total=settings.HTTP_TIMEOUT)
+    ) as session:
+        results = await asyncio.gather(*(
+            backfill_locale(session, url, archive, limiter, locale, limit, concurrency)
+            for locale in locales
+        ))
+
+    return sum(added for _, added in results)
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill the announcement archive")
+    parser.add_argument('--locale', action='append', help="Locale to backfill (repeatable)")
+    parser.add_argument('--base-url', help="Announcements API base URL")
+    parser.add_argument('--limit', type=int, default=20, help="Announcements per page")
+    parser.add_argument('--concurrency', type=int, help="Pages fetched at once")
+    parser.add_argument('--rate', type=float, help="Requests per second")
+    args = parser.parse_args()
+
+    archive = AnnouncementArchive()
+    try:
+        added = asyncio.run(backfill(
+            archive, args.base_url, args.locale, args.limit, args.concurrency, args.rate
+        ))
+        print(f"{added} new announcements archived, {archive.count()} in total")
+    finally:
+        archive.close()
+
+if __name__ == "__main__":
+    main()
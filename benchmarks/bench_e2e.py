@@ -0,0 +1,167 @@
+"""End-to-end announcement → order → Telegram latency benchmark
+
+Runs the real LaunchpoolAnnouncements, TelegramBot.check_announcements and
+TradeExecutor.execute_trade code paths against the local fake Bybit exchange
+and a fake Telegram Bot API, and reports p50/p95/p99 per stage:
+
+    poll       announcements HTTP round-trip
+    parse      response parsing / new-announcement check
+    decision   detection → order call (routing, symbol selection)
+    normalize  quantity / price normalization
+    order      place_order round-trip
+    notify     trade message enqueue → delivered to Telegram
+    total      wall time of check_announcements: poll start → order
+               acknowledged and notifications queued
+
+    python -m benchmarks.bench_e2e --runs 200 --exchange-latency-ms 5
+
+Results are written to benchmarks/results/e2e-<commit>.json.
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+STAGES = ['poll', 'parse', 'decision', 'normalize', 'order', 'notify']
+RESULTS_DIR = Path(__file__).parent / 'results'
+
+def percentiles(values):
+    values = sorted(values)
+    if not values:
+        return {}
+
+    def pick(point):
+        return round(values[min(len(values) - 1, int(round(point / 100 * (len(values) - 1))))], 3)
+
+    return {'p50': pick(50), 'p95': pick(95), 'p99': pick(99), 'max': round(values[-1], 3), 'count': len(values)}
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], text=True).strip()
+    except Exception:
+        return 'unknown'
+
+class BenchContext:
+    """Stands in for the job context passed by the JobQueue"""
+    def __init__(self, bot):
+        self.bot = bot
+        self.bot_data = {}
+
+async def run_benchmark(args, exchange, telegram):
+    # Imported here so the settings pick up the fake endpoints
+    from modules.telegram_bot import TelegramBot
+    from utils.metrics import metrics
+
+    bot = TelegramBot()
+    # Measure the pipeline, not Telegram's per-chat policy (the queue would
+    # otherwise hold the second message of every run for a second)
+    bot.notifier.private_chat_rate = 1000
+    await bot.app.initialize()
+    bot.notifier.start()
+
+    if args.armed:
+        bot.trader.arm(
+            bot.settings['quantity'], bot.settings['stop_loss'],
+            bot.settings['take_profit'], bot.settings['leverage']
+        )
+
+    context = BenchContext(bot.app.bot)
+    totals = []
+
+    # First poll seeds the announcement index with the existing feed
+    await bot.announcements.check_new_listings_async()
+
+    metrics.max_samples = args.runs + args.warmup
+    metrics.samples.clear()
+
+    for run in range(args.warmup + args.runs):
+        if run == args.warmup:
+            metrics.samples.clear()
+            totals.clear()
+
+        exchange.add_announcement(
+            f'Bybit Launchpool: Stake MNT to earn BENCH{run}',
+            description='Benchmark announcement',
+            type_key='latest_activities',
+            tags=['Launchpool'],
+            date_ms=exchange.now_ms() + 1000
+        )
+        orders_before = len(exchange.orders)
+
+        start = time.perf_counter()
+        await bot.check_announcements(context)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        if len(exchange.orders) > orders_before:
+            totals.append(elapsed_ms)
+
+        await asyncio.wait_for(bot.notifier._idle.wait(), timeout=10)
+
+        if args.armed:
+            bot.trader.refresh_armed_order()
+        await asyncio.sleep(args.interval_ms / 1000)
+
+    report = {
+        'commit': git_commit(),
+        'timestamp': int(time.time()),
+        'runs': args.runs,
+        'armed': args.armed,
+        'exchange_latency_ms': args.exchange_latency_ms,
+        'telegram_latency_ms': args.telegram_latency_ms,
+        'orders_placed': len(exchange.orders),
+        'stages_ms': {stage: percentiles(list(metrics.samples[f'stage_{stage}_ms'])) for stage in STAGES},
+        'total_ms': percentiles(totals)
+    }
+
+    await bot.notifier.stop()
+    await bot.announcements.aclose()
+    await bot.app.shutdown()
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end announcement latency benchmark")
+    parser.add_argument('--runs', type=int, default=100)
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--interval-ms', type=float, default=10)
+    parser.add_argument('--exchange-latency-ms', type=float, default=0)
+    parser.add_argument('--telegram-latency-ms', type=float, default=0)
+    parser.add_argument('--armed', action='store_true', help="Pre-arm the order template")
+    parser.add_argument('--output', help="Result file (default benchmarks/results/e2e-<commit>.json)")
+    args = parser.parse_args()
+
+    os.environ.setdefault('TELEGRAM_BOT_TOKEN', 'bench-token')
+    os.environ.setdefault('TELEGRAM_CHAT_ID', '1')
+    os.environ.setdefault('BYBIT_API_KEY', 'bench-key')
+    os.environ.setdefault('BYBIT_API_SECRET', 'bench-secret')
+    # Fresh announcement index per run, never the bot's real one
+    os.environ['SEEN_INDEX_FILE'] = os.path.join(tempfile.mkdtemp(), 'seen_announcements.log')
+
+    from fake_bybit import FakeBybit
+    from benchmarks.fake_telegram import FakeTelegram
+
+    exchange = FakeBybit(latency_ms=args.exchange_latency_ms, rate_limit=100000)
+    telegram = FakeTelegram(latency_ms=args.telegram_latency_ms)
+    base_url = exchange.start_in_thread()
+    os.environ['BYBIT_BASE_URL'] = base_url
+    os.environ['ANNOUNCEMENTS_BASE_URL'] = base_url
+    os.environ['TELEGRAM_API_URL'] = telegram.start_in_thread()
+
+    try:
+        report = asyncio.run(run_benchmark(args, exchange, telegram))
+    finally:
+        telegram.stop_thread()
+        exchange.stop_thread()
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"e2e-{report['commit']}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+
+    print(json.dumps(report, indent=2))
+    print(f"Saved to {output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Cold vs warm REST call latency against a local mock server
+
+Cold: a new TradeExecutor (new pybit HTTP session, new connection) per call,
+which is what the Telegram jobs used to do. Warm: one shared executor.
+
+    python -m benchmarks.bench_http_pool --calls 200 --connect-delay-ms 30
+"""
+import argparse
+import json
+import os
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+os.environ.setdefault('TELEGRAM_BOT_TOKEN', 'bench-token')
+os.environ.setdefault('TELEGRAM_CHAT_ID', '1')
+
+TICKER_RESPONSE = json.dumps({
+    'retCode': 0,
+    'retMsg': 'OK',
+    'result': {'category': 'linear', 'list': [{'symbol': 'MNTUSDT', 'markPrice': '0.6510', 'lastPrice': '0.6512'}]},
+    'retExtInfo': {},
+    'time': 0
+}).encode()
+
+def make_handler(connect_delay):
+    class MockHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'  # Keep-alive
+        # Headers and body leave in one write (flushed after each request), and
+        # no Nagle delay: split small writes stall warm calls on delayed ACKs
+        wbufsize = -1
+        disable_nagle_algorithm = True
+
+        def setup(self):
+            # Runs once per TCP connection: stands in for the TLS handshake cost
+            time.sleep(connect_delay)
+            super().setup()
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(TICKER_RESPONSE)))
+            self.end_headers()
+            self.wfile.write(TICKER_RESPONSE)
+
+        def log_message(self, *args):
+            pass
+
+    return MockHandler
+
+def summarize(samples):
+    samples = sorted(samples)
+    return {
+        'mean_ms': round(statistics.mean(samples), 3),
+        'p50_ms': round(samples[len(samples) // 2], 3),
+        'p95_ms': round(samples[int(len(samples) * 0.95) - 1], 3),
+        'max_ms': round(samples[-1], 3)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--calls', type=int, default=100)
+    parser.add_argument('--connect-delay-ms', type=float, default=20.0)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(args.connect_delay_ms / 1000))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ['BYBIT_BASE_URL'] = f'http://127.0.0.1:{server.server_address[1]}'
+
+    # Imported after BYBIT_BASE_URL is set so the settings pick it up
+    from modules.trade import TradeExecutor
+
+    def call(trader):
+        start = time.perf_counter()
+        trader.client.get_tickers(category='linear', symbol='MNTUSDT')
+        return (time.perf_counter() - start) * 1000
+
+    cold = [call(TradeExecutor()) for _ in range(args.calls)]
+
+    shared = TradeExecutor()
+    call(shared)  # Open the connection once
+    warm = [call(shared) for _ in range(args.calls)]
+
+    server.shutdown()
+
+    print(json.dumps({
+        'calls': args.calls,
+        'connect_delay_ms': args.connect_delay_ms,
+        'cold': summarize(cold),
+        'warm': summarize(warm)
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Order sizing speed and exactness: float rounding vs integer units
+
+Sizes a basket of random (symbol, notional, price) orders over synthetic
+instruments with the old float math, OrderNormalizer.size and the batched
+OrderNormalizer.size_many, and counts quantities that are not the nearest
+valid step and stop-loss prices that are not on the tick grid.
+
+    python -m benchmarks.bench_normalizer --orders 10000 --universe 200
+"""
+import argparse
+import os
+import random
+import time
+
+os.environ.setdefault('TELEGRAM_BOT_TOKEN', 'bench-token')
+os.environ.setdefault('TELEGRAM_CHAT_ID', '1')
+
+from modules.instruments import InstrumentCache
+from modules.normalizer import OrderNormalizer
+
+STEPS = ['0.001', '0.01', '0.1', '1', '10', '100', '0.0001', '0.005']
+TICKS = ['0.1', '0.01', '0.0001', '0.00001', '0.0000001', '0.005']
+
+def build_universe(size, rng):
+    """Instruments with a realistic mix of steps and ticks"""
+    cache = InstrumentCache(cache_file='unused.json')
+    for index in range(size):
+        step = rng.choice(STEPS)
+        cache.put('linear', {
+            'symbol': f'SYN{index}USDT',
+            'lotSizeFilter': {'minOrderQty': step, 'maxOrderQty': '1000000', 'qtyStep': step},
+            'priceFilter': {'tickSize': rng.choice(TICKS)}
+        })
+    return cache
+
+def legacy_size(cache, symbol, notional, price):
+    """The previous float path of prepare_order"""
+    min_qty, max_qty, qty_step = cache.lot_size('linear', symbol)
+    steps = round(notional / price / qty_step)
+    quantity = max(min_qty, min(round(steps * qty_step, 3), max_qty))
+    return str(quantity), round(quantity * price, 2)
+
+def to_units(text, decimals):
+    """Exact integer units of a decimal string, None when it has more decimals"""
+    text = f"{float(text):.12f}" if 'e' in text else text
+    whole, _, fraction = text.partition('.')
+    if len(fraction.rstrip('0')) > decimals:
+        return None
+    return int(whole + fraction.ljust(decimals, '0')[:decimals])
+
+def wrong_qty(normalizer, symbol, qty, notional, price):
+    """True when a quantity is off the step grid or not the nearest step"""
+    decimals = normalizer.spec(symbol)['qty_decimals']
+    units = to_units(qty, decimals)
+    return units is None or units != to_units(normalizer.size(symbol, notional, price)['qty'], decimals)
+
+def off_tick(normalizer, symbol, price):
+    """True when a price string is not a multiple of the tick"""
+    spec = normalizer.spec(symbol)
+    units = to_units(price, spec['tick_decimals'])
+    return units is None or units % spec['tick_units'] != 0
+
+def timed(label, count, fn):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<12} {elapsed * 1e3:8.2f} ms  {elapsed / count * 1e6:6.2f} µs/order")
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="Order normalizer benchmark")
+    parser.add_argument('--orders', type=int, default=10000)
+    parser.add_argument('--universe', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    cache = build_universe(args.universe, rng)
+    normalizer = OrderNormalizer(cache)
+
+    symbols = [f'SYN{rng.randrange(args.universe)}USDT' for _ in range(args.orders)]
+    notionals = [rng.uniform(10, 5000) for _ in range(args.orders)]
+    prices = [10 ** rng.uniform(-6, 5) for _ in range(args.orders)]
+
+    legacy = timed('float', args.orders, lambda: [
+        legacy_size(cache, *order) for order in zip(symbols, notionals, prices)
+    ])
+    single = timed('size', args.orders, lambda: [
+        normalizer.size(*order)['qty'] for order in zip(symbols, notionals, prices)
+    ])
+    batched = timed('size_many', args.orders, lambda: normalizer.size_many(symbols, notionals, prices))
+
+    orders = list(zip(symbols, notionals, prices))
+    print(f"Wrong quantities: float {sum(wrong_qty(normalizer, s, q, n, p) for (s, n, p), (q, _) in zip(orders, legacy))}, "
+          f"size {sum(wrong_qty(normalizer, s, q, n, p) for (s, n, p), q in zip(orders, single))}, "
+          f"size_many {sum(wrong_qty(normalizer, s, q, n, p) for (s, n, p), (q, _) in zip(orders, batched))}")
+    print(f"Off-tick stop losses: float {sum(off_tick(normalizer, s, str(round(p * 0.98, 4))) for s, _, p in orders)}, "
+          f"price {sum(off_tick(normalizer, s, normalizer.price(s, p * 0.98)) for s, _, p in orders)}")
+
+if __name__ == '__main__':
+    main()
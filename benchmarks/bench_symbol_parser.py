@@ -0,0 +1,63 @@
+"""Symbol extraction speed over the announcement corpus
+
+Parses every announcement of fixtures/announcements_corpus.jsonl against an
+instrument universe of realistic size and reports the time per announcement.
+
+    python -m benchmarks.bench_symbol_parser --rounds 2000 --universe 600
+"""
+import argparse
+import json
+import os
+import statistics
+import time
+from pathlib import Path
+
+os.environ.setdefault('TELEGRAM_BOT_TOKEN', 'bench-token')
+os.environ.setdefault('TELEGRAM_CHAT_ID', '1')
+
+from modules.instruments import InstrumentCache
+from modules.symbol_parser import SymbolParser
+
+CORPUS = Path(__file__).parent.parent / 'fixtures' / 'announcements_corpus.jsonl'
+
+def build_universe(size, corpus):
+    """Corpus symbols plus synthetic ones up to the requested size"""
+    symbols = {item['expected'] for item in corpus if item['expected']} | {'MNTUSDT', 'BTCUSDT'}
+    index = 0
+    while len(symbols) < size:
+        symbols.add(f'SYN{index}USDT')
+        index += 1
+
+    cache = InstrumentCache(cache_file='unused.json')
+    for symbol in symbols:
+        cache.instruments[('linear', symbol)] = {'symbol': symbol}
+    return cache
+
+def main():
+    parser = argparse.ArgumentParser(description="Symbol parser benchmark")
+    parser.add_argument('--rounds', type=int, default=2000)
+    parser.add_argument('--universe', type=int, default=600)
+    args = parser.parse_args()
+
+    with open(CORPUS) as f:
+        corpus = [json.loads(line) for line in f if line.strip()]
+
+    symbol_parser = SymbolParser(build_universe(args.universe, corpus))
+    correct = sum(symbol_parser.parse(item) == item['expected'] for item in corpus)
+
+    timings = []
+    for _ in range(args.rounds):
+        for item in corpus:
+            start = time.perf_counter()
+            symbol_parser.parse(item)
+            timings.append((time.perf_counter() - start) * 1e6)
+
+    timings.sort()
+    print(f"Corpus: {len(corpus)} announcements, {correct} parsed correctly")
+    print(f"Universe: {args.universe} symbols, {len(timings)} parses")
+    print(f"mean {statistics.mean(timings):.1f} µs  "
+          f"p50 {timings[len(timings) // 2]:.1f} µs  "
+          f"p99 {timings[int(len(timings) * 0.99)]:.1f} µs")
+
+if __name__ == "__main__":
+    main()
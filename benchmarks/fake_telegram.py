@@ -0,0 +1,77 @@
+import asyncio
+import threading
+import time
+from aiohttp import web
+
+class FakeTelegram:
+    """Minimal Bot API stand-in (getMe, getChat, sendMessage, editMessageText)"""
+
+    def __init__(self, host='127.0.0.1', latency_ms=0):
+        self.host = host
+        self.latency_ms = latency_ms
+        self.messages = []
+        self._message_id = 0
+        self.base_url = None
+        self.loop = None
+        self._runner = None
+        self._thread = None
+
+    async def handle(self, request):
+        method = request.match_info['method']
+        data = dict(await request.post()) if request.content_type != 'application/json' else await request.json()
+
+        if self.latency_ms:
+            await asyncio.sleep(self.latency_ms / 1000)
+
+        if method == 'getMe':
+            result = {'id': 1, 'is_bot': True, 'first_name': 'Bench', 'username': 'bench_bot'}
+        elif method == 'getChat':
+            result = {'id': int(data.get('chat_id', 1)), 'type': 'private', 'username': 'bench'}
+        elif method in ('sendMessage', 'editMessageText'):
+            self._message_id += 1
+            self.messages.append((time.perf_counter(), method, data))
+            result = {
+                'message_id': int(data.get('message_id', self._message_id)),
+                'date': int(time.time()),
+                'chat': {'id': int(data.get('chat_id', 1)), 'type': 'private'},
+                'text': data.get('text', '')
+            }
+        else:
+            result = True
+
+        return web.json_response({'ok': True, 'result': result})
+
+    async def start(self):
+        self.loop = asyncio.get_running_loop()
+        app = web.Application()
+        app.router.add_post('/bot{token}/{method}', self.handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f'http://{self.host}:{port}/bot'
+        return self.base_url
+
+    def start_in_thread(self):
+        started = threading.Event()
+
+        def serve():
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            loop.run_until_complete(self.start())
+            started.set()
+            loop.run_forever()
+            loop.run_until_complete(self._runner.cleanup())
+            loop.close()
+
+        self._thread = threading.Thread(target=serve, daemon=True)
+        self._thread.start()
+        started.wait(10)
+        return self.base_url
+
+    def stop_thread(self):
+        if self._thread is not None:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join(10)
+            self._thread = None
@@ -23,6 +23,23 @@ class Settings:
         self.API_KEY = os.getenv('BYBIT_API_KEY')
         self.API_SECRET = os.getenv('BYBIT_API_SECRET')
         self.TESTNET = os.getenv('TESTNET', 'true').lower() == 'true'
+        # Override the REST endpoint (e.g. a local mock exchange)
+        self.BYBIT_BASE_URL = os.getenv('BYBIT_BASE_URL')
+        self.ANNOUNCEMENTS_BASE_URL = os.getenv('ANNOUNCEMENTS_BASE_URL', 'https://api.bybit.com')
+        # Hosts raced by hedged announcement polls, the base URL is used alone otherwise
+        self.ANNOUNCEMENT_HOSTS = [
+            h.strip() for h in os.getenv('ANNOUNCEMENT_HOSTS', self.ANNOUNCEMENTS_BASE_URL).split(',') if h.strip()
+        ]
+        self.HEDGE_REQUESTS = os.getenv('HEDGE_REQUESTS', 'false').lower() == 'true'
+        self.HEDGE_DELAY_MS = float(os.getenv('HEDGE_DELAY_MS', '0'))
+        self.HTTP_TIMEOUT = int(os.getenv('HTTP_TIMEOUT', '10'))
+        # Orders carry a client order ID, so they get a short timeout and safe retries
+        self.ORDER_TIMEOUT = float(os.getenv('ORDER_TIMEOUT', '2'))
+        self.ORDER_RETRIES = int(os.getenv('ORDER_RETRIES', '2'))
+        self.ORDER_RETRY_DELAY = float(os.getenv('ORDER_RETRY_DELAY', '0.05'))
+        self.HTTP_POOL_SIZE = int(os.getenv('HTTP_POOL_SIZE', '10'))
+        # Server clock calibration interval (in seconds)
+        self.CLOCK_SYNC_INTERVAL = int(os.getenv('CLOCK_SYNC_INTERVAL', '300'))
         
         # Other settings
         self.CHECK_INTERVAL = int(os.getenv('CHECK_INTERVAL', '60'))
@@ -30,6 +47,95 @@ class Settings:
         self.MAX_RETRIES = int(os.getenv('MAX_RETRIES', '3'))
         self.BOT_PASSWORD = None
         
+        # Armed mode: keep an order template ready so a trade is a single place_order
+        self.ARMED_MODE = os.getenv('ARMED_MODE', 'true').lower() == 'true'
+        self.ARM_REFRESH_INTERVAL = int(os.getenv('ARM_REFRESH_INTERVAL', '10'))
+        self.ARM_MAX_AGE = int(os.getenv('ARM_MAX_AGE', '30'))
+        
+        # Instrument metadata cache
+        self.INSTRUMENT_CATEGORIES = [
+            c.strip() for c in os.getenv('INSTRUMENT_CATEGORIES', 'linear').split(',') if c.strip()
+        ]
+        self.INSTRUMENT_CACHE_TTL = int(os.getenv('INSTRUMENT_CACHE_TTL', '3600'))
+        self.INSTRUMENT_CACHE_FILE = os.getenv('INSTRUMENT_CACHE_FILE', 'data/instruments_cache.json')
+        self.INSTRUMENT_REFRESH_INTERVAL = float(os.getenv('INSTRUMENT_REFRESH_INTERVAL', '60'))
+        
+        # Instrument listing watcher
+        self.INSTRUMENT_WATCH_CATEGORIES = [
+            c.strip() for c in os.getenv('INSTRUMENT_WATCH_CATEGORIES', 'linear,spot').split(',') if c.strip()
+        ]
+        self.INSTRUMENT_WATCH_INTERVAL = float(os.getenv('INSTRUMENT_WATCH_INTERVAL', '5'))
+        self.TRADE_ON_LISTING = os.getenv('TRADE_ON_LISTING', 'false').lower() == 'true'
+        
+        # Market data stream
+        self.MARKET_DATA_SYMBOLS = [
+            s.strip() for s in os.getenv('MARKET_DATA_SYMBOLS', 'MNTUSDT').split(',') if s.strip()
+        ]
+        self.PUBLIC_STREAM_URL = os.getenv('PUBLIC_STREAM_URL')
+        self.TICKER_MAX_AGE = float(os.getenv('TICKER_MAX_AGE', '5'))
+        
+        # Private stream and position reconciliation
+        self.PRIVATE_STREAM_URL = os.getenv('PRIVATE_STREAM_URL')
+        self.POSITION_RECONCILE_INTERVAL = int(os.getenv('POSITION_RECONCILE_INTERVAL', '900'))
+        
+        # Announcement feeds polled concurrently, each one locale/type/tag (empty parts are not filtered)
+        self.ANNOUNCEMENT_FEEDS = [
+            f.strip() for f in os.getenv('ANNOUNCEMENT_FEEDS', 'en-US//Launchpool').split(',') if f.strip()
+        ]
+        self.ANNOUNCEMENT_LIMIT = int(os.getenv('ANNOUNCEMENT_LIMIT', '20'))
+        self.ANNOUNCEMENT_FEED_TIMEOUT = float(os.getenv('ANNOUNCEMENT_FEED_TIMEOUT', '5'))
+        
+        # Announcement classes that trigger a trade, the others are only notified
+        self.TRADE_CLASSES = [
+            c.strip() for c in os.getenv('TRADE_CLASSES', 'launchpool,new_listing').split(',') if c.strip()
+        ]
+        
+        # Extra legs traded alongside the announced symbol (e.g. MNTUSDT for launchpools)
+        self.BASKET_SYMBOLS = [
+            s.strip() for s in os.getenv('BASKET_SYMBOLS', '').split(',') if s.strip()
+        ]
+        self.BATCH_ORDERS = os.getenv('BATCH_ORDERS', 'true').lower() == 'true'
+        self.BATCH_ORDER_LIMIT = int(os.getenv('BATCH_ORDER_LIMIT', '20'))
+        
+        # Sliced execution of larger notionals (none, twap, iceberg or pov)
+        self.EXECUTION_ALGO = os.getenv('EXECUTION_ALGO', 'none').lower()
+        self.ALGO_MIN_NOTIONAL = float(os.getenv('ALGO_MIN_NOTIONAL', '500'))
+        self.ALGO_MAX_SLIPPAGE = float(os.getenv('ALGO_MAX_SLIPPAGE', '0.5'))
+        self.ALGO_MAX_DURATION = float(os.getenv('ALGO_MAX_DURATION', '300'))
+        self.TWAP_DURATION = float(os.getenv('TWAP_DURATION', '60'))
+        self.TWAP_SLICES = int(os.getenv('TWAP_SLICES', '6'))
+        self.ICEBERG_CLIP = float(os.getenv('ICEBERG_CLIP', '100'))
+        self.ICEBERG_INTERVAL = float(os.getenv('ICEBERG_INTERVAL', '1'))
+        self.POV_RATE = float(os.getenv('POV_RATE', '0.1'))
+        self.POV_INTERVAL = float(os.getenv('POV_INTERVAL', '2'))
+        
+        # Trades at the trading start time parsed from the announcement
+        self.SCHEDULE_TRADES = os.getenv('SCHEDULE_TRADES', 'false').lower() == 'true'
+        self.SCHEDULE_PREWARM_LEAD = float(os.getenv('SCHEDULE_PREWARM_LEAD', '5'))
+        self.SCHEDULE_SPIN_MS = float(os.getenv('SCHEDULE_SPIN_MS', '2'))
+        self.SCHEDULE_MAX_AHEAD_DAYS = int(os.getenv('SCHEDULE_MAX_AHEAD_DAYS', '14'))
+        self.SCHEDULED_TRADES_FILE = os.getenv('SCHEDULED_TRADES_FILE', 'data/scheduled_trades.json')
+        
+        # Adaptive polling (CHECK_INTERVAL is the quiet-time interval)
+        self.POLL_ACTIVE_INTERVAL = float(os.getenv('POLL_ACTIVE_INTERVAL', '5'))
+        self.POLL_ACTIVE_WINDOWS = [
+            w.strip() for w in os.getenv('POLL_ACTIVE_WINDOWS', '08:00-12:00').split(',') if w.strip()
+        ]
+        self.POLL_MIN_INTERVAL = float(os.getenv('POLL_MIN_INTERVAL', '1'))
+        self.POLL_MAX_INTERVAL = float(os.getenv('POLL_MAX_INTERVAL', '300'))
+        self.POLL_JITTER = float(os.getenv('POLL_JITTER', '0.1'))
+        self.POLL_MIN_HEADROOM = float(os.getenv('POLL_MIN_HEADROOM', '0.2'))
+        self.POLLERS = int(os.getenv('POLLERS', '2'))
+        
+        # Local announcement archive (full-text searchable) and its backfill
+        self.ARCHIVE_FILE = os.getenv('ARCHIVE_FILE', 'data/announcements.db')
+        self.BACKFILL_CONCURRENCY = int(os.getenv('BACKFILL_CONCURRENCY', '4'))
+        self.BACKFILL_RATE = float(os.getenv('BACKFILL_RATE', '5'))
+        
+        # Processed announcements, survives restarts
+        self.SEEN_INDEX_FILE = os.getenv('SEEN_INDEX_FILE', 'data/seen_announcements.log')
+        self.SEEN_INDEX_RETENTION_DAYS = int(os.getenv('SEEN_INDEX_RETENTION_DAYS', '30'))
+        
         # Settings file path
         self.settings_file = Path('config/user_settings.json')
         self.load_saved_settings()
@@ -39,6 +145,9 @@ class Settings:
         if not self.TELEGRAM_CHAT_ID:
             raise ValueError("TELEGRAM_CHAT_ID not found in .env file!")
 
+        # Optional Bot API base URL (defaults to https://api.telegram.org/bot)
+        self.TELEGRAM_API_URL = os.getenv('TELEGRAM_API_URL')
+
     def load_saved_settings(self):
         """Kaydedilmiş ayarları yükle"""
         if self.settings_file.exists():
@@ -0,0 +1,9 @@
+import os
+
+# config.settings refuses to load without Telegram credentials; the offline
+# tests never talk to Telegram, so dummy values are enough.
+os.environ.setdefault('TELEGRAM_BOT_TOKEN', 'test-token')
+os.environ.setdefault('TELEGRAM_CHAT_ID', '1')
+# pybit refuses signed requests without keys; the fake exchange accepts any
+os.environ.setdefault('BYBIT_API_KEY', 'test-key')
+os.environ.setdefault('BYBIT_API_SECRET', 'test-secret')
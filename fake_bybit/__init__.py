@@ -0,0 +1,3 @@
+from fake_bybit.server import FakeBybit
+
+__all__ = ['FakeBybit']
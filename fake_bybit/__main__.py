@@ -0,0 +1,41 @@
+"""Run the fake Bybit exchange standalone
+
+    python -m fake_bybit --port 8080 --latency-ms 20 --jitter-ms 10 --error-rate 0.01
+
+Then point the bot at it with BYBIT_BASE_URL, ANNOUNCEMENTS_BASE_URL,
+PUBLIC_STREAM_URL and PRIVATE_STREAM_URL.
+"""
+import argparse
+import asyncio
+from fake_bybit.server import FakeBybit
+
+def main():
+    parser = argparse.ArgumentParser(description="Local fake Bybit REST/WS exchange")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--latency-ms', type=float, default=0)
+    parser.add_argument('--jitter-ms', type=float, default=0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--rate-limit', type=int, default=600)
+    parser.add_argument('--clock-offset-ms', type=int, default=0)
+    args = parser.parse_args()
+
+    exchange = FakeBybit(
+        host=args.host, port=args.port, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate, rate_limit=args.rate_limit, clock_offset_ms=args.clock_offset_ms
+    )
+
+    async def serve():
+        base_url = await exchange.start()
+        print(f"REST:        {base_url}")
+        print(f"Public WS:   {exchange.ws_public_url}")
+        print(f"Private WS:  {exchange.ws_private_url}")
+        await asyncio.Event().wait()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,558 @@
+import asyncio
+import json
+import random
+import threading
+import time
+import uuid
+from aiohttp import web
+from utils.logger import setup_logger
+
+logger = setup_logger('fake_bybit')
+
+DEFAULT_INSTRUMENTS = {
+    'linear': [
+        {
+            'symbol': 'MNTUSDT', 'contractType': 'LinearPerpetual', 'status': 'Trading',
+            'baseCoin': 'MNT', 'quoteCoin': 'USDT', 'settleCoin': 'USDT',
+            'leverageFilter': {'minLeverage': '1', 'maxLeverage': '25.00', 'leverageStep': '0.01'},
+            'priceFilter': {'minPrice': '0.0001', 'maxPrice': '1999.9998', 'tickSize': '0.0001'},
+            'lotSizeFilter': {'maxOrderQty': '500000', 'maxMktOrderQty': '100000', 'minOrderQty': '1', 'qtyStep': '1'}
+        },
+        {
+            'symbol': 'BTCUSDT', 'contractType': 'LinearPerpetual', 'status': 'Trading',
+            'baseCoin': 'BTC', 'quoteCoin': 'USDT', 'settleCoin': 'USDT',
+            'leverageFilter': {'minLeverage': '1', 'maxLeverage': '100.00', 'leverageStep': '0.01'},
+            'priceFilter': {'minPrice': '0.10', 'maxPrice': '199999.80', 'tickSize': '0.10'},
+            'lotSizeFilter': {'maxOrderQty': '100.000', 'maxMktOrderQty': '100.000', 'minOrderQty': '0.001', 'qtyStep': '0.001'}
+        }
+    ],
+    'spot': [
+        {
+            'symbol': 'MNTUSDT', 'status': 'Trading', 'baseCoin': 'MNT', 'quoteCoin': 'USDT',
+            'priceFilter': {'tickSize': '0.0001'},
+            'lotSizeFilter': {'basePrecision': '0.01', 'quotePrecision': '0.000001',
+                              'minOrderQty': '1', 'maxOrderQty': '2000000', 'minOrderAmt': '1', 'maxOrderAmt': '2000000'}
+        }
+    ]
+}
+
+DEFAULT_PRICES = {'MNTUSDT': 0.6510, 'BTCUSDT': 67250.0}
+
+class FakeBybit:
+    """Local stand-in for the Bybit REST and WebSocket endpoints used by the bot
+
+    Latency and errors can be injected globally (latency_ms, jitter_ms,
+    error_rate) or per path (set_latency, inject_error). Run it on the
+    current loop with start() or in a background thread with
+    start_in_thread() when the caller is blocking (pybit).
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, latency_ms=0, jitter_ms=0, error_rate=0.0,
+                 rate_limit=600, clock_offset_ms=0, seed=None):
+        self.host = host
+        self.port = port
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        # Simulated exchange clock skew relative to the local clock
+        self.clock_offset_ms = clock_offset_ms
+        self.random = random.Random(seed)
+
+        self.path_latency_ms = {}
+        self.injected_errors = {}
+
+        self.announcements = []
+        self.instruments = {category: [dict(i) for i in items] for category, items in DEFAULT_INSTRUMENTS.items()}
+        self.prices = dict(DEFAULT_PRICES)
+        # Contracts quoted on each order book level, levels are 0.05% apart
+        self.book_qty = {}
+        self.leverage = {}
+        self.orders = []
+        self.positions = {}
+        self.wallet_balance = 10000.0
+        self.funding_balance = 1000.0
+        self.transfers = []
+
+        # path -> number of requests served, for assertions and benchmarks
+        self.request_counts = {}
+        self._window = (0, 0)
+
+        self.public_clients = {}
+        self.private_clients = set()
+
+        self.runner = None
+        self.base_url = None
+        self.loop = None
+        self._thread = None
+
+    # Configuration ---------------------------------------------------
+
+    def set_latency(self, path, latency_ms):
+        """Fixed extra latency for one path"""
+        self.path_latency_ms[path] = latency_ms
+
+    def inject_error(self, path, ret_code=10016, ret_msg='Service error', times=1, http_status=200):
+        """Make the next `times` requests to path fail"""
+        self.injected_errors.setdefault(path, []).extend(
+            [{'ret_code': ret_code, 'ret_msg': ret_msg, 'http_status': http_status}] * times
+        )
+
+    def now_ms(self):
+        """Exchange clock in ms"""
+        return int(time.time() * 1000) + self.clock_offset_ms
+
+    def add_announcement(self, title, description='', type_key='new_crypto', tags=None,
+                         url=None, date_ms=None, start_ms=None, locale='en-US'):
+        """Publish an announcement (newest first, like the real index)"""
+        date_ms = date_ms or self.now_ms()
+        announcement = {
+            'title': title,
+            'description': description,
+            'type': {'title': type_key.replace('_', ' ').title(), 'key': type_key},
+            'tags': tags or [],
+            'url': url or f'https://announcements.bybit.com/en/article/{uuid.uuid4().hex[:12]}/',
+            'dateTimestamp': date_ms,
+            'startDateTimestamp': start_ms or date_ms,
+            'endDateTimestamp': (start_ms or date_ms) + 7 * 24 * 3600 * 1000,
+            'locale': locale
+        }
+        self.announcements.insert(0, announcement)
+        return announcement
+
+    def add_instrument(self, category, instrument):
+        """List a new instrument"""
+        self.instruments.setdefault(category, []).append(instrument)
+        self.instruments[category].sort(key=lambda i: i['symbol'])
+
+    def set_price(self, symbol, price):
+        """Move a price and push it to ticker subscribers"""
+        self.prices[symbol] = price
+        self._run_soon(self._publish_ticker(symbol, 'delta'))
+
+    # Lifecycle -------------------------------------------------------
+
+    def build_app(self):
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_get('/v5/announcements/index', self.announcements_index)
+        app.router.add_get('/v5/market/time', self.server_time)
+        app.router.add_get('/v5/market/instruments-info', self.instruments_info)
+        app.router.add_get('/v5/market/tickers', self.tickers)
+        app.router.add_get('/v5/market/orderbook', self.orderbook)
+        app.router.add_post('/v5/position/set-leverage', self.set_leverage)
+        app.router.add_get('/v5/position/list', self.position_list)
+        app.router.add_post('/v5/order/create', self.create_order)
+        app.router.add_post('/v5/order/create-batch', self.create_batch_order)
+        app.router.add_get('/v5/order/realtime', self.order_realtime)
+        app.router.add_get('/v5/order/history', self.order_history)
+        app.router.add_get('/v5/account/wallet-balance', self.wallet)
+        app.router.add_post('/v5/asset/transfer/inter-transfer', self.inter_transfer)
+        app.router.add_get('/v5/public/linear', self.public_stream)
+        app.router.add_get('/v5/private', self.private_stream)
+        return app
+
+    async def start(self):
+        """Start serving on the running loop and return the base URL"""
+        self.loop = asyncio.get_running_loop()
+        self.runner = web.AppRunner(self.build_app())
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, self.host, self.port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f'http://{self.host}:{self.port}'
+        logger.info(f"Fake Bybit listening on {self.base_url}")
+        return self.base_url
+
+    async def stop(self):
+        """Stop serving"""
+        for ws in list(self.public_clients) + list(self.private_clients):
+            await ws.close()
+        if self.runner is not None:
+            await self.runner.cleanup()
+            self.runner = None
+
+    def start_in_thread(self):
+        """Serve from a background thread (for blocking clients) and return the base URL"""
+        started = threading.Event()
+
+        def serve():
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            loop.run_until_complete(self.start())
+            started.set()
+            loop.run_forever()
+            loop.run_until_complete(self.stop())
+            loop.close()
+
+        self._thread = threading.Thread(target=serve, daemon=True)
+        self._thread.start()
+        started.wait(10)
+        return self.base_url
+
+    def stop_thread(self):
+        """Stop a server started with start_in_thread()"""
+        if self._thread is not None:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join(10)
+            self._thread = None
+
+    @property
+    def ws_public_url(self):
+        return self.base_url.replace('http://', 'ws://') + '/v5/public/linear'
+
+    @property
+    def ws_private_url(self):
+        return self.base_url.replace('http://', 'ws://') + '/v5/private'
+
+    def _run_soon(self, coro):
+        """Schedule a coroutine on the server loop from any thread"""
+        if self.loop is None:
+            coro.close()
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self.loop:
+            self.loop.create_task(coro)
+        else:
+            asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    # Plumbing --------------------------------------------------------
+
+    def _rate_limit_status(self):
+        """Requests left in the current one-second window"""
+        second = int(time.time())
+        start, count = self._window
+        if start != second:
+            start, count = second, 0
+        count += 1
+        self._window = (start, count)
+        return self.rate_limit - count, (second + 1) * 1000
+
+    @web.middleware
+    async def _middleware(self, request, handler):
+        path = request.path
+        self.request_counts[path] = self.request_counts.get(path, 0) + 1
+
+        if path.startswith('/v5/public') or path == '/v5/private':
+            return await handler(request)
+
+        latency = self.path_latency_ms.get(path, self.latency_ms)
+        if self.jitter_ms:
+            latency += self.random.uniform(0, self.jitter_ms)
+        if latency:
+            await asyncio.sleep(latency / 1000)
+
+        remaining, reset_ms = self._rate_limit_status()
+        headers = {
+            'X-Bapi-Limit': str(self.rate_limit),
+            'X-Bapi-Limit-Status': str(max(remaining, 0)),
+            'X-Bapi-Limit-Reset-Timestamp': str(reset_ms)
+        }
+
+        if remaining < 0:
+            return self._error(10006, 'Too many visits!', headers=headers)
+
+        injected = self.injected_errors.get(path)
+        if injected:
+            error = injected.pop(0)
+            return self._error(error['ret_code'], error['ret_msg'], error['http_status'], headers)
+
+        if self.error_rate and self.random.random() < self.error_rate:
+            return self._error(10016, 'Service error', headers=headers)
+
+        response = await handler(request)
+        response.headers.update(headers)
+        return response
+
+    def _ok(self, result):
+        return web.json_response({
+            'retCode': 0, 'retMsg': 'OK', 'result': result, 'retExtInfo': {}, 'time': self.now_ms()
+        })
+
+    def _error(self, ret_code, ret_msg, http_status=200, headers=None):
+        if http_status != 200:
+            return web.Response(status=http_status, text=ret_msg, headers=headers)
+        return web.json_response({
+            'retCode': ret_code, 'retMsg': ret_msg, 'result': {}, 'retExtInfo': {}, 'time': self.now_ms()
+        }, headers=headers)
+
+    async def _params(self, request):
+        if request.method == 'POST':
+            return await request.json()
+        return dict(request.query)
+
+    def _ticker(self, symbol):
+        price = self.prices[symbol]
+        return {
+            'symbol': symbol, 'lastPrice': f'{price:.4f}', 'markPrice': f'{price:.4f}',
+            'indexPrice': f'{price:.4f}', 'bid1Price': f'{price:.4f}', 'ask1Price': f'{price:.4f}',
+            'volume24h': '1000000', 'turnover24h': f'{price * 1000000:.2f}'
+        }
+
+    # REST ------------------------------------------------------------
+
+    async def announcements_index(self, request):
+        params = dict(request.query)
+        items = [
+            a for a in self.announcements
+            if a['locale'] == params.get('locale', 'en-US')
+            and ('type' not in params or a['type']['key'] == params['type'])
+            and ('tag' not in params or params['tag'] in a['tags'])
+        ]
+        limit = int(params.get('limit', 20))
+        page = int(params.get('page', 1))
+        page_items = items[(page - 1) * limit:page * limit]
+        return self._ok({
+            'total': len(items),
+            'list': [{k: v for k, v in a.items() if k != 'locale'} for a in page_items]
+        })
+
+    async def server_time(self, request):
+        now_ms = self.now_ms()
+        return self._ok({'timeSecond': str(now_ms // 1000), 'timeNano': str(now_ms * 1000000)})
+
+    async def instruments_info(self, request):
+        params = dict(request.query)
+        items = self.instruments.get(params.get('category', 'linear'), [])
+        if 'symbol' in params:
+            items = [i for i in items if i['symbol'] == params['symbol']]
+        if 'status' in params:
+            items = [i for i in items if i['status'] == params['status']]
+
+        limit = int(params.get('limit', 500))
+        offset = int(params.get('cursor') or 0)
+        next_offset = offset + limit
+        return self._ok({
+            'category': params.get('category', 'linear'),
+            'list': items[offset:next_offset],
+            'nextPageCursor': str(next_offset) if next_offset < len(items) else ''
+        })
+
+    async def tickers(self, request):
+        params = dict(request.query)
+        symbols = [params['symbol']] if 'symbol' in params else list(self.prices)
+        if any(s not in self.prices for s in symbols):
+            return self._error(10001, 'Not supported symbols')
+        return self._ok({'category': params.get('category', 'linear'), 'list': [self._ticker(s) for s in symbols]})
+
+    async def orderbook(self, request):
+        params = dict(request.query)
+        symbol = params.get('symbol')
+        if symbol not in self.prices:
+            return self._error(10001, 'Not supported symbols')
+        price = self.prices[symbol]
+        qty = f"{self.book_qty.get(symbol, 10000):g}"
+        levels = range(1, min(int(params.get('limit', 25)), 200) + 1)
+        return self._ok({
+            's': symbol,
+            'b': [[f'{price * (1 - 0.0005 * i):.4f}', qty] for i in levels],
+            'a': [[f'{price * (1 + 0.0005 * i):.4f}', qty] for i in levels],
+            'ts': self.now_ms(), 'u': 1
+        })
+
+    async def set_leverage(self, request):
+        params = await self._params(request)
+        key = params['symbol']
+        leverage = (params['buyLeverage'], params['sellLeverage'])
+        if self.leverage.get(key) == leverage:
+            return self._error(110043, 'leverage not modified')
+        self.leverage[key] = leverage
+        return self._ok({})
+
+    async def position_list(self, request):
+        params = dict(request.query)
+        positions = [
+            p for p in self.positions.values()
+            if 'symbol' not in params or p['symbol'] == params['symbol']
+        ]
+        if 'symbol' in params and not positions:
+            positions = [self._empty_position(params['symbol'])]
+        return self._ok({'category': 'linear', 'list': positions, 'nextPageCursor': ''})
+
+    def _empty_position(self, symbol):
+        buy, _ = self.leverage.get(symbol, ('1', '1'))
+        return {
+            'symbol': symbol, 'positionIdx': 0, 'side': '', 'size': '0', 'avgPrice': '0',
+            'markPrice': f'{self.prices.get(symbol, 0):.4f}', 'leverage': buy,
+            'unrealisedPnl': '0', 'cumRealisedPnl': '0', 'stopLoss': '', 'takeProfit': ''
+        }
+
+    async def create_order(self, request):
+        params = await self._params(request)
+        ret_code, ret_msg, result = self._place(params)
+        if ret_code:
+            return self._error(ret_code, ret_msg)
+        return self._ok(result)
+
+    async def create_batch_order(self, request):
+        params = await self._params(request)
+        results, statuses = [], []
+        for item in params.get('request', []):
+            ret_code, ret_msg, result = self._place(dict(item, category=params.get('category')))
+            results.append(dict(result, symbol=item.get('symbol')))
+            statuses.append({'code': ret_code, 'msg': ret_msg})
+        return web.json_response({
+            'retCode': 0, 'retMsg': 'OK', 'result': {'list': results},
+            'retExtInfo': {'list': statuses}, 'time': self.now_ms()
+        })
+
+    def _place(self, params):
+        """Fill one order, returns (retCode, retMsg, result)"""
+        symbol = params['symbol']
+        if symbol not in self.prices:
+            return 10001, 'params error: symbol invalid', {}
+
+        link_id = params.get('orderLinkId')
+        if link_id and any(o['orderLinkId'] == link_id for o in self.orders):
+            return 110072, 'OrderLinkedID is duplicate', {}
+
+        price = self.prices[symbol]
+        qty = float(params['qty'])
+        now_ms = self.now_ms()
+        order = {
+            'orderId': str(uuid.uuid4()),
+            'orderLinkId': link_id or '',
+            'symbol': symbol,
+            'side': params['side'],
+            'orderType': params['orderType'],
+            'price': f'{price:.4f}',
+            'avgPrice': f'{price:.4f}',
+            'qty': params['qty'],
+            'cumExecQty': params['qty'],
+            'orderStatus': 'Filled',
+            'stopLoss': params.get('stopLoss', ''),
+            'takeProfit': params.get('takeProfit', ''),
+            'createdTime': str(now_ms),
+            'updatedTime': str(now_ms)
+        }
+        self.orders.insert(0, order)
+
+        # Market orders fill immediately at the current price
+        position = self.positions.get(symbol) or self._empty_position(symbol)
+        size = float(position['size']) + (qty if params['side'] == 'Buy' else -qty)
+        position.update({
+            'side': 'Buy' if size > 0 else ('Sell' if size < 0 else ''),
+            'size': str(abs(size)),
+            'avgPrice': f'{price:.4f}',
+            'entryPrice': f'{price:.4f}',
+            'updatedTime': str(now_ms)
+        })
+        # An order without SL/TP leaves the position's as they are
+        for field in ('stopLoss', 'takeProfit'):
+            if params.get(field):
+                position[field] = params[field]
+        self.positions[symbol] = position
+        self.wallet_balance -= qty * price * 0.00055
+
+        self._run_soon(self._publish_fill(order, position))
+        return 0, 'OK', {'orderId': order['orderId'], 'orderLinkId': order['orderLinkId']}
+
+    async def order_realtime(self, request):
+        params = dict(request.query)
+        return self._ok({'category': 'linear', 'list': self._filter_orders(params), 'nextPageCursor': ''})
+
+    async def order_history(self, request):
+        params = dict(request.query)
+        return self._ok({'category': 'linear', 'list': self._filter_orders(params), 'nextPageCursor': ''})
+
+    def _filter_orders(self, params):
+        orders = self.orders
+        for field in ('symbol', 'orderId', 'orderLinkId'):
+            if field in params:
+                orders = [o for o in orders if o[field] == params[field]]
+        return orders[:int(params.get('limit', 20))]
+
+    async def wallet(self, request):
+        params = dict(request.query)
+        balance = self.funding_balance if params.get('accountType') == 'FUND' else self.wallet_balance
+        return self._ok({'list': [{
+            'accountType': params.get('accountType', 'UNIFIED'),
+            'totalAvailableBalance': f'{balance:.4f}',
+            'totalWalletBalance': f'{balance:.4f}',
+            'coin': [{'coin': 'USDT', 'walletBalance': f'{balance:.4f}', 'availableToWithdraw': f'{balance:.4f}'}]
+        }]})
+
+    async def inter_transfer(self, request):
+        params = await self._params(request)
+        amount = float(params['amount'])
+        if amount > self.funding_balance:
+            return self._error(131212, 'Insufficient balance')
+        self.funding_balance -= amount
+        self.wallet_balance += amount
+        self.transfers.append(params)
+        return self._ok({'transferId': params['transferId'], 'status': 'SUCCESS'})
+
+    # WebSocket -------------------------------------------------------
+
+    async def public_stream(self, request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.public_clients[ws] = set()
+
+        try:
+            async for message in ws:
+                data = json.loads(message.data)
+                if data.get('op') == 'ping':
+                    await ws.send_str(json.dumps({'success': True, 'ret_msg': 'pong', 'op': 'ping'}))
+                elif data.get('op') == 'subscribe':
+                    topics = set(data.get('args', []))
+                    self.public_clients[ws] |= topics
+                    await ws.send_str(json.dumps({'success': True, 'ret_msg': '', 'op': 'subscribe'}))
+                    for topic in topics:
+                        if topic.startswith('tickers.') and topic[8:] in self.prices:
+                            await self._send_ticker(ws, topic[8:], 'snapshot')
+        finally:
+            self.public_clients.pop(ws, None)
+        return ws
+
+    async def _send_ticker(self, ws, symbol, kind):
+        await ws.send_str(json.dumps({
+            'topic': f'tickers.{symbol}', 'type': kind, 'data': self._ticker(symbol),
+            'cs': self.now_ms(), 'ts': self.now_ms()
+        }))
+
+    async def _publish_ticker(self, symbol, kind):
+        for ws, topics in list(self.public_clients.items()):
+            if f'tickers.{symbol}' in topics and not ws.closed:
+                await self._send_ticker(ws, symbol, kind)
+
+    async def private_stream(self, request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+
+        try:
+            async for message in ws:
+                data = json.loads(message.data)
+                if data.get('op') == 'auth':
+                    await ws.send_str(json.dumps({'success': True, 'ret_msg': '', 'op': 'auth', 'conn_id': 'fake'}))
+                elif data.get('op') == 'subscribe':
+                    self.private_clients.add(ws)
+                    await ws.send_str(json.dumps({'success': True, 'ret_msg': '', 'op': 'subscribe'}))
+                elif data.get('op') == 'ping':
+                    await ws.send_str(json.dumps({'success': True, 'ret_msg': 'pong', 'op': 'ping'}))
+        finally:
+            self.private_clients.discard(ws)
+        return ws
+
+    async def _publish_fill(self, order, position):
+        now_ms = self.now_ms()
+        messages = [
+            {'topic': 'order', 'creationTime': now_ms, 'data': [dict(order, category='linear')]},
+            {'topic': 'execution', 'creationTime': now_ms, 'data': [{
+                'category': 'linear', 'symbol': order['symbol'], 'side': order['side'],
+                'orderId': order['orderId'], 'orderLinkId': order['orderLinkId'],
+                'execPrice': order['avgPrice'], 'execQty': order['qty'], 'execType': 'Trade',
+                'execFee': f"{float(order['qty']) * float(order['avgPrice']) * 0.00055:.6f}",
+                'execTime': str(now_ms)
+            }]},
+            {'topic': 'position', 'creationTime': now_ms, 'data': [dict(position, category='linear')]},
+            {'topic': 'wallet', 'creationTime': now_ms, 'data': [{
+                'accountType': 'UNIFIED', 'totalAvailableBalance': f'{self.wallet_balance:.4f}'
+            }]}
+        ]
+        for ws in list(self.private_clients):
+            if not ws.closed:
+                for message in messages:
+                    await ws.send_str(json.dumps(message))
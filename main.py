@@ -1,20 +1,25 @@
+import asyncio
 import time
-from modules.announcements import LaunchpoolAnnouncements
-from modules.trade import TradeExecutor
 from modules.telegram_bot import TelegramBot
 from utils.logger import setup_logger
+from utils.clock import server_clock
 from config.settings import settings
 
 logger = setup_logger('main')
 
-def main():
+async def monitor():
+    """Standalone monitoring loop: trade first, notify after"""
+    bot = TelegramBot()
+    announcements = bot.announcements
+    
+    await bot.app.initialize()
+    bot.notifier.start()
+    # Standalone loop has no job queue: calibrate the server clock once up front
+    await asyncio.to_thread(server_clock.sync)
+    
     try:
         logger.info("Starting bot...")
         
-        # Initialize components
-        announcements = LaunchpoolAnnouncements()
-        trader = TradeExecutor()
-        
         # Send startup notification
         startup_message = (
             "🤖 <b>Bybit Launchpool Bot Started</b>\n\n"
@@ -25,53 +30,46 @@ def main():
             f"⏱ Check Interval: {settings.CHECK_INTERVAL}s\n\n"
             "Bot is now monitoring for new Launchpool announcements..."
         )
-        bot = TelegramBot()
-        bot.send_message(startup_message)
+        bot.notifier.enqueue(startup_message)
         
         retry_count = 0
         
         while True:
             try:
                 # Check for new announcements
-                new_announcement = announcements.check_new_listings()
-                
-                if new_announcement:
-                    # Send announcement alert
-                    bot.send_launchpool_alert(new_announcement)
+                async for announcement in announcements.iter_new_listings():
+                    # Order goes out first, alerts are queued by the pipeline
+                    await bot.pipeline.handle(announcement, time.perf_counter())
                     
-                    # Execute trade
-                    trade_result = trader.execute_trade()
-                    
-                    if trade_result:
-                        # Send trade alert
-                        bot.send_trade_alert(
-                            trade_type="LONG",
-                            symbol=trade_result['symbol'],
-                            price=trade_result['price'],
-                            quantity=trade_result['quantity'],
-                            sl=trade_result['stop_loss'],
-                            tp=trade_result['take_profit']
-                        )
-                    
-                time.sleep(settings.CHECK_INTERVAL)
                 retry_count = 0
+                await asyncio.sleep(announcements.scheduler.next_delay())
                 
             except Exception as e:
                 retry_count += 1
                 error_msg = f"Error (Attempt {retry_count}/{settings.MAX_RETRIES}): {str(e)}"
                 logger.error(error_msg)
-                bot.send_error_alert(error_msg)
+                bot.notifier.enqueue(f"⚠️ <b>Error Alert</b> ⚠️\n\n{error_msg}")
                 
                 if retry_count >= settings.MAX_RETRIES:
-                    bot.send_message("🔴 Bot stopped due to maximum retry attempts!")
+                    bot.notifier.enqueue("🔴 Bot stopped due to maximum retry attempts!")
                     break
                     
-                time.sleep(settings.RETRY_DELAY)
+                await asyncio.sleep(settings.RETRY_DELAY)
                 
     except Exception as e:
         logger.critical(f"Critical error: {str(e)}")
-        bot.send_error_alert(f"Critical error: {str(e)}")
+        bot.notifier.enqueue(f"⚠️ <b>Error Alert</b> ⚠️\n\nCritical error: {str(e)}")
         raise
+    finally:
+        await bot.pipeline.scheduler.stop()
+        await bot.pipeline.algos.stop()
+        await bot.notifier.stop()
+        await announcements.aclose()
+        bot.archive.close()
+        await bot.app.shutdown()
+
+def main():
+    asyncio.run(monitor())
 
 if __name__ == "__main__":
     bot = TelegramBot()
@@ -1,64 +1,279 @@
-import requests
-from datetime import datetime
+import asyncio
+import time
+import aiohttp
 import json
 from utils.logger import setup_logger
+from utils.metrics import metrics
+from utils.clock import server_clock
 from config.settings import settings
+from modules.seen_index import SeenIndex
+from modules.poll_scheduler import AdaptivePollScheduler
 
 logger = setup_logger('announcements')
 
+ANNOUNCEMENTS_PATH = '/v5/announcements/index'
+
+# Added to the winner's latency for a host cancelled while still waiting
+HEDGE_LOSS_PENALTY_MS = 50
+
+def parse_feeds(specs):
+    """Turn locale/type/tag specs into feed dicts"""
+    feeds = []
+    for spec in specs:
+        locale, _, rest = spec.partition('/')
+        type_key, _, tag = rest.partition('/')
+        feeds.append({
+            'name': spec,
+            'locale': locale or 'en-US',
+            'type': type_key or None,
+            'tag': tag or None
+        })
+    return feeds
+
 class LaunchpoolAnnouncements:
-    def __init__(self):
-        self.last_check_time = datetime.now()
+    def __init__(self, base_url=None, seen_index=None, feeds=None, scheduler=None, hosts=None, archive=None):
+        # Persistent record of processed announcements (replaces a last-check timestamp)
+        self.seen = seen_index if seen_index is not None else SeenIndex()
         self.check_interval = settings.CHECK_INTERVAL
-    
-    def check_new_listings(self):
-        """Check new Launchpool listings"""
-        try:
-            logger.info("Checking Launchpool announcements...")
-            
-            params = {
-                'locale': 'en-US',
-                'category': 'spot',
-                'limit': 20,
-                'tag': 'Launchpool'
-            }
-            
-            headers = {
-                'Accept': 'application/json',
-                'Content-Type': 'application/json'
-            }
-            
-            response = requests.get(
-                'https://api.bybit.com/v5/announcements/index',
-                params=params,
-                headers=headers
+        self.feeds = parse_feeds(feeds or settings.ANNOUNCEMENT_FEEDS)
+        # Optional local archive, every polled page is stored after detection
+        self.archive = archive
+        # Fed with rate-limit headers and errors, decides when to poll next
+        self.scheduler = scheduler if scheduler is not None else AdaptivePollScheduler()
+        # Primary host first, extra hosts are only raced when HEDGE_REQUESTS is on
+        hosts = hosts or ([base_url] if base_url else settings.ANNOUNCEMENT_HOSTS)
+        self.urls = [host.rstrip('/') + ANNOUNCEMENTS_PATH for host in hosts]
+
+        # Long-lived keep-alive session, created lazily on the loop that uses it
+        self._session = None
+        self._session_loop = None
+        # Private loop backing the sync wrapper so its session survives between calls
+        self._loop = None
+
+    async def _get_session(self):
+        """Return the shared aiohttp session, creating it on first use"""
+        loop = asyncio.get_running_loop()
+
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            if self._session is not None and not self._session.closed:
+                # Session belongs to another loop, it can't be reused here
+                logger.warning("Announcement session bound to another event loop, recreating")
+
+            connector = aiohttp.TCPConnector(
+                limit=10,
+                keepalive_timeout=60,
+                ttl_dns_cache=300
             )
-            
-            if response.status_code != 200:
-                logger.error(f"API Error: {response.status_code}")
-                return None
-                
-            data = response.json()
-            
-            if data.get('retCode') != 0:
-                logger.error(f"API Response Error: {data}")
-                return None
-                
-            announcements = data.get('result', {}).get('list', [])
-            
-            if announcements:
-                latest = announcements[0]
-                announcement_time = datetime.fromtimestamp(
-                    int(latest.get('dateTimestamp', 0)) / 1000
-                )
-                
-                if announcement_time > self.last_check_time:
-                    logger.info(f"New Launchpool Found: {latest['title']}")
-                    self.last_check_time = datetime.now()
-                    return latest
-                    
-            return None
-            
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=10),
+                headers={
+                    'Accept': 'application/json',
+                    'Content-Type': 'application/json'
+                }
+            )
+            self._session_loop = loop
+            logger.info("Announcement HTTP session opened")
+
+        return self._session
+
+    async def _fetch(self, session, url, params):
+        """GET one host and return (status, headers, data)"""
+        async with session.get(
+            url, params=params,
+            timeout=aiohttp.ClientTimeout(total=settings.ANNOUNCEMENT_FEED_TIMEOUT)
+        ) as response:
+            data = await response.json(content_type=None) if response.status == 200 else None
+            return response.status, response.headers, data
+
+    def rank_hosts(self):
+        """Order the hosts by median latency, unmeasured hosts first so they get sampled"""
+        def median(url):
+            return metrics.percentiles(f'announcement_host_ms:{url}', (50,)).get('p50', 0)
+
+        ranked = sorted(self.urls, key=median)
+        if ranked[0] != self.urls[0]:
+            logger.info(f"Primary announcement host is now {ranked[0]}")
+        self.urls = ranked
+        return ranked
+
+    async def _hedged_fetch(self, session, params):
+        """Race the query across the hosts and return the first valid response
+
+        Hosts start HEDGE_DELAY_MS apart in latency order (all at once by default);
+        the rest are cancelled as soon as one host answers with retCode 0.
+        """
+        hosts = self.urls if settings.HEDGE_REQUESTS else self.urls[:1]
+        if len(hosts) == 1:
+            return await self._fetch(session, hosts[0], params)
+
+        started = {}
+
+        async def delayed(url, delay):
+            if delay:
+                await asyncio.sleep(delay)
+            started[url] = time.perf_counter()
+            return url, await self._fetch(session, url, params)
+
+        def observe(url, latency_ms):
+            metrics.observe(f'announcement_host_ms:{url}', latency_ms)
+
+        # Failed or invalid answers count as a timeout so a fast but broken host isn't promoted
+        penalty_ms = settings.ANNOUNCEMENT_FEED_TIMEOUT * 1000
+        delay = settings.HEDGE_DELAY_MS / 1000
+        tasks = {asyncio.create_task(delayed(url, i * delay)): url for i, url in enumerate(hosts)}
+        pending = set(tasks)
+        last_result = None
+        last_error = None
+        winner_ms = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        observe(tasks[task], penalty_ms)
+                        last_error = task.exception()
+                        continue
+                    url, result = task.result()
+                    status, _, data = result
+                    if status == 200 and data and data.get('retCode') == 0:
+                        winner_ms = (time.perf_counter() - started[url]) * 1000
+                        observe(url, winner_ms)
+                        metrics.incr(f'announcement_hedge_wins:{url}')
+                        return result
+                    observe(url, penalty_ms)
+                    last_result = result
+        finally:
+            now = time.perf_counter()
+            for task in pending:
+                task.cancel()
+                url = tasks[task]
+                if url in started and winner_ms is not None:
+                    # Its time was cut short by the winner, so it counts as slower than the winner
+                    observe(url, max((now - started[url]) * 1000, winner_ms) + HEDGE_LOSS_PENALTY_MS)
+            await asyncio.gather(*pending, return_exceptions=True)
+            self.rank_hosts()
+
+        # No host gave a valid answer
+        if last_result is None:
+            raise last_error
+        return last_result
+
+    async def _poll_feed(self, session, feed):
+        """Fetch one feed and return (feed, new announcements, whole page)"""
+        params = {'locale': feed['locale'], 'page': 1, 'limit': settings.ANNOUNCEMENT_LIMIT}
+        if feed['type']:
+            params['type'] = feed['type']
+        if feed['tag']:
+            params['tag'] = feed['tag']
+
+        try:
+            poll_start = time.perf_counter()
+            status, headers, data = await self._hedged_fetch(session, params)
+
+            self.scheduler.observe_response(status, headers, feed['name'])
+            if status != 200:
+                logger.error(f"API Error on feed {feed['name']}: {status}")
+                return feed, [], []
+
+            parse_start = time.perf_counter()
+            metrics.observe('stage_poll_ms', (parse_start - poll_start) * 1000)
+
+            if data.get('retCode') == 0:
+                self.scheduler.record_success(feed['name'])
+            else:
+                # e.g. 10006, too many visits
+                self.scheduler.record_error(feed['name'])
+            result = self._process_response(data, feed['name'])
+            metrics.observe('stage_parse_ms', (time.perf_counter() - parse_start) * 1000)
+            return feed, result, data.get('result', {}).get('list', [])
+
+        except asyncio.TimeoutError:
+            self.scheduler.record_error(feed['name'])
+            metrics.incr('announcement_feed_timeouts')
+            logger.warning(f"Announcement feed {feed['name']} timed out")
+            return feed, [], []
+        except Exception as e:
+            self.scheduler.record_error(feed['name'])
+            logger.error(f"Announcement feed {feed['name']} error: {str(e)}")
+            return feed, [], []
+
+    async def iter_new_listings(self):
+        """Poll every feed concurrently and yield new announcements as each feed answers
+
+        A slow feed only delays its own results. Announcements listed by several
+        feeds are yielded once: the shared seen index filters them in the same pass.
+        """
+        try:
+            logger.info(f"Checking {len(self.feeds)} announcement feeds...")
+            session = await self._get_session()
+
+            tasks = [self._poll_feed(session, feed) for feed in self.feeds]
+            for future in asyncio.as_completed(tasks):
+                feed, new, page = await future
+                for announcement in new:
+                    announcement.setdefault('feed', feed['name'])
+                    yield announcement
+
+                if self.archive is not None and page:
+                    # After the consumer acted on the new items, off the event loop
+                    await asyncio.to_thread(self.archive.add_many, page, feed['locale'])
+
         except Exception as e:
             logger.error(f"Announcement check error: {str(e)}")
-            return None 
\ No newline at end of file
+
+    async def check_new_listings_async(self):
+        """Return every new announcement of all feeds without blocking the event loop"""
+        return [announcement async for announcement in self.iter_new_listings()]
+
+    def check_new_listings(self):
+        """Return new announcements (blocking wrapper around the async check)"""
+        if self._loop is None or self._loop.is_closed():
+            self._loop = asyncio.new_event_loop()
+        return self._loop.run_until_complete(self.check_new_listings_async())
+
+    def _process_response(self, data, feed='default'):
+        """Return unseen announcements of a feed, oldest first, and record them as processed"""
+        if data.get('retCode') != 0:
+            logger.error(f"API Response Error: {data}")
+            return []
+
+        announcements = data.get('result', {}).get('list', [])
+
+        if not self.seen.is_seeded(feed):
+            # First poll of a feed: whatever is already published is history, not a signal
+            self.seen.add(announcements)
+            self.seen.mark_seeded(feed)
+            logger.info(f"Feed {feed} seeded with {len(announcements)} announcements")
+            return []
+
+        new = [a for a in announcements if self.seen.is_new(a)]
+        if not new:
+            return []
+
+        new.sort(key=lambda a: int(a.get('dateTimestamp', 0)))
+        # Recorded before anyone acts on them: at most one trade per announcement
+        self.seen.add(new)
+        now_ms = server_clock.now_ms()
+        for announcement in new:
+            metrics.observe('publish_to_detect_ms', now_ms - int(announcement.get('dateTimestamp', 0)))
+            logger.info(f"New announcement on {feed}: {announcement.get('title')}")
+        return new
+
+    async def aclose(self):
+        """Close the shared HTTP session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+            logger.info("Announcement HTTP session closed")
+        self._session = None
+        self._session_loop = None
+        self.seen.close()
+
+    def close(self):
+        """Close the session and the private loop used by the sync wrapper"""
+        if self._loop is not None and not self._loop.is_closed():
+            if self._session_loop is self._loop:
+                self._loop.run_until_complete(self.aclose())
+            self._loop.close()
+        self._loop = None
+        self.seen.close()
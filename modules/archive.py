@@ -0,0 +1,122 @@
+import os
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from utils.logger import setup_logger
+from config.settings import settings
+from modules.seen_index import announcement_key
+from modules.classifier import AnnouncementClassifier
+
+logger = setup_logger('archive')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS announcements (
+    id INTEGER PRIMARY KEY,
+    key TEXT UNIQUE NOT NULL,
+    title TEXT NOT NULL,
+    description TEXT,
+    url TEXT,
+    type TEXT,
+    tags TEXT,
+    class TEXT,
+    locale TEXT,
+    date_ms INTEGER
+);
+CREATE INDEX IF NOT EXISTS announcements_date ON announcements(date_ms);
+CREATE VIRTUAL TABLE IF NOT EXISTS announcements_fts USING fts5(
+    title, description, tags, content='announcements', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS announcements_ai AFTER INSERT ON announcements BEGIN
+    INSERT INTO announcements_fts(rowid, title, description, tags)
+    VALUES (new.id, new.title, new.description, new.tags);
+END;
+"""
+
+_QUERY_TOKEN = re.compile(r'\w+')
+
+class AnnouncementArchive:
+    """Local SQLite archive of announcements with an FTS5 index
+
+    Rows are only ever inserted (the key is the announcement URL, like the
+    seen index), so the external-content FTS table is kept in sync by a
+    single insert trigger.
+    """
+
+    def __init__(self, path=None, classifier=None):
+        self.path = Path(path or settings.ARCHIVE_FILE)
+        self.classifier = classifier or AnnouncementClassifier()
+        os.makedirs(self.path.parent, exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+
+    def add_many(self, announcements, locale=None):
+        """Insert announcements that are not archived yet, return how many were new"""
+        # Archiving is not detection, keep it out of the live class counters
+        classes = self.classifier.classify_many(announcements, record=False)
+        rows = []
+        for i, announcement in enumerate(announcements):
+            rows.append((
+                announcement_key(announcement),
+                announcement.get('title') or '',
+                announcement.get('description') or '',
+                announcement.get('url'),
+                (announcement.get('type') or {}).get('key'),
+                ' '.join(announcement.get('tags') or ()),
+                classes[i],
+                announcement.get('locale') or locale,
+                int(announcement.get('dateTimestamp', 0))
+            ))
+
+        try:
+            with self._lock, self.conn:
+                cursor = self.conn.executemany(
+                    "INSERT OR IGNORE INTO announcements "
+                    "(key, title, description, url, type, tags, class, locale, date_ms) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+                # Ignored duplicates and the FTS trigger inserts are not counted
+                return cursor.rowcount
+
+        except Exception as e:
+            logger.error(f"Error archiving announcements: {str(e)}")
+            return 0
+
+    def search(self, query, limit=10):
+        """Full-text search, best matches first (newest first on ties)"""
+        # Quote every word so user input can't use FTS syntax
+        terms = ' '.join(f'"{token}"' for token in _QUERY_TOKEN.findall(query))
+        if not terms:
+            return []
+
+        try:
+            with self._lock:
+                cursor = self.conn.execute(
+                    "SELECT a.title, a.url, a.class, a.date_ms FROM announcements_fts "
+                    "JOIN announcements a ON a.id = announcements_fts.rowid "
+                    "WHERE announcements_fts MATCH ? "
+                    "ORDER BY bm25(announcements_fts), a.date_ms DESC LIMIT ?",
+                    (terms, limit)
+                )
+                return [
+                    {'title': title, 'url': url, 'class': cls, 'dateTimestamp': date_ms}
+                    for title, url, cls, date_ms in cursor.fetchall()
+                ]
+
+        except Exception as e:
+            logger.error(f"Archive search error: {str(e)}")
+            return []
+
+    def count(self):
+        """Number of archived announcements"""
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM announcements").fetchone()[0]
+
+    def close(self):
+        """Close the database"""
+        with self._lock:
+            self.conn.close()
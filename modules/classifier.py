@@ -0,0 +1,78 @@
+import re
+from collections import Counter
+from utils.logger import setup_logger
+from utils.metrics import metrics
+
+logger = setup_logger('classifier')
+
+LAUNCHPOOL = 'launchpool'
+NEW_LISTING = 'new_listing'
+DELISTING = 'delisting'
+MAINTENANCE = 'maintenance'
+OTHER = 'other'
+
+CLASSES = (LAUNCHPOOL, NEW_LISTING, DELISTING, MAINTENANCE, OTHER)
+
+_TOKEN = re.compile(r'[a-z0-9]+')
+
+# Rules in priority order: (class, announcement type keys, tags, title keywords).
+# Keywords are single words or two-word phrases. A delisting notice that
+# mentions a listing is still a delisting. The Derivatives tag and words such
+# as "perpetual" also cover risk-limit and funding notices, so a derivatives
+# listing needs a listing keyword.
+RULES = (
+    (DELISTING, frozenset({'delistings'}), frozenset(),
+     frozenset({'delist', 'delisting', 'delisted', 'delists', 'removal'})),
+    (MAINTENANCE, frozenset({'maintenance_updates'}), frozenset(),
+     frozenset({'maintenance', 'upgrade', 'suspension', 'suspended', 'downtime'})),
+    (LAUNCHPOOL, frozenset(), frozenset({'launchpool'}),
+     frozenset({'launchpool'})),
+    (NEW_LISTING, frozenset({'new_crypto'}), frozenset({'spot listings', 'new listings'}),
+     frozenset({'listing', 'lists', 'listed', 'will list', 'to list'})),
+)
+
+class AnnouncementClassifier:
+    """Rule-based announcement classifier
+
+    Type keys and tags decide first, title keywords second. Keyword sets are
+    frozen at import and the title is tokenised with one precompiled regex,
+    so bulk classification does no per-item compilation.
+    """
+
+    def __init__(self, rules=RULES):
+        self.rules = rules
+        self.counts = Counter()
+
+    def classify(self, announcement):
+        """Return the class of one announcement"""
+        cls = self._classify(announcement)
+        self.counts[cls] += 1
+        metrics.incr(f'announcements_classified:{cls}')
+        return cls
+
+    def classify_many(self, announcements, record=True):
+        """Classify a batch (e.g. a backfill), counting once per class"""
+        classes = [self._classify(announcement) for announcement in announcements]
+        if not record:
+            return classes
+
+        batch = Counter(classes)
+        self.counts.update(batch)
+        for cls, count in batch.items():
+            metrics.incr(f'announcements_classified:{cls}', count)
+        return classes
+
+    def _classify(self, announcement):
+        type_key = (announcement.get('type') or {}).get('key', '')
+        tags = {tag.lower() for tag in announcement.get('tags') or ()}
+        tokens = _TOKEN.findall((announcement.get('title') or '').lower())
+        words = set(tokens)
+        words.update(f'{first} {second}' for first, second in zip(tokens, tokens[1:]))
+
+        for cls, type_keys, rule_tags, keywords in self.rules:
+            if type_key in type_keys or not tags.isdisjoint(rule_tags):
+                return cls
+        for cls, _, _, keywords in self.rules:
+            if not words.isdisjoint(keywords):
+                return cls
+        return OTHER
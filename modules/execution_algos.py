@@ -0,0 +1,305 @@
+import asyncio
+import itertools
+import time
+from utils.logger import setup_logger
+from utils.metrics import metrics
+from modules.notifier import PRIORITY_ALERT
+from modules.order_registry import order_link_id
+from config.settings import settings
+
+logger = setup_logger('execution_algos')
+
+TWAP = 'twap'
+ICEBERG = 'iceberg'
+POV = 'pov'
+ALGOS = (TWAP, ICEBERG, POV)
+
+RUNNING = 'running'
+DONE = 'done'
+CANCELLED = 'cancelled'
+
+# Slices in a row that may fail before the job gives up
+MAX_FAILED_SLICES = 3
+
+class AlgoJob:
+    """State of one sliced order"""
+
+    def __init__(self, job_id, algo, symbol, notional, stop_loss, take_profit, leverage, link_key, chat_ids=None):
+        self.id = job_id
+        self.algo = algo
+        self.symbol = symbol
+        self.notional = notional
+        self.stop_loss = stop_loss
+        self.take_profit = take_profit
+        self.leverage = leverage
+        self.link_key = link_key
+        self.chat_ids = chat_ids
+
+        self.state = RUNNING
+        self.reason = None
+        self.started_at = time.monotonic()
+        self.sent = 0
+        self.filled = 0
+        self.failed_in_row = 0
+        self.filled_usdt = 0.0
+        self.filled_qty = 0.0
+        self.cost = 0.0
+        # Protective prices of the first fill, checked between slices
+        self.stop_price = None
+        self.take_price = None
+        # Turnover seen at the last participation clip
+        self.last_turnover = None
+        # Set to cut a wait between slices short (cancel)
+        self.wakeup = asyncio.Event()
+
+    @property
+    def remaining(self):
+        return max(self.notional - self.filled_usdt, 0.0)
+
+    @property
+    def avg_price(self):
+        return self.cost / self.filled_qty if self.filled_qty else None
+
+    def finish(self, state, reason=None):
+        """Stop the job (the first reason given wins)"""
+        if self.state == RUNNING:
+            self.state = state
+            self.reason = reason
+            self.wakeup.set()
+
+def format_progress(job):
+    """Format the progress message of a job (sent once, then edited)"""
+    share = job.filled_usdt / job.notional if job.notional else 0
+    bar = '▓' * int(min(share, 1) * 10) + '░' * (10 - int(min(share, 1) * 10))
+    avg_price = f"{job.avg_price:.6g}" if job.avg_price else '-'
+
+    if job.state == RUNNING:
+        status = "⏳ Running"
+    elif job.state == DONE:
+        status = f"✅ Done{f' ({job.reason})' if job.reason else ''}"
+    else:
+        status = f"🛑 Cancelled: {job.reason}"
+
+    return (
+        f"🧩 <b>{job.algo.upper()} {job.symbol}</b> #{job.id}\n\n"
+        f"{bar} {share * 100:.0f}%\n"
+        f"• Filled: {job.filled_usdt:.2f} / {job.notional:.2f} USDT\n"
+        f"• Slices: {job.filled} filled, {job.sent - job.filled} failed\n"
+        f"• Avg price: {avg_price}\n\n"
+        f"{status}"
+    )
+
+class ExecutionAlgos:
+    """Asyncio scheduler of sliced executions: TWAP, iceberg and participation-capped
+
+    The first slice is sent inline so the detect → order path stays as short
+    as for a single order; the rest run as a task. Each slice is capped by
+    the order book depth within ALGO_MAX_SLIPPAGE, carries a deterministic
+    orderLinkId, and progress is reported as one edited Telegram message.
+    Jobs stop on completion, ALGO_MAX_DURATION, the first fill's SL/TP price,
+    a closed position or cancel()/cancel_all() (/kill). SL/TP are set on
+    the position by the first filled slice only; later slices leave them.
+    """
+
+    def __init__(self, trader, notifier, algo=None, max_slippage=None, max_duration=None):
+        self.trader = trader
+        self.notifier = notifier
+        self.algo = (algo or settings.EXECUTION_ALGO).lower()
+        self.max_slippage = max_slippage if max_slippage is not None else settings.ALGO_MAX_SLIPPAGE
+        self.max_duration = max_duration if max_duration is not None else settings.ALGO_MAX_DURATION
+
+        self.jobs = {}
+        self._tasks = {}
+        self._ids = itertools.count(1)
+
+    def applies(self, notional):
+        """True when an order of this size is sliced"""
+        return self.algo in ALGOS and notional >= settings.ALGO_MIN_NOTIONAL
+
+    def running(self):
+        """Return the jobs still working"""
+        return [job for job in self.jobs.values() if job.state == RUNNING]
+
+    async def start(self, symbol, notional, stop_loss, take_profit, leverage, link_key, chat_ids=None, algo=None):
+        """Send the first slice and schedule the rest, returns (job, first slice result)"""
+        for job in self.running():
+            if job.link_key == link_key and job.symbol == symbol:
+                logger.warning(f"Algo job #{job.id} already works on {symbol} for this event")
+                return job, {'success': True, 'duplicate': True}
+
+        job = AlgoJob(next(self._ids), algo or self.algo, symbol, notional, stop_loss, take_profit,
+                      leverage, link_key, chat_ids)
+        self.jobs[job.id] = job
+        logger.info(f"Algo job #{job.id}: {job.algo} {notional} USDT of {symbol}")
+
+        # Book updates from the stream from now on, REST snapshots meanwhile
+        await self.trader.market_data.add_books([symbol])
+
+        first = await self._slice(job)
+        self.report(job)
+        if job.state == RUNNING:
+            self._tasks[job.id] = asyncio.create_task(self._run(job))
+        return job, first or {'success': False, 'error': 'No liquidity for the first slice'}
+
+    def cancel(self, job_id, reason='cancelled'):
+        """Stop a job before its next slice"""
+        job = self.jobs.get(job_id)
+        if job is None or job.state != RUNNING:
+            return False
+        job.finish(CANCELLED, reason)
+        logger.info(f"Algo job #{job_id} cancelled: {reason}")
+        return True
+
+    def cancel_symbol(self, symbol, reason):
+        """Stop every job working on a symbol"""
+        return [job.id for job in self.running() if job.symbol == symbol and self.cancel(job.id, reason)]
+
+    def cancel_all(self, reason='killed'):
+        """Stop every running job"""
+        return [job.id for job in self.running() if self.cancel(job.id, reason)]
+
+    async def stop(self):
+        """Cancel all jobs and wait for their tasks"""
+        self.cancel_all('shutdown')
+        tasks = list(self._tasks.values())
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def interval(self, job):
+        """Seconds between two slices"""
+        if job.algo == TWAP:
+            return settings.TWAP_DURATION / max(settings.TWAP_SLICES, 1)
+        if job.algo == ICEBERG:
+            return settings.ICEBERG_INTERVAL
+        return settings.POV_INTERVAL
+
+    async def _run(self, job):
+        """Slice until the job is done or stopped"""
+        try:
+            while job.state == RUNNING:
+                try:
+                    await asyncio.wait_for(job.wakeup.wait(), timeout=self.interval(job))
+                except asyncio.TimeoutError:
+                    pass
+                if job.state != RUNNING:
+                    break
+
+                await self._check_stops(job)
+                if job.state != RUNNING:
+                    break
+
+                await self._slice(job)
+                self.report(job)
+
+        except Exception as e:
+            logger.error(f"Algo job #{job.id} error: {str(e)}")
+            job.finish(CANCELLED, str(e))
+
+        finally:
+            self._tasks.pop(job.id, None)
+            metrics.observe('algo_fill_ratio', job.filled_usdt / job.notional if job.notional else 0)
+            self.report(job)
+
+    async def _check_stops(self, job):
+        """Cancel when the mark price reached the first fill's SL or TP"""
+        if job.stop_price is None and job.take_price is None:
+            return
+        mark_price = await asyncio.to_thread(self.trader.market_data.get_mark_price, job.symbol)
+        if not mark_price:
+            return
+        if job.stop_price is not None and mark_price <= job.stop_price:
+            job.finish(CANCELLED, f"stop loss {job.stop_price} reached")
+        elif job.take_price is not None and mark_price >= job.take_price:
+            job.finish(CANCELLED, f"take profit {job.take_price} reached")
+
+    def clip(self, job, book, mark_price):
+        """USDT of the next slice before the minimum order check"""
+        remaining = job.remaining
+
+        if job.algo == TWAP:
+            clip = remaining / max(settings.TWAP_SLICES - job.sent, 1)
+        elif job.algo == ICEBERG:
+            clip = min(settings.ICEBERG_CLIP, remaining)
+        else:
+            # Participation cap on the turnover traded since the last clip,
+            # the visible depth stands in before there is a reference
+            ticker = self.trader.market_data.get(job.symbol) or {}
+            turnover = float(ticker.get('turnover24h') or 0) or None
+            if job.last_turnover is not None and turnover is not None:
+                traded = max(turnover - job.last_turnover, 0.0)
+            else:
+                traded = book.depth('Buy', self.max_slippage) if book else 0.0
+            if turnover is not None:
+                job.last_turnover = turnover
+            clip = min(settings.POV_RATE * traded, remaining)
+
+        if book is not None:
+            clip = min(clip, book.depth('Buy', self.max_slippage))
+        return clip
+
+    async def _slice(self, job):
+        """Send one slice, None when nothing was sent this round"""
+        if time.monotonic() - job.started_at > self.max_duration:
+            job.finish(DONE, 'max duration reached')
+            return None
+
+        mark_price = await asyncio.to_thread(self.trader.market_data.get_mark_price, job.symbol)
+        if not mark_price:
+            return None
+        book = await asyncio.to_thread(self.trader.market_data.get_book, job.symbol)
+
+        min_usdt = self.trader.normalizer.spec(job.symbol)['min_qty'] * mark_price
+        if job.remaining < min_usdt:
+            job.finish(DONE)
+            return None
+
+        clip = self.clip(job, book, mark_price)
+        if clip < min_usdt:
+            metrics.incr('algo_slices_skipped')
+            return None
+
+        template = await asyncio.to_thread(
+            self.trader.prepare_order, clip, job.stop_loss, job.take_profit, job.leverage, symbol=job.symbol
+        )
+        if not template:
+            return None
+        if job.stop_price is not None or job.take_price is not None:
+            # Position-level SL/TP: a later slice would move them off the first fill's levels
+            order_params = {k: v for k, v in template['order_params'].items() if k not in ('stopLoss', 'takeProfit')}
+            template = dict(template, order_params=order_params)
+
+        link_id = order_link_id(job.link_key, f"{job.symbol}#{job.sent}")
+        job.sent += 1
+        result = await asyncio.to_thread(self.trader.place_template, template, link_id)
+
+        if result.get('success'):
+            data = result['data']
+            job.filled += 1
+            job.failed_in_row = 0
+            job.filled_usdt += data['usdt_value']
+            job.filled_qty += data['mnt_quantity']
+            job.cost += data['entry_price'] * data['mnt_quantity']
+            if job.stop_price is None:
+                job.stop_price = data['stop_loss']
+                job.take_price = data['take_profit']
+            metrics.incr('algo_slices_filled')
+        else:
+            job.failed_in_row += 1
+            metrics.incr('algo_slices_failed')
+            if job.failed_in_row >= MAX_FAILED_SLICES:
+                job.finish(CANCELLED, result.get('error', 'Unknown error'))
+
+        if job.state == RUNNING and job.remaining < min_usdt:
+            job.finish(DONE)
+        if job.state == RUNNING and job.algo == TWAP and job.sent >= settings.TWAP_SLICES:
+            job.finish(DONE, 'all slices sent')
+        return result
+
+    def report(self, job):
+        """Queue the job's progress; updates edit the same message"""
+        self.notifier.enqueue(
+            format_progress(job),
+            chat_ids=job.chat_ids,
+            priority=PRIORITY_ALERT,
+            edit_key=f"algo:{job.id}"
+        )
@@ -0,0 +1,120 @@
+from utils.logger import setup_logger
+from utils.metrics import metrics
+from config.settings import settings
+from modules.instruments import instrument_cache
+
+logger = setup_logger('instrument_watcher')
+
+# Event types
+NEW_SYMBOL = 'new_symbol'
+STATUS_CHANGE = 'status_change'
+REMOVED_SYMBOL = 'removed_symbol'
+
+class InstrumentWatcher:
+    """Polls instruments-info and emits events from an incremental diff
+
+    The universe is paged with the cursor. Each page is fingerprinted by its
+    (symbol, status) pairs and only pages whose fingerprint changed are
+    diffed, so a quiet poll costs the requests and a hash per page. New
+    symbols are added to the shared instrument cache right away so the
+    symbol parser and the executor can use them.
+    """
+
+    def __init__(self, cache=None, categories=None, page_size=1000):
+        self.cache = cache or instrument_cache
+        self.categories = categories or settings.INSTRUMENT_WATCH_CATEGORIES
+        self.page_size = page_size
+        # category -> {symbol: status}
+        self.known = {}
+        # category -> [page fingerprint]
+        self.fingerprints = {}
+
+    def poll(self):
+        """Poll every category, return the events of this pass"""
+        events = []
+        for category in self.categories:
+            events.extend(self.poll_category(category))
+        return events
+
+    def poll_category(self, category):
+        """Poll one category, the first pass only seeds the known universe"""
+        client = self.cache.client
+        if client is None:
+            logger.error("Instrument watcher has no client bound")
+            return []
+
+        try:
+            pages = []
+            cursor = None
+            while True:
+                params = {'category': category, 'limit': self.page_size}
+                if cursor:
+                    params['cursor'] = cursor
+
+                response = client.get_instruments_info(**params)
+                if not response or response.get('retCode') != 0:
+                    logger.error(f"Instrument watch failed: {response}")
+                    return []
+
+                result = response.get('result', {})
+                pages.append(result.get('list', []))
+                cursor = result.get('nextPageCursor')
+                if not cursor:
+                    break
+
+        except Exception as e:
+            logger.error(f"Error polling instruments: {str(e)}")
+            return []
+
+        return self.diff(category, pages)
+
+    def diff(self, category, pages):
+        """Diff the fetched pages against the known universe"""
+        fingerprints = [hash(tuple((i.get('symbol'), i.get('status')) for i in page)) for page in pages]
+        previous = self.fingerprints.get(category)
+        seeding = category not in self.known
+        known = self.known.setdefault(category, {})
+
+        if fingerprints == previous:
+            metrics.incr('instrument_watch_unchanged')
+            return []
+        self.fingerprints[category] = fingerprints
+
+        events = []
+        seen = set()
+        for index, page in enumerate(pages):
+            unchanged = previous is not None and index < len(previous) and previous[index] == fingerprints[index]
+            for instrument in page:
+                symbol = instrument.get('symbol')
+                status = instrument.get('status')
+                seen.add(symbol)
+                if unchanged:
+                    continue
+
+                old_status = known.get(symbol)
+                if old_status == status:
+                    continue
+
+                known[symbol] = status
+                self.cache.put(category, instrument)
+                if seeding:
+                    continue
+                if old_status is None:
+                    events.append({'type': NEW_SYMBOL, 'category': category, 'symbol': symbol, 'status': status})
+                else:
+                    events.append({
+                        'type': STATUS_CHANGE, 'category': category, 'symbol': symbol,
+                        'status': status, 'previous': old_status
+                    })
+
+        for symbol in [symbol for symbol in known if symbol not in seen]:
+            del known[symbol]
+            if not seeding:
+                events.append({'type': REMOVED_SYMBOL, 'category': category, 'symbol': symbol})
+
+        if seeding:
+            logger.info(f"Instrument watcher seeded with {len(known)} {category} symbols")
+        for event in events:
+            metrics.incr(f"instrument_events:{event['type']}")
+            logger.info(f"Instrument event: {event}")
+        return events
@@ -0,0 +1,230 @@
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from utils.logger import setup_logger
+from config.settings import settings
+
+logger = setup_logger('instruments')
+
+def decimal_scale(text):
+    """Split a decimal string into (decimals, integer units): '0.005' -> (3, 5)"""
+    text = str(text).strip()
+    if 'e' in text.lower():
+        text = f"{float(text):.12f}"
+    whole, _, fraction = text.partition('.')
+    fraction = fraction.rstrip('0')
+    return len(fraction), int((whole + fraction).lstrip('-') or 0)
+
+def _parse_instrument(instrument):
+    """Precompute the numeric filters of an instruments-info entry"""
+    lot_size_filter = instrument.get('lotSizeFilter', {})
+    price_filter = instrument.get('priceFilter', {})
+    leverage_filter = instrument.get('leverageFilter', {})
+
+    # Spot instruments publish basePrecision instead of qtyStep
+    qty_step = lot_size_filter.get('qtyStep') or lot_size_filter.get('basePrecision') or '1'
+    min_qty = lot_size_filter.get('minOrderQty', '1')
+    max_qty = lot_size_filter.get('maxOrderQty', '10000')
+    tick_size = price_filter.get('tickSize', '0.0001')
+
+    # Integer scale factors for exact normalization (see modules/normalizer.py)
+    step_decimals, step_units = decimal_scale(qty_step)
+    qty_decimals = max(step_decimals, decimal_scale(min_qty)[0])
+    qty_units = step_units * 10 ** (qty_decimals - step_decimals)
+    min_qty_units = round(float(min_qty) * 10 ** qty_decimals)
+    max_qty_units = round(float(max_qty) * 10 ** qty_decimals)
+    tick_decimals, tick_units = decimal_scale(tick_size)
+
+    return {
+        'raw': instrument,
+        'symbol': instrument.get('symbol'),
+        'status': instrument.get('status'),
+        'base_coin': instrument.get('baseCoin'),
+        'quote_coin': instrument.get('quoteCoin'),
+        'min_qty': float(min_qty),
+        'max_qty': float(max_qty),
+        'qty_step': float(qty_step),
+        'tick_size': float(tick_size),
+        'qty_decimals': qty_decimals,
+        'qty_units': qty_units,
+        # Bounds rounded inwards onto the step grid
+        'min_qty_units': -(-min_qty_units // qty_units) * qty_units,
+        'max_qty_units': max_qty_units // qty_units * qty_units,
+        'tick_decimals': tick_decimals,
+        'tick_units': tick_units,
+        'min_leverage': float(leverage_filter.get('minLeverage', 1)),
+        'max_leverage': float(leverage_filter.get('maxLeverage', 1)),
+        'leverage_step': float(leverage_filter.get('leverageStep', 0.01))
+    }
+
+class InstrumentCache:
+    """Shared instruments-info cache keyed by (category, symbol)"""
+
+    def __init__(self, cache_file=None, ttl=None):
+        self.cache_file = Path(cache_file or settings.INSTRUMENT_CACHE_FILE)
+        self.ttl = ttl if ttl is not None else settings.INSTRUMENT_CACHE_TTL
+        self.client = None
+        self.instruments = {}
+        # category -> wall clock time of the last full download
+        self.loaded_at = {}
+        self._lock = threading.Lock()
+
+    def bind(self, client):
+        """Attach the pybit client used for downloads (the latest executor wins)"""
+        self.client = client
+
+    def load_all(self, category="linear"):
+        """Download the whole instrument universe of a category in one paginated pass"""
+        if self.client is None:
+            logger.error("Instrument cache has no client bound")
+            return False
+
+        try:
+            entries = {}
+            cursor = None
+
+            while True:
+                params = {'category': category, 'limit': 1000}
+                if cursor:
+                    params['cursor'] = cursor
+
+                response = self.client.get_instruments_info(**params)
+                if not response or response.get('retCode') != 0:
+                    logger.error(f"Instruments download failed: {response}")
+                    return False
+
+                result = response.get('result', {})
+                for instrument in result.get('list', []):
+                    entries[(category, instrument['symbol'])] = _parse_instrument(instrument)
+
+                cursor = result.get('nextPageCursor')
+                if not cursor:
+                    break
+
+            with self._lock:
+                for key in [key for key in self.instruments if key[0] == category]:
+                    if key not in entries:
+                        del self.instruments[key]
+                self.instruments.update(entries)
+                self.loaded_at[category] = time.time()
+
+            logger.info(f"Instrument cache loaded {len(entries)} {category} instruments")
+            self.save()
+            return True
+
+        except Exception as e:
+            logger.error(f"Error loading instruments: {str(e)}")
+            return False
+
+    def is_stale(self, category="linear"):
+        """True when the category was never loaded or is older than the TTL"""
+        loaded_at = self.loaded_at.get(category)
+        return loaded_at is None or time.time() - loaded_at > self.ttl
+
+    def refresh_if_stale(self, categories=None):
+        """Reload every stale category"""
+        for category in categories or settings.INSTRUMENT_CATEGORIES:
+            if self.is_stale(category):
+                self.load_all(category)
+
+    def get(self, category, symbol):
+        """Return the cached instrument, fetching only that symbol on a miss"""
+        instrument = self.instruments.get((category, symbol))
+        if instrument is not None or self.client is None:
+            return instrument
+
+        try:
+            response = self.client.get_instruments_info(category=category, symbol=symbol)
+            if response and response.get('result', {}).get('list'):
+                instrument = _parse_instrument(response['result']['list'][0])
+                with self._lock:
+                    self.instruments[(category, symbol)] = instrument
+                return instrument
+        except Exception as e:
+            logger.error(f"Error fetching instrument {symbol}: {str(e)}")
+
+        return None
+
+    def put(self, category, instrument):
+        """Add or replace one instrument (e.g. a new listing seen by the watcher)"""
+        parsed = _parse_instrument(instrument)
+        with self._lock:
+            self.instruments[(category, parsed['symbol'])] = parsed
+        return parsed
+
+    def lot_size(self, category, symbol):
+        """Return (min_qty, max_qty, qty_step)"""
+        instrument = self.get(category, symbol)
+        if instrument is None:
+            return 1.0, 10000.0, 1.0
+        return instrument['min_qty'], instrument['max_qty'], instrument['qty_step']
+
+    def tick_size(self, category, symbol):
+        """Return the price tick size"""
+        instrument = self.get(category, symbol)
+        return instrument['tick_size'] if instrument else 0.0001
+
+    def leverage_filter(self, category, symbol):
+        """Return (min_leverage, max_leverage, leverage_step)"""
+        instrument = self.get(category, symbol)
+        if instrument is None:
+            return 1.0, 1.0, 0.01
+        return instrument['min_leverage'], instrument['max_leverage'], instrument['leverage_step']
+
+    def symbols(self, category="linear"):
+        """Return the cached symbols of a category"""
+        return {symbol for cat, symbol in self.instruments if cat == category}
+
+    def save(self):
+        """Persist the cache for warm restarts"""
+        try:
+            with self._lock:
+                data = {
+                    'loaded_at': self.loaded_at,
+                    'instruments': [
+                        {'category': category, 'instrument': instrument['raw']}
+                        for (category, _), instrument in self.instruments.items()
+                    ]
+                }
+
+            os.makedirs(self.cache_file.parent, exist_ok=True)
+            tmp_file = self.cache_file.with_suffix('.tmp')
+            with open(tmp_file, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp_file, self.cache_file)
+            return True
+
+        except Exception as e:
+            logger.error(f"Error saving instrument cache: {str(e)}")
+            return False
+
+    def load(self):
+        """Load a previously saved cache from disk"""
+        if not self.cache_file.exists():
+            return False
+
+        try:
+            with open(self.cache_file, 'r') as f:
+                data = json.load(f)
+
+            with self._lock:
+                for item in data.get('instruments', []):
+                    instrument = item['instrument']
+                    self.instruments[(item['category'], instrument['symbol'])] = _parse_instrument(instrument)
+                self.loaded_at.update(data.get('loaded_at', {}))
+
+            logger.info(f"Instrument cache warmed with {len(self.instruments)} instruments from disk")
+            return True
+
+        except Exception as e:
+            logger.error(f"Error loading instrument cache: {str(e)}")
+            return False
+
+# Filters used when an instrument is unknown
+DEFAULT_INSTRUMENT = _parse_instrument({})
+
+# Shared in-process instance
+instrument_cache = InstrumentCache()
+instrument_cache.load()
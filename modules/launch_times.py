@@ -0,0 +1,89 @@
+import re
+from datetime import datetime, timezone
+from utils.clock import server_clock
+
+MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
+}
+
+_MONTH = r'(?P<month>jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)'
+_DAY = r'(?P<day>\d{1,2})(?:st|nd|rd|th)?'
+# HH:MM with an optional AM/PM, or an hour with AM/PM alone ("10AM")
+_TIME = r'(?P<hour>\d{1,2})(?::(?P<minute>\d{2})(?::\d{2})?)?\s*(?P<ampm>[ap]\.?m(?![a-z])\.?)?'
+_UTC = r'\(?\s*UTC(?:\s*\+\s*0)?\s*\)?'
+
+# "Jan 10, 2025, 10:00AM UTC" / "10AM UTC on Jan 10, 2025" / "2025-01-10 10:00 UTC"
+_PATTERN = re.compile(
+    '|'.join([
+        rf'{_MONTH}\.?\s+{_DAY},?\s+(?P<year>\d{{4}}),?\s*(?:at\s+)?{_TIME}\s*(?P<utc>{_UTC})?',
+        rf'{_TIME.replace("?P<", "?P<b_")}\s*(?P<b_utc>{_UTC})?\s*(?:on\s+)?{_MONTH.replace("?P<", "?P<b_")}\.?\s+{_DAY.replace("?P<", "?P<b_")},?\s+(?P<b_year>\d{{4}})',
+        r'(?P<c_year>\d{4})-(?P<c_month>\d{2})-(?P<c_day>\d{2})[ T](?P<c_hour>\d{2}):(?P<c_minute>\d{2})(?::\d{2})?\s*(?P<c_utc>' + _UTC + r')?',
+    ]),
+    re.IGNORECASE
+)
+
+# Words before a time that make it a trading start rather than e.g. a staking end
+_CONTEXT = re.compile(r'trad|list|launch|start|open|live|availab|begin|deposit', re.IGNORECASE)
+CONTEXT_CHARS = 80
+
+def _to_ms(match):
+    """Convert a match to UTC epoch ms (times without a zone are read as UTC, like Bybit's)"""
+    groups = match.groupdict()
+    for prefix in ('', 'b_', 'c_'):
+        if groups.get(f'{prefix}year'):
+            break
+
+    month = groups[f'{prefix}month']
+    month = int(month) if month.isdigit() else MONTHS[month[:3].lower()]
+    hour = int(groups[f'{prefix}hour'])
+    minute = groups[f'{prefix}minute']
+    ampm = (groups.get(f'{prefix}ampm') or '').lower()
+    if minute is None and not ampm:
+        # A bare number, not a time
+        raise ValueError('no minutes and no AM/PM')
+    if ampm.startswith('p') and hour < 12:
+        hour += 12
+    elif ampm.startswith('a') and hour == 12:
+        hour = 0
+
+    moment = datetime(
+        int(groups[f'{prefix}year']), month, int(groups[f'{prefix}day']),
+        hour, int(minute or 0), tzinfo=timezone.utc
+    )
+    return int(moment.timestamp() * 1000)
+
+def parse_times(text):
+    """Return [(epoch_ms, has_trading_context)] for every date-time in a text"""
+    times = []
+    previous_end = 0
+    for match in _PATTERN.finditer(text):
+        try:
+            when = _to_ms(match)
+        except (ValueError, KeyError):
+            continue
+        # Context stops at the previous time and at the start of the sentence
+        context = text[max(previous_end, match.start() - CONTEXT_CHARS):match.start()]
+        context = re.split(r'[.;!?\n]\s', context)[-1]
+        times.append((when, bool(_CONTEXT.search(context))))
+        previous_end = match.end()
+    return times
+
+def parse_launch_time(announcement, now_ms=None, max_ahead_days=14):
+    """Return the scheduled trading start of an announcement in epoch ms, or None
+
+    Only future times are considered; a time introduced by trading/listing
+    wording wins over a bare one, the earliest wins among equals.
+    """
+    now_ms = now_ms if now_ms is not None else server_clock.now_ms()
+    horizon = now_ms + max_ahead_days * 24 * 3600 * 1000
+
+    candidates = []
+    for field in ('title', 'description'):
+        for when, in_context in parse_times(announcement.get(field) or ''):
+            if now_ms < when <= horizon:
+                candidates.append((not in_context, when))
+
+    if not candidates:
+        return None
+    return min(candidates)[1]
@@ -0,0 +1,101 @@
+import threading
+from utils.logger import setup_logger
+from utils.metrics import metrics
+
+logger = setup_logger('leverage')
+
+# Bybit retCode for "leverage not modified"
+LEVERAGE_NOT_MODIFIED = 110043
+
+class LeverageCache:
+    """Last known leverage per (symbol, side), so set_leverage is only sent on a change"""
+
+    def __init__(self):
+        self.client = None
+        # (symbol, side) -> leverage
+        self.leverages = {}
+        self._lock = threading.Lock()
+
+    def bind(self, client):
+        """Attach the pybit client used for set_leverage (the latest executor wins)"""
+        if client is not self.client:
+            # Another client may be another account or exchange
+            self.invalidate()
+        self.client = client
+
+    def get(self, symbol, side='Buy'):
+        """Return the known leverage of a symbol side, None when unknown"""
+        return self.leverages.get((symbol, side))
+
+    def update(self, symbol, leverage, side=None):
+        """Record a leverage for one side, or both sides when no side is given"""
+        sides = (side,) if side else ('Buy', 'Sell')
+        with self._lock:
+            for s in sides:
+                self.leverages[(symbol, s)] = float(leverage)
+
+    def apply(self, position):
+        """Take the leverage from a position (REST snapshot or stream update)"""
+        leverage = position.get('leverage')
+        symbol = position.get('symbol')
+        if not leverage or not symbol:
+            return
+
+        # One-way mode (positionIdx 0) shares one leverage for both sides
+        position_idx = int(position.get('positionIdx', 0))
+        side = {1: 'Buy', 2: 'Sell'}.get(position_idx)
+        self.update(symbol, leverage, side)
+
+    def seed(self, positions):
+        """Load the leverage of every position in a REST snapshot"""
+        for position in positions:
+            self.apply(position)
+
+    def matches(self, symbol, leverage):
+        """True when both sides of the symbol are known to be at this leverage"""
+        leverage = float(leverage)
+        return self.get(symbol, 'Buy') == leverage and self.get(symbol, 'Sell') == leverage
+
+    def invalidate(self, symbol=None):
+        """Forget one symbol (or everything), forcing the next ensure to call the API"""
+        with self._lock:
+            if symbol is None:
+                self.leverages.clear()
+            else:
+                for key in [key for key in self.leverages if key[0] == symbol]:
+                    del self.leverages[key]
+
+    def ensure(self, symbol, leverage, category="linear"):
+        """Set the leverage only when it differs from the cached state"""
+        if self.matches(symbol, leverage):
+            metrics.incr('leverage_cache_hits')
+            return True
+
+        if self.client is None:
+            logger.error("Leverage cache has no client bound")
+            return False
+
+        metrics.incr('leverage_cache_misses')
+        try:
+            response = self.client.set_leverage(
+                category=category,
+                symbol=symbol,
+                buyLeverage=str(leverage),
+                sellLeverage=str(leverage)
+            )
+            if response and response.get('retCode') not in (0, LEVERAGE_NOT_MODIFIED):
+                logger.warning(f"Leverage setting failed: {response.get('retMsg')}")
+                return False
+
+        except Exception as e:
+            # pybit raises on a non-zero retCode, "not modified" still means it is set
+            if str(LEVERAGE_NOT_MODIFIED) not in str(e):
+                logger.warning(f"Leverage setting error: {str(e)}")
+                return False
+
+        self.update(symbol, leverage)
+        logger.info(f"Leverage for {symbol} set to {leverage}x")
+        return True
+
+# Shared in-process instance
+leverage_cache = LeverageCache()
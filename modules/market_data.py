@@ -0,0 +1,288 @@
+import asyncio
+import json
+import time
+import aiohttp
+from utils.logger import setup_logger
+from utils.metrics import metrics
+from utils.clock import server_clock
+from config.settings import settings
+
+logger = setup_logger('market_data')
+
+PUBLIC_STREAM_URL = 'wss://stream.bybit.com/v5/public/linear'
+TESTNET_PUBLIC_STREAM_URL = 'wss://stream-testnet.bybit.com/v5/public/linear'
+
+BOOK_DEPTH = 50
+
+class OrderBook:
+    """Local copy of one symbol's order book, built from snapshot and delta messages"""
+
+    def __init__(self):
+        # price -> size
+        self.bids = {}
+        self.asks = {}
+        self.update_id = None
+
+    def apply(self, data, snapshot=False):
+        """Merge a snapshot or delta ({'b': [[price, size]], 'a': [...]}); size 0 removes a level"""
+        if snapshot:
+            self.bids.clear()
+            self.asks.clear()
+
+        for levels, book in ((data.get('b', []), self.bids), (data.get('a', []), self.asks)):
+            for price, size in levels:
+                price, size = float(price), float(size)
+                if size == 0:
+                    book.pop(price, None)
+                else:
+                    book[price] = size
+
+        self.update_id = data.get('u', self.update_id)
+
+    def best_bid(self):
+        return max(self.bids) if self.bids else None
+
+    def best_ask(self):
+        return min(self.asks) if self.asks else None
+
+    def depth(self, side, max_slippage_pct):
+        """USDT a market order of this side can take within max_slippage_pct of the best price"""
+        if side == 'Buy':
+            best = self.best_ask()
+            if best is None:
+                return 0.0
+            limit = best * (1 + max_slippage_pct / 100)
+            return sum(price * size for price, size in self.asks.items() if price <= limit)
+
+        best = self.best_bid()
+        if best is None:
+            return 0.0
+        limit = best * (1 - max_slippage_pct / 100)
+        return sum(price * size for price, size in self.bids.items() if price >= limit)
+
+class TickerCache:
+    """In-memory last/mark price table fed by the Bybit public ticker stream
+
+    Order books of the symbols passed to add_books are kept from the same
+    connection (orderbook.50 topics).
+    """
+
+    def __init__(self, symbols, url=None, max_age=None, rest_client=None):
+        self.symbols = set(symbols)
+        self.url = url or settings.PUBLIC_STREAM_URL or (
+            TESTNET_PUBLIC_STREAM_URL if settings.TESTNET else PUBLIC_STREAM_URL
+        )
+        self.max_age = max_age if max_age is not None else settings.TICKER_MAX_AGE
+        # Used for the REST fallback when the stream is stale or down
+        self.rest_client = rest_client
+
+        # symbol -> merged ticker fields as sent by the exchange
+        self.tickers = {}
+        # symbol -> time.monotonic() of the last update
+        self.updated_at = {}
+        # symbol -> OrderBook, and time.monotonic() of its last update
+        self.books = {}
+        self.book_updated_at = {}
+
+        self.connected = False
+        self._ws = None
+        self._task = None
+        self._stopping = False
+
+    def start(self):
+        """Start the stream consumer on the running loop"""
+        if self._task is None or self._task.done():
+            self._stopping = False
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        """Stop the stream consumer"""
+        self._stopping = True
+        if self._ws is not None:
+            await self._ws.close()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def run(self):
+        """Keep the stream connected, reconnecting with backoff"""
+        delay = 1
+        async with aiohttp.ClientSession() as session:
+            while not self._stopping:
+                try:
+                    await self._consume(session)
+                    delay = 1
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.error(f"Ticker stream error: {str(e)}")
+
+                self.connected = False
+                if self._stopping:
+                    break
+
+                metrics.incr('ticker_stream_reconnects')
+                logger.warning(f"Ticker stream disconnected, reconnecting in {delay}s")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30)
+
+    async def _consume(self, session):
+        """Subscribe and process messages until the connection drops"""
+        async with session.ws_connect(self.url) as ws:
+            self._ws = ws
+            self.connected = True
+            logger.info(f"Ticker stream connected: {self.url}")
+
+            await self._subscribe(self.symbols)
+            await self._subscribe_books(self.books)
+
+            while True:
+                try:
+                    message = await ws.receive(timeout=20)
+                except asyncio.TimeoutError:
+                    # Bybit drops idle connections without an application-level ping
+                    await ws.send_str(json.dumps({'op': 'ping'}))
+                    continue
+
+                if message.type == aiohttp.WSMsgType.TEXT:
+                    self.handle_message(json.loads(message.data))
+                elif message.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                    break
+
+            self._ws = None
+
+    async def _subscribe(self, symbols):
+        """Send a ticker subscription for the given symbols"""
+        if not symbols or self._ws is None:
+            return
+        await self._ws.send_str(json.dumps({
+            'op': 'subscribe',
+            'args': [f'tickers.{symbol}' for symbol in sorted(symbols)]
+        }))
+
+    async def _subscribe_books(self, symbols):
+        """Send an order book subscription for the given symbols"""
+        if not symbols or self._ws is None:
+            return
+        await self._ws.send_str(json.dumps({
+            'op': 'subscribe',
+            'args': [f'orderbook.{BOOK_DEPTH}.{symbol}' for symbol in sorted(symbols)]
+        }))
+
+    async def add_books(self, symbols):
+        """Start keeping the order books of these symbols"""
+        new_symbols = [symbol for symbol in symbols if symbol not in self.books]
+        for symbol in new_symbols:
+            self.books[symbol] = OrderBook()
+        await self._subscribe_books(new_symbols)
+
+    async def add_symbols(self, symbols):
+        """Start tracking more symbols"""
+        new_symbols = set(symbols) - self.symbols
+        self.symbols |= new_symbols
+        await self._subscribe(new_symbols)
+
+    def handle_message(self, data):
+        """Merge a ticker snapshot or delta into the table"""
+        topic = data.get('topic', '')
+        if topic.startswith('orderbook.'):
+            symbol = topic.rsplit('.', 1)[1]
+            book = self.books.setdefault(symbol, OrderBook())
+            book.apply(data.get('data', {}), snapshot=data.get('type') == 'snapshot')
+            self.book_updated_at[symbol] = time.monotonic()
+            return
+
+        if not topic.startswith('tickers.'):
+            if data.get('op') == 'subscribe' and not data.get('success', True):
+                logger.error(f"Ticker subscription failed: {data}")
+            return
+
+        fields = data.get('data', {})
+        symbol = fields.get('symbol') or topic.split('.', 1)[1]
+
+        if data.get('type') == 'snapshot' or symbol not in self.tickers:
+            self.tickers[symbol] = dict(fields)
+        else:
+            self.tickers[symbol].update(fields)
+
+        self.updated_at[symbol] = time.monotonic()
+
+        exchange_ts = data.get('ts')
+        if exchange_ts:
+            metrics.set_gauge('ticker_stream_lag_ms', server_clock.now_ms() - int(exchange_ts))
+
+    def age(self, symbol):
+        """Seconds since the last update of a symbol (None if never seen)"""
+        updated_at = self.updated_at.get(symbol)
+        return None if updated_at is None else time.monotonic() - updated_at
+
+    def get(self, symbol):
+        """Return the cached ticker if it is fresh, without any I/O"""
+        age = self.age(symbol)
+        if age is None or age > self.max_age:
+            return None
+        return self.tickers.get(symbol)
+
+    def get_book(self, symbol):
+        """Return a fresh order book, fetching a REST snapshot when the stream has none"""
+        updated_at = self.book_updated_at.get(symbol)
+        if updated_at is not None and time.monotonic() - updated_at <= self.max_age:
+            return self.books[symbol]
+
+        if self.rest_client is None:
+            return None
+
+        try:
+            response = self.rest_client.get_orderbook(category="linear", symbol=symbol, limit=BOOK_DEPTH)
+            if not response or response.get('retCode') != 0:
+                return None
+
+            book = self.books.setdefault(symbol, OrderBook())
+            book.apply(response['result'], snapshot=True)
+            self.book_updated_at[symbol] = time.monotonic()
+            return book
+
+        except Exception as e:
+            logger.error(f"Error fetching order book {symbol}: {str(e)}")
+            return None
+
+    def get_price(self, symbol, field='markPrice'):
+        """Return a fresh cached price, falling back to REST when stale"""
+        ticker = self.get(symbol)
+        if ticker and ticker.get(field):
+            metrics.incr('ticker_cache_hits')
+            return float(ticker[field])
+
+        metrics.incr('ticker_cache_misses')
+        ticker = self.fetch_rest(symbol)
+        if ticker and ticker.get(field):
+            return float(ticker[field])
+        return None
+
+    def get_mark_price(self, symbol):
+        """Return the mark price of a symbol"""
+        return self.get_price(symbol, 'markPrice')
+
+    def fetch_rest(self, symbol):
+        """Fetch a ticker over REST and store it in the table"""
+        if self.rest_client is None:
+            return None
+
+        try:
+            response = self.rest_client.get_tickers(category="linear", symbol=symbol)
+            if not response or response.get('retCode') != 0 or not response['result']['list']:
+                return None
+
+            ticker = response['result']['list'][0]
+            self.tickers[symbol] = dict(ticker)
+            self.updated_at[symbol] = time.monotonic()
+            logger.info(f"Ticker REST fallback used for {symbol}")
+            return ticker
+
+        except Exception as e:
+            logger.error(f"Error fetching ticker {symbol}: {str(e)}")
+            return None
@@ -0,0 +1,83 @@
+from utils.logger import setup_logger
+from modules.instruments import DEFAULT_INSTRUMENT
+
+logger = setup_logger('normalizer')
+
+def format_units(units, decimals):
+    """Render an integer count of 10**-decimals as an exact decimal string"""
+    if decimals == 0:
+        return str(units)
+    sign = '-' if units < 0 else ''
+    digits = str(abs(units)).rjust(decimals + 1, '0')
+    return f"{sign}{digits[:-decimals]}.{digits[-decimals:]}"
+
+class OrderNormalizer:
+    """Exact quantity and price normalization on integer step and tick units
+
+    Instruments carry their step, tick and bounds as integer scale factors
+    (see _parse_instrument), so rounding happens on integers and the strings
+    sent to the exchange are always on the grid.
+    """
+
+    def __init__(self, instruments, category="linear"):
+        self.instruments = instruments
+        self.category = category
+
+    def spec(self, symbol):
+        """Return the instrument filters of a symbol (defaults when unknown)"""
+        return self.instruments.get(self.category, symbol) or DEFAULT_INSTRUMENT
+
+    def quantity_units(self, spec, quantity):
+        """Round a quantity to the nearest step and clamp it, in integer units"""
+        step = spec['qty_units']
+        units = round(quantity * 10 ** spec['qty_decimals'] / step) * step
+        return max(spec['min_qty_units'], min(units, spec['max_qty_units']))
+
+    def quantity(self, symbol, quantity):
+        """Normalize a contract quantity, returned as the exchange string"""
+        spec = self.spec(symbol)
+        return format_units(self.quantity_units(spec, quantity), spec['qty_decimals'])
+
+    def price(self, symbol, price):
+        """Round a price to the nearest tick, returned as the exchange string"""
+        spec = self.spec(symbol)
+        tick = spec['tick_units']
+        ticks = round(price * 10 ** spec['tick_decimals'] / tick)
+        return format_units(ticks * tick, spec['tick_decimals'])
+
+    def size(self, symbol, notional, price):
+        """Convert a USDT notional to an on-grid quantity at a price
+
+        Returns {'qty': exchange string, 'qty_value': float, 'usdt_value': float}.
+        """
+        spec = self.spec(symbol)
+        units = self.quantity_units(spec, notional / price)
+        qty_value = units / 10 ** spec['qty_decimals']
+        return {
+            'qty': format_units(units, spec['qty_decimals']),
+            'qty_value': qty_value,
+            'usdt_value': round(qty_value * price, 2)
+        }
+
+    def size_many(self, symbols, notionals, prices):
+        """Batched size(): parallel sequences in, [(qty, usdt_value)] out
+
+        Each symbol's filters are looked up once per batch and the loop only
+        touches integers, so sizing a whole basket costs little more than one.
+        """
+        specs = {}
+        results = []
+        for symbol, notional, price in zip(symbols, notionals, prices):
+            spec = specs.get(symbol)
+            if spec is None:
+                instrument = self.spec(symbol)
+                spec = specs[symbol] = (
+                    10 ** instrument['qty_decimals'], instrument['qty_decimals'], instrument['qty_units'],
+                    instrument['min_qty_units'], instrument['max_qty_units']
+                )
+            scale, decimals, step, min_units, max_units = spec
+
+            units = round(notional / price * scale / step) * step
+            units = min_units if units < min_units else max_units if units > max_units else units
+            results.append((format_units(units, decimals), round(units / scale * price, 2)))
+        return results
@@ -0,0 +1,260 @@
+import asyncio
+import itertools
+import time
+from utils.logger import setup_logger
+from utils.metrics import metrics
+
+logger = setup_logger('notifier')
+
+# Priority lanes, lower goes first
+PRIORITY_TRADE = 0
+PRIORITY_ALERT = 1
+PRIORITY_STATUS = 2
+
+# Telegram limits: ~30 messages/s overall, 1/s per private chat, 20/min per group
+GLOBAL_RATE = 30
+PRIVATE_CHAT_RATE = 1
+GROUP_CHAT_RATE = 20 / 60
+
+class TokenBucket:
+    """Token bucket that reports how long to wait instead of sleeping"""
+
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        # Set by a Telegram retry_after, no sends before this time
+        self.blocked_until = 0
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def delay(self, now=None):
+        """Seconds until a token is available"""
+        now = now if now is not None else time.monotonic()
+        self._refill(now)
+        wait = 0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+        return max(wait, self.blocked_until - now)
+
+    def take(self, now=None):
+        """Consume one token"""
+        self._refill(now if now is not None else time.monotonic())
+        self.tokens -= 1
+
+    def block(self, seconds):
+        """Stop sending for the given number of seconds"""
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+class NotificationQueue:
+    """Rate-limited, prioritised outbound Telegram queue
+
+    Messages are queued without waiting. A single worker sends them in
+    priority order while respecting the global and per-chat token buckets
+    and Telegram's retry_after. Queued messages with the same coalesce key
+    (or the same text) for a chat are merged instead of sent twice. Messages
+    with an edit key are sent once and then edited in place (progress reports).
+    """
+
+    def __init__(self, bot, default_chat_id, max_size=1000, global_rate=GLOBAL_RATE,
+                 private_chat_rate=PRIVATE_CHAT_RATE, group_chat_rate=GROUP_CHAT_RATE):
+        self.bot = bot
+        self.default_chat_id = default_chat_id
+        self.max_size = max_size
+        self.private_chat_rate = private_chat_rate
+        self.group_chat_rate = group_chat_rate
+
+        self.pending = []
+        self._by_key = {}
+        self._seq = itertools.count()
+        # Created in start() so they belong to the running loop
+        self._wakeup = None
+        self._idle = None
+
+        self.global_bucket = TokenBucket(global_rate, capacity=global_rate)
+        self.chat_buckets = {}
+        # (chat_id, edit_key) -> message_id of the message later updates edit
+        self.edit_targets = {}
+        self._worker = None
+
+    def start(self):
+        """Start the delivery worker on the running loop"""
+        if self._worker is None or self._worker.done():
+            self._wakeup = asyncio.Event()
+            self._idle = asyncio.Event()
+            if self.pending:
+                self._wakeup.set()
+            else:
+                self._idle.set()
+            self._worker = asyncio.create_task(self._run())
+            logger.info("Notification queue started")
+
+    async def stop(self, timeout=5):
+        """Flush pending messages and stop the worker"""
+        if self._worker is None:
+            return
+
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Notification queue stopped with {len(self.pending)} pending messages")
+
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+        logger.info("Notification queue stopped")
+
+    def enqueue(self, text, chat_ids=None, parse_mode='HTML', disable_web_page_preview=True,
+                priority=PRIORITY_ALERT, coalesce_key=None, edit_key=None):
+        """Queue a message without waiting for delivery
+
+        With an edit_key, the first delivery sends a message and every later
+        one edits it; queued updates for the same key are merged.
+        """
+        for chat_id in chat_ids or [self.default_chat_id]:
+            key = (chat_id, coalesce_key or edit_key or text)
+            queued = self._by_key.get(key)
+
+            if queued is not None and queued['priority'] <= priority:
+                # Newer content replaces the queued one, it keeps its place
+                queued['text'] = text
+                metrics.incr('notifications_coalesced')
+                continue
+
+            if len(self.pending) >= self.max_size:
+                metrics.incr('notifications_dropped')
+                logger.error(f"Notification queue full, dropping message for {chat_id}")
+                continue
+
+            if queued is not None:
+                # More urgent now: drop the queued copy and requeue in the faster lane
+                self.pending.remove(queued)
+                metrics.incr('notifications_coalesced')
+
+            message = {
+                'priority': priority,
+                'seq': next(self._seq),
+                'key': key,
+                'enqueued_at': time.monotonic(),
+                'chat_id': chat_id,
+                'text': text,
+                'parse_mode': parse_mode,
+                'disable_web_page_preview': disable_web_page_preview,
+                'edit_key': edit_key
+            }
+            self.pending.append(message)
+            self._by_key[key] = message
+
+        self.pending.sort(key=lambda m: (m['priority'], m['seq']))
+        metrics.set_gauge('notification_queue_depth', len(self.pending))
+        if self.pending and self._wakeup is not None:
+            self._idle.clear()
+            self._wakeup.set()
+
+    def _chat_bucket(self, chat_id):
+        bucket = self.chat_buckets.get(chat_id)
+        if bucket is None:
+            # Group and channel ids are negative
+            rate = self.group_chat_rate if str(chat_id).startswith('-') else self.private_chat_rate
+            bucket = self.chat_buckets[chat_id] = TokenBucket(rate)
+        return bucket
+
+    def _next_ready(self):
+        """Return (message, 0) for the first sendable message, or (None, wait)"""
+        now = time.monotonic()
+        global_wait = self.global_bucket.delay(now)
+        if global_wait > 0:
+            return None, global_wait
+
+        wait = None
+        for message in self.pending:
+            chat_wait = self._chat_bucket(message['chat_id']).delay(now)
+            if chat_wait <= 0:
+                return message, 0
+            wait = chat_wait if wait is None else min(wait, chat_wait)
+        return None, wait
+
+    async def _run(self):
+        """Deliver queued messages in priority order within the rate limits"""
+        while True:
+            if not self.pending:
+                self._idle.set()
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            message, wait = self._next_ready()
+            if message is None:
+                self._wakeup.clear()
+                try:
+                    # A more urgent message for another chat may arrive meanwhile
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            self.pending.remove(message)
+            self._by_key.pop(message['key'], None)
+            metrics.set_gauge('notification_queue_depth', len(self.pending))
+
+            await self._send(message)
+
+    async def _send(self, message):
+        """Send one message, honouring Telegram's retry_after"""
+        now = time.monotonic()
+        self.global_bucket.take(now)
+        self._chat_bucket(message['chat_id']).take(now)
+        metrics.observe('notification_queue_wait_ms', (now - message['enqueued_at']) * 1000)
+
+        edit_target = (message['chat_id'], message.get('edit_key'))
+        message_id = self.edit_targets.get(edit_target) if message.get('edit_key') else None
+
+        try:
+            start = time.perf_counter()
+            if message_id is not None:
+                await self.bot.edit_message_text(
+                    chat_id=message['chat_id'],
+                    message_id=message_id,
+                    text=message['text'],
+                    parse_mode=message['parse_mode'],
+                    disable_web_page_preview=message['disable_web_page_preview']
+                )
+            else:
+                sent = await self.bot.send_message(
+                    chat_id=message['chat_id'],
+                    text=message['text'],
+                    parse_mode=message['parse_mode'],
+                    disable_web_page_preview=message['disable_web_page_preview']
+                )
+                if message.get('edit_key') and getattr(sent, 'message_id', None) is not None:
+                    self.edit_targets[edit_target] = sent.message_id
+            metrics.observe('notification_send_ms', (time.perf_counter() - start) * 1000)
+            metrics.observe('stage_notify_ms', (time.monotonic() - message['enqueued_at']) * 1000)
+            metrics.incr('notifications_sent')
+
+        except Exception as e:
+            retry_after = getattr(e, 'retry_after', None)
+            if retry_after is not None:
+                # Flood control: pause this chat and put the message back in its lane
+                seconds = retry_after.total_seconds() if hasattr(retry_after, 'total_seconds') else float(retry_after)
+                self._chat_bucket(message['chat_id']).block(seconds)
+                metrics.incr('notifications_rate_limited')
+                logger.warning(f"Telegram flood control for {message['chat_id']}, retrying in {seconds}s")
+
+                if message['key'] not in self._by_key:
+                    self.pending.append(message)
+                    self._by_key[message['key']] = message
+                    self.pending.sort(key=lambda m: (m['priority'], m['seq']))
+                    metrics.set_gauge('notification_queue_depth', len(self.pending))
+                return
+
+            if message_id is not None and 'not modified' in str(e).lower():
+                # Same text as the last edit
+                return
+
+            metrics.incr('notifications_failed')
+            logger.error(f"Telegram error: {str(e)}")
@@ -0,0 +1,64 @@
+import hashlib
+import threading
+import time
+from utils.logger import setup_logger
+
+logger = setup_logger('order_registry')
+
+# Order states
+PENDING = 'pending'
+PLACED = 'placed'
+FAILED = 'failed'
+
+def order_link_id(event_key, leg):
+    """Deterministic orderLinkId for one leg of one event (Bybit allows 36 chars)"""
+    digest = hashlib.sha1(f"{event_key}|{leg}".encode()).hexdigest()
+    return f"lp-{digest[:32]}"
+
+class OrderRegistry:
+    """Local record of the orders sent under each orderLinkId
+
+    An order is PENDING from the moment it is sent until the exchange answers
+    or a lookup finds it. Callers check the registry (and, for a PENDING
+    order, the exchange) before sending again, so a retried event never opens
+    a second position.
+    """
+
+    def __init__(self, max_age=86400):
+        self.max_age = max_age
+        # link_id -> {'state', 'symbol', 'result', 'updated_at'}
+        self.orders = {}
+        self._lock = threading.Lock()
+
+    def begin(self, link_id, symbol):
+        """Record an attempt, returns the previous record (None for a new order)"""
+        with self._lock:
+            self._prune()
+            previous = self.orders.get(link_id)
+            if previous is None or previous['state'] == FAILED:
+                self.orders[link_id] = {'state': PENDING, 'symbol': symbol, 'result': None,
+                                        'updated_at': time.time()}
+            return previous
+
+    def resolve(self, link_id, state, result=None):
+        """Store the outcome of an order"""
+        with self._lock:
+            record = self.orders.setdefault(link_id, {'symbol': None})
+            record.update(state=state, result=result, updated_at=time.time())
+
+    def get(self, link_id):
+        """Return the record of a link ID"""
+        return self.orders.get(link_id)
+
+    def in_flight(self):
+        """Return the link IDs whose outcome is not known yet"""
+        return [link_id for link_id, record in self.orders.items() if record['state'] == PENDING]
+
+    def _prune(self):
+        """Forget settled orders older than max_age"""
+        cutoff = time.time() - self.max_age
+        for link_id in [k for k, r in self.orders.items() if r['state'] != PENDING and r['updated_at'] < cutoff]:
+            del self.orders[link_id]
+
+# Shared in-process instance
+order_registry = OrderRegistry()
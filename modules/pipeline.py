@@ -0,0 +1,440 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+from utils.logger import setup_logger
+from utils.metrics import metrics
+from modules.notifier import PRIORITY_TRADE, PRIORITY_ALERT
+from modules.symbol_parser import SymbolParser
+from modules.classifier import AnnouncementClassifier, CLASSES, LAUNCHPOOL, NEW_LISTING
+from modules.launch_times import parse_launch_time
+from modules.precise_scheduler import PreciseScheduler
+from modules.schedule_store import ScheduleStore
+from modules.instrument_watcher import NEW_SYMBOL, STATUS_CHANGE
+from modules.order_registry import order_link_id
+from modules.execution_algos import ExecutionAlgos
+from modules.seen_index import announcement_key
+from utils.clock import server_clock
+from config.settings import settings
+
+logger = setup_logger('pipeline')
+
+# Seconds an announcement without a tradable symbol waits for its contract
+AWAIT_LISTING_MAX_AGE = 7 * 86400
+
+def listing_key(symbol, category='linear'):
+    """Event key of entering a newly listed contract, shared by announcement and instrument event"""
+    return f"listing:{category}:{symbol}"
+
+def format_announcement_message(announcement, trade_settings, symbol):
+    """Format the announcement alert sent after the order went out"""
+    timestamp = int(announcement.get('dateTimestamp', 0)) / 1000
+    date_time = datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S')
+
+    return (
+        "🔥 <b>New Launchpool Announcement!</b> 🔥\n\n"
+        f"📌 <b>Title:</b>\n{announcement.get('title', 'No Title')}\n\n"
+        f"📝 <b>Description:</b>\n{announcement.get('description', 'No Description')}\n\n"
+        f"⏰ <b>Time:</b> {date_time}\n"
+        f"🔗 <b>Link:</b> {announcement.get('url', '#')}\n\n"
+        "➖➖➖➖➖➖➖➖➖➖\n"
+        "🤖 <b>Bot Action:</b>\n"
+        f"• Symbol: {symbol}\n"
+        f"• Quantity: {trade_settings['quantity']} USDT\n"
+        f"• Stop Loss: {trade_settings['stop_loss']}%\n"
+        f"• Take Profit: {trade_settings['take_profit']}%\n"
+        f"• Leverage: {trade_settings['leverage']}x\n\n"
+        "🚀 LONG order sent"
+    )
+
+def format_trade_message(trade_result, latency_ms):
+    """Format the trade result message"""
+    if trade_result and trade_result.get('success'):
+        trade_info = trade_result.get('data') or {}
+        return (
+            "✅ <b>Trade Executed Successfully!</b>\n\n"
+            f"💹 <b>Entry Price:</b> {trade_info.get('entry_price')}\n"
+            f"📊 <b>Quantity:</b> {trade_info.get('usdt_value')} USDT\n"
+            f"🔻 <b>Stop Loss:</b> {trade_info.get('stop_loss')}\n"
+            f"🔼 <b>Take Profit:</b> {trade_info.get('take_profit')}\n"
+            f"⚡️ <b>Detect → Order:</b> {latency_ms:.1f} ms\n"
+            "➖➖➖➖➖➖➖➖➖➖\n"
+            "⚠️ <i>Monitor your position in Bybit!</i>"
+        )
+
+    error = trade_result.get('error', 'Unknown error') if trade_result else 'Unknown error'
+    return (
+        "❌ <b>Trade Execution Failed!</b>\n\n"
+        f"Error: {error}\n\n"
+        "Please check your settings and try again."
+    )
+
+def format_basket_message(results, latency_ms):
+    """Format the per-leg result of a basket trade"""
+    lines = []
+    for result in results:
+        if result.get('success'):
+            data = result.get('data') or {}
+            lines.append(
+                f"✅ <b>{result['symbol']}</b>: {data.get('usdt_value')} USDT @ {data.get('entry_price')} "
+                f"(prepare {result.get('prepare_ms', 0):.1f} ms, order {result.get('order_ms', 0):.1f} ms)"
+            )
+        else:
+            lines.append(f"❌ <b>{result['symbol']}</b>: {result.get('error', 'Unknown error')}")
+
+    filled = sum(1 for result in results if result.get('success'))
+    return (
+        f"🧺 <b>Basket Executed:</b> {filled}/{len(results)} legs\n\n"
+        + "\n".join(lines) + "\n\n"
+        f"⚡️ <b>Detect → Order:</b> {latency_ms:.1f} ms"
+    )
+
+def format_notice_message(announcement, cls):
+    """Format the alert for announcements that are not traded"""
+    timestamp = int(announcement.get('dateTimestamp', 0)) / 1000
+    date_time = datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S')
+
+    return (
+        f"📢 <b>Bybit Announcement</b> ({cls.replace('_', ' ')})\n\n"
+        f"📌 <b>Title:</b>\n{announcement.get('title', 'No Title')}\n\n"
+        f"⏰ <b>Time:</b> {date_time}\n"
+        f"🔗 <b>Link:</b> {announcement.get('url', '#')}"
+    )
+
+class AnnouncementPipeline:
+    """Detection → classification → order → notification pipeline
+
+    Each announcement is classified and routed to its handler: the trade
+    handler for the classes in TRADE_CLASSES, notify-only for the rest.
+    Announcements with a future trading start are traded at that time; pending
+    ones are kept in SCHEDULED_TRADES_FILE and registered again on restart.
+    Otherwise the order is sent to the exchange as soon as an announcement is detected;
+    Telegram messages are only queued afterwards so they never delay the fill.
+    With BASKET_SYMBOLS, those symbols are traded together with the announced one.
+    A launchpool without a tradable symbol trades TRADE_SYMBOL; any other
+    announcement waits for its contract to go live on the instrument watcher.
+    Quantities of at least ALGO_MIN_NOTIONAL go through EXECUTION_ALGO slicing.
+    Every order's orderLinkId derives from the announcement and symbol, so
+    handling the same announcement twice never opens a second position. New
+    listings key on the contract instead, so the announcement and the
+    instrument watcher cannot both enter it.
+    """
+
+    def __init__(self, trader, notifier, trade_settings, symbol_parser=None, classifier=None,
+                 trade_classes=None, scheduler=None, algos=None, schedules=None):
+        self.trader = trader
+        self.notifier = notifier
+        self.scheduler = scheduler or PreciseScheduler()
+        self.schedules = schedules if schedules is not None else ScheduleStore()
+        self.algos = algos or ExecutionAlgos(trader, notifier)
+        self.symbol_parser = symbol_parser or SymbolParser(trader.instruments)
+        self.classifier = classifier or AnnouncementClassifier()
+        # Shared with TelegramBot.settings so menu changes apply immediately
+        self.trade_settings = trade_settings
+        # ticker -> (announcement, chat_ids, time.monotonic()) waiting for its contract
+        self.awaiting = {}
+
+        trade_classes = trade_classes if trade_classes is not None else settings.TRADE_CLASSES
+        self.routes = {
+            cls: self.trade if cls in trade_classes else self.notify_only
+            for cls in CLASSES
+        }
+
+    def register(self, cls, handler):
+        """Route a class to handler(announcement, detected_at, chat_ids, cls)"""
+        self.routes[cls] = handler
+
+    async def handle(self, announcement, detected_at=None, chat_ids=None):
+        """Classify a detected announcement and run its handler"""
+        if detected_at is None:
+            detected_at = time.perf_counter()
+
+        cls = self.classifier.classify(announcement)
+        handler = self.routes.get(cls, self.notify_only)
+        return await handler(announcement, detected_at, chat_ids, cls)
+
+    async def notify_only(self, announcement, detected_at, chat_ids, cls):
+        """Queue an alert without trading"""
+        logger.info(f"Not trading {cls} announcement: {announcement.get('title', 'No Title')}")
+        self.notifier.enqueue(
+            format_notice_message(announcement, cls),
+            chat_ids=chat_ids,
+            priority=PRIORITY_ALERT
+        )
+        return None
+
+    async def trade(self, announcement, detected_at, chat_ids, cls):
+        """Trade on the announcement now, or schedule it at its trading start"""
+        # Trade the announced asset; only a launchpool falls back to the configured symbol
+        symbol = self.symbol_parser.parse(announcement)
+        if symbol is None:
+            if cls != LAUNCHPOOL:
+                return self.await_listing(announcement, chat_ids, cls)
+            symbol = self.trader.symbol
+        if cls == NEW_LISTING:
+            # Same orderLinkIds as a TRADE_ON_LISTING entry when the contract goes live
+            announcement = dict(announcement, id=listing_key(symbol))
+        metrics.observe('stage_decision_ms', (time.perf_counter() - detected_at) * 1000)
+
+        # e.g. the pool token and MNT together
+        symbols = [symbol] + [s for s in settings.BASKET_SYMBOLS if s != symbol]
+        await self.track(symbols)
+
+        if settings.SCHEDULE_TRADES:
+            launch_ms = parse_launch_time(announcement, max_ahead_days=settings.SCHEDULE_MAX_AHEAD_DAYS)
+            if launch_ms is not None:
+                return self.schedule_trade(announcement, launch_ms, symbol, chat_ids)
+
+        if len(symbols) > 1:
+            return await self.execute_basket(announcement, detected_at, chat_ids, symbols)
+
+        return await self.execute(announcement, detected_at, chat_ids, symbol)
+
+    def await_listing(self, announcement, chat_ids, cls):
+        """Keep an announcement whose contract isn't listed yet, handle_instrument_event trades it"""
+        tickers = set()
+        for field in ('title', 'description'):
+            tickers.update(self.symbol_parser.candidates(announcement.get(field) or ''))
+
+        now = time.monotonic()
+        self.awaiting = {
+            ticker: entry for ticker, entry in self.awaiting.items()
+            if now - entry[2] <= AWAIT_LISTING_MAX_AGE
+        }
+        for ticker in tickers:
+            self.awaiting[ticker] = (announcement, chat_ids, now)
+
+        logger.info(f"No tradable symbol in {cls} announcement, waiting for {sorted(tickers)}: "
+                    f"{announcement.get('title', 'No Title')}")
+        self.notifier.enqueue(
+            format_notice_message(announcement, cls) + "\n\n⏳ No contract listed yet, trading when it goes live",
+            chat_ids=chat_ids,
+            priority=PRIORITY_ALERT
+        )
+        return None
+
+    def take_awaiting(self, symbol):
+        """Pop the announcement waiting for a symbol (XYZUSDT or 1000XYZUSDT), None when there is none"""
+        ticker = symbol[:-len(self.symbol_parser.quote)] if symbol.endswith(self.symbol_parser.quote) else symbol
+        for key in (ticker, ticker[4:] if ticker.startswith('1000') else None):
+            entry = self.awaiting.get(key)
+            if entry is not None and time.monotonic() - entry[2] <= AWAIT_LISTING_MAX_AGE:
+                announcement = entry[0]
+                self.awaiting = {k: e for k, e in self.awaiting.items() if e[0] is not announcement}
+                return entry
+        return None
+
+    async def track(self, symbols):
+        """Add symbols to the ticker stream so their later prices come from the cache"""
+        try:
+            await self.trader.market_data.add_symbols(symbols)
+        except Exception as e:
+            logger.error(f"Error subscribing tickers of {symbols}: {str(e)}")
+
+    def schedule_trade(self, announcement, launch_ms, symbol, chat_ids):
+        """Prepare shortly before the trading start and fire the order at it"""
+        prepared = {'symbol': symbol, 'template': None}
+
+        async def prepare():
+            # Warm the connection pool and re-anchor the clock, then build the order
+            await asyncio.to_thread(server_clock.sync, 2)
+            await asyncio.to_thread(self.trader.instruments.refresh_if_stale)
+            prepared['symbol'] = self.symbol_parser.parse(announcement) or symbol
+            prepared['template'] = await asyncio.to_thread(
+                self.trader.prepare_order,
+                self.trade_settings['quantity'],
+                self.trade_settings['stop_loss'],
+                self.trade_settings['take_profit'],
+                self.trade_settings['leverage'],
+                symbol=prepared['symbol']
+            )
+
+        async def fire(target_perf):
+            try:
+                trade_result = await self.execute(
+                    announcement, target_perf, chat_ids, prepared['symbol'], prepared['template']
+                )
+            finally:
+                self.schedules.remove(job_id)
+            sent_at = (trade_result.get('data') or {}).get('order_sent_at')
+            if sent_at is not None:
+                error_ms = (sent_at - target_perf) * 1000
+                metrics.observe('scheduled_send_error_ms', error_ms)
+                logger.info(f"Scheduled order sent {error_ms:+.2f} ms from the trading start")
+
+        job_id = self.scheduler.schedule(launch_ms, fire, prepare, name=announcement_key(announcement))
+        self.schedules.add(job_id, launch_ms, symbol, announcement, chat_ids)
+        start = datetime.fromtimestamp(launch_ms / 1000, tz=timezone.utc).strftime('%Y-%m-%d %H:%M:%S UTC')
+        self.notifier.enqueue(
+            f"⏳ <b>Trade scheduled</b>\n\n"
+            f"📌 {announcement.get('title', 'No Title')}\n"
+            f"• Symbol: {symbol}\n"
+            f"• Trading start: {start}",
+            chat_ids=chat_ids,
+            priority=PRIORITY_ALERT
+        )
+        return {'success': True, 'scheduled': job_id, 'scheduled_at': launch_ms, 'symbol': symbol}
+
+    async def restore_schedules(self):
+        """Register the trades scheduled before a restart again"""
+        pending = self.schedules.take_pending(server_clock.now_ms())
+        for job in pending.values():
+            await self.track([job['symbol']])
+            self.schedule_trade(job['announcement'], job['launch_ms'], job['symbol'], job['chat_ids'])
+        if pending:
+            logger.info(f"Restored {len(pending)} scheduled trades")
+        return len(pending)
+
+    def link_id(self, announcement, symbol):
+        """Client order ID of the order for one symbol of an announcement"""
+        return order_link_id(self.event_key(announcement), symbol)
+
+    def event_key(self, announcement):
+        """Stable ID of the event an order belongs to"""
+        return announcement.get('id') or announcement_key(announcement)
+
+    async def execute(self, announcement, detected_at, chat_ids, symbol, template=None):
+        """Send the order, then queue the notifications"""
+        if template is None and self.algos.applies(self.trade_settings['quantity']):
+            return await self.execute_sliced(announcement, detected_at, chat_ids, symbol)
+
+        try:
+            trade_result = await self.trader.execute_trade(
+                quantity=self.trade_settings['quantity'],
+                stop_loss=self.trade_settings['stop_loss'],
+                take_profit=self.trade_settings['take_profit'],
+                leverage=self.trade_settings['leverage'],
+                symbol=symbol,
+                template=template,
+                link_id=self.link_id(announcement, symbol)
+            )
+        except Exception as e:
+            logger.error(f"Error executing trade: {str(e)}")
+            trade_result = {'success': False, 'error': str(e)}
+
+        latency_ms = self.record_latency(announcement, detected_at, trade_result)
+
+        self.notifier.enqueue(
+            format_trade_message(trade_result, latency_ms),
+            chat_ids=chat_ids,
+            priority=PRIORITY_TRADE
+        )
+        self.notifier.enqueue(
+            format_announcement_message(announcement, self.trade_settings, symbol),
+            chat_ids=chat_ids,
+            priority=PRIORITY_ALERT
+        )
+
+        return trade_result
+
+    async def execute_sliced(self, announcement, detected_at, chat_ids, symbol):
+        """Start a sliced execution; its progress message replaces the trade message"""
+        try:
+            job, first = await self.algos.start(
+                symbol,
+                self.trade_settings['quantity'],
+                self.trade_settings['stop_loss'],
+                self.trade_settings['take_profit'],
+                self.trade_settings['leverage'],
+                link_key=self.event_key(announcement),
+                chat_ids=chat_ids
+            )
+        except Exception as e:
+            logger.error(f"Error starting sliced execution: {str(e)}")
+            return {'success': False, 'error': str(e)}
+
+        self.record_latency(announcement, detected_at, first)
+        self.notifier.enqueue(
+            format_announcement_message(announcement, self.trade_settings, symbol),
+            chat_ids=chat_ids,
+            priority=PRIORITY_ALERT
+        )
+        return dict(first, algo=job.id, symbol=symbol)
+
+    async def execute_basket(self, announcement, detected_at, chat_ids, symbols):
+        """Send one order per symbol concurrently, then queue the notifications"""
+        legs = [
+            {
+                'symbol': symbol,
+                'quantity': self.trade_settings['quantity'],
+                'stop_loss': self.trade_settings['stop_loss'],
+                'take_profit': self.trade_settings['take_profit'],
+                'leverage': self.trade_settings['leverage'],
+                'link_id': self.link_id(announcement, symbol)
+            }
+            for symbol in symbols
+        ]
+        try:
+            results = await self.trader.execute_basket(legs)
+        except Exception as e:
+            logger.error(f"Error executing basket: {str(e)}")
+            results = [{'symbol': symbol, 'success': False, 'error': str(e)} for symbol in symbols]
+
+        # Latency is measured to the first leg the exchange accepted
+        first = next((result for result in results if result.get('success')), results[0])
+        latency_ms = self.record_latency(announcement, detected_at, first)
+
+        self.notifier.enqueue(
+            format_basket_message(results, latency_ms),
+            chat_ids=chat_ids,
+            priority=PRIORITY_TRADE
+        )
+        self.notifier.enqueue(
+            format_announcement_message(announcement, self.trade_settings, ', '.join(symbols)),
+            chat_ids=chat_ids,
+            priority=PRIORITY_ALERT
+        )
+
+        return {'success': all(result.get('success') for result in results), 'legs': results,
+                'data': first.get('data')}
+
+    async def handle_instrument_event(self, event, chat_ids=None):
+        """Alert on a listing change, trade a linear contract that just went live"""
+        detected_at = time.perf_counter()
+        if event['category'] == 'linear' and event['type'] in (NEW_SYMBOL, STATUS_CHANGE):
+            await self.track([event['symbol']])
+
+        if (event['category'] == 'linear' and event['type'] in (NEW_SYMBOL, STATUS_CHANGE)
+                and event['status'] == 'Trading'):
+            awaiting = self.take_awaiting(event['symbol'])
+            if awaiting is not None:
+                announcement, announcement_chats, _ = awaiting
+                logger.info(f"{event['symbol']} went live, trading: {announcement.get('title', 'No Title')}")
+                announcement = dict(announcement, id=listing_key(event['symbol'], event['category']))
+                return await self.execute(announcement, detected_at, announcement_chats or chat_ids,
+                                          event['symbol'])
+
+        if (settings.TRADE_ON_LISTING and event['category'] == 'linear'
+                and event['type'] in (NEW_SYMBOL, STATUS_CHANGE) and event['status'] == 'Trading'):
+            listing = {
+                'id': listing_key(event['symbol'], event['category']),
+                'title': f"{event['symbol']} is now trading",
+                'dateTimestamp': server_clock.now_ms()
+            }
+            return await self.execute(listing, detected_at, chat_ids, event['symbol'])
+
+        if event['type'] == NEW_SYMBOL:
+            text = f"🆕 <b>New {event['category']} symbol:</b> {event['symbol']} ({event['status']})"
+        elif event['type'] == STATUS_CHANGE:
+            text = f"🔄 <b>{event['symbol']}</b> ({event['category']}): {event['previous']} → {event['status']}"
+        else:
+            text = f"🗑 <b>{event['symbol']}</b> ({event['category']}) removed"
+        self.notifier.enqueue(text, chat_ids=chat_ids, priority=PRIORITY_ALERT)
+        return None
+
+    def record_latency(self, announcement, detected_at, trade_result):
+        """Record detect→order latency for this event and return it in ms"""
+        data = (trade_result.get('data') or {}) if trade_result else {}
+        acked_at = data.get('order_acked_at', time.perf_counter())
+        latency_ms = (acked_at - detected_at) * 1000
+        metrics.observe('detect_to_order_ack_ms', latency_ms)
+
+        sent_at = data.get('order_sent_at')
+        if sent_at is not None:
+            metrics.observe('detect_to_order_sent_ms', (sent_at - detected_at) * 1000)
+
+        logger.info(
+            f"Detect→order latency {latency_ms:.1f} ms "
+            f"(success={bool(trade_result and trade_result.get('success'))}): "
+            f"{announcement.get('title', 'No Title')}"
+        )
+        return latency_ms
@@ -0,0 +1,166 @@
+import asyncio
+import random
+from datetime import datetime, timezone
+from utils.logger import setup_logger
+from utils.metrics import metrics
+from utils.clock import server_clock
+from config.settings import settings
+
+logger = setup_logger('poll_scheduler')
+
+def parse_windows(specs):
+    """Turn HH:MM-HH:MM UTC specs into (start_minute, end_minute) pairs"""
+    windows = []
+    for spec in specs:
+        start, _, end = spec.partition('-')
+        start_h, _, start_m = start.strip().partition(':')
+        end_h, _, end_m = end.strip().partition(':')
+        windows.append((int(start_h) * 60 + int(start_m or 0), int(end_h) * 60 + int(end_m or 0)))
+    return windows
+
+class AdaptivePollScheduler:
+    """Decides when the next announcement poll starts
+
+    The interval tightens inside the configured active windows (UTC), backs
+    off exponentially on errors and waits for the rate-limit reset when the
+    X-Bapi-Limit-Status headroom runs low. Errors are counted per feed, the
+    backoff follows the worst one. ``pollers`` poll loops run with their
+    phases interval/pollers apart, so together they poll every
+    interval/pollers and a slow response only holds up its own loop.
+    """
+
+    def __init__(self, interval=None, active_interval=None, min_interval=None, max_interval=None,
+                 jitter=None, active_windows=None, min_headroom=None, pollers=None, rng=None):
+        self.interval = interval if interval is not None else settings.CHECK_INTERVAL
+        self.active_interval = active_interval if active_interval is not None else settings.POLL_ACTIVE_INTERVAL
+        self.min_interval = min_interval if min_interval is not None else settings.POLL_MIN_INTERVAL
+        self.max_interval = max_interval if max_interval is not None else settings.POLL_MAX_INTERVAL
+        self.jitter = jitter if jitter is not None else settings.POLL_JITTER
+        self.active_windows = parse_windows(
+            active_windows if active_windows is not None else settings.POLL_ACTIVE_WINDOWS
+        )
+        self.min_headroom = min_headroom if min_headroom is not None else settings.POLL_MIN_HEADROOM
+        self.pollers = max(1, pollers if pollers is not None else settings.POLLERS)
+        self.rng = rng or random.Random()
+
+        # feed -> consecutive errors (None for errors of the poll as a whole)
+        self.feed_errors = {}
+        # Last seen rate-limit state: (limit, remaining, reset wall time in seconds)
+        self.rate_limit = None
+        self.in_flight = 0
+        self._task = None
+
+    def in_active_window(self, now=None):
+        """True inside one of the active announcement windows"""
+        now = now or datetime.now(timezone.utc)
+        minute = now.hour * 60 + now.minute
+        for start, end in self.active_windows:
+            if start <= minute < end or (end < start and (minute >= start or minute < end)):
+                return True
+        return False
+
+    @property
+    def errors(self):
+        """Consecutive errors of the worst feed"""
+        return max(self.feed_errors.values(), default=0)
+
+    def observe_response(self, status, headers, feed=None):
+        """Update the rate-limit state from a response, any non-2xx status is an error
+
+        Success is only known once the body's retCode was checked (record_success).
+        """
+        limit = headers.get('X-Bapi-Limit')
+        remaining = headers.get('X-Bapi-Limit-Status')
+        reset_ms = headers.get('X-Bapi-Limit-Reset-Timestamp')
+
+        if limit and remaining is not None:
+            # The reset timestamp is server time
+            reset_at = int(reset_ms) / 1000 if reset_ms else server_clock.now() + 1
+            self.rate_limit = (int(limit), int(remaining), reset_at)
+            metrics.set_gauge('announcement_rate_limit_remaining', int(remaining))
+
+        if not 200 <= status < 300:
+            self.record_error(feed)
+
+    def record_error(self, feed=None):
+        """Back off after a failed poll of a feed"""
+        self.feed_errors[feed] = self.feed_errors.get(feed, 0) + 1
+        metrics.incr('announcement_poll_errors')
+
+    def record_success(self, feed=None):
+        """Reset the error backoff of a feed"""
+        self.feed_errors.pop(feed, None)
+
+    def base_interval(self, now=None):
+        """Interval before jitter, backoff and rate limits"""
+        return self.active_interval if self.in_active_window(now) else self.interval
+
+    def next_delay(self, now=None, wall_time=None):
+        """Seconds until the next poll should start"""
+        delay = self.base_interval(now)
+
+        if self.errors:
+            delay = delay * 2 ** min(self.errors, 10)
+
+        delay = min(max(delay, self.min_interval), self.max_interval)
+        delay += delay * self.jitter * self.rng.uniform(-1, 1)
+
+        if self.rate_limit is not None:
+            limit, remaining, reset_at = self.rate_limit
+            if limit and remaining / limit < self.min_headroom:
+                wait = reset_at - (wall_time if wall_time is not None else server_clock.now())
+                if wait > delay:
+                    logger.warning(f"Rate limit headroom low ({remaining}/{limit}), waiting {wait:.1f}s")
+                    delay = wait
+
+        metrics.set_gauge('announcement_poll_interval_s', round(delay, 3))
+        return max(delay, 0)
+
+    def start(self, poll):
+        """Start scheduling poll() on the running loop"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run(poll))
+            logger.info(f"Poll scheduler started ({self.pollers} staggered pollers)")
+
+    async def stop(self):
+        """Stop scheduling and cancel polls in flight"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    async def run(self, poll):
+        """Run the poll loops, loop i starting i * interval / pollers after the first"""
+        loops = [asyncio.create_task(self._poller(poll, index)) for index in range(self.pollers)]
+        try:
+            await asyncio.gather(*loops)
+        finally:
+            for loop in loops:
+                loop.cancel()
+            await asyncio.gather(*loops, return_exceptions=True)
+
+    async def _poller(self, poll, index):
+        """Poll every interval, start to start"""
+        clock = asyncio.get_running_loop().time
+        if index:
+            await asyncio.sleep(self.next_delay() * index / self.pollers)
+        while True:
+            started = clock()
+            await self._run_poll(poll)
+            await asyncio.sleep(max(self.next_delay() - (clock() - started), 0))
+
+    async def _run_poll(self, poll):
+        self.in_flight += 1
+        try:
+            await poll()
+            self.record_success()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.record_error()
+            logger.error(f"Poll error: {str(e)}")
+        finally:
+            self.in_flight -= 1
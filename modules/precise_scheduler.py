@@ -0,0 +1,87 @@
+import asyncio
+import itertools
+import time
+from utils.logger import setup_logger
+from utils.metrics import metrics
+from utils.clock import server_clock
+from config.settings import settings
+
+logger = setup_logger('precise_scheduler')
+
+class PreciseScheduler:
+    """Runs callbacks at exchange-time instants on the event loop's monotonic clock
+
+    The target is converted from server time to loop.time() and re-anchored
+    after the prepare step (which may re-sync the clock). The task sleeps
+    until ``spin_ms`` before the target and busy-waits the rest, so the
+    wake-up error is bounded by the spin granularity instead of the timer
+    slack of asyncio.sleep.
+    """
+
+    def __init__(self, prewarm_lead=None, spin_ms=None, clock=None):
+        self.prewarm_lead = prewarm_lead if prewarm_lead is not None else settings.SCHEDULE_PREWARM_LEAD
+        self.spin_ms = spin_ms if spin_ms is not None else settings.SCHEDULE_SPIN_MS
+        self.clock = clock or server_clock
+        self.jobs = {}
+        self._ids = itertools.count(1)
+
+    def schedule(self, at_ms, fire, prepare=None, name=None):
+        """Run prepare() prewarm_lead seconds before at_ms and fire(target_perf) at at_ms"""
+        job_id = name or f'job-{next(self._ids)}'
+        self.cancel(job_id)
+        task = asyncio.create_task(self._run(job_id, at_ms, fire, prepare))
+        self.jobs[job_id] = {'at_ms': at_ms, 'task': task}
+        logger.info(f"Scheduled {job_id} in {(at_ms - self.clock.now_ms()) / 1000:.1f}s")
+        return job_id
+
+    def cancel(self, job_id):
+        """Cancel a pending job"""
+        job = self.jobs.pop(job_id, None)
+        if job is not None:
+            job['task'].cancel()
+            return True
+        return False
+
+    async def stop(self):
+        """Cancel every pending job"""
+        tasks = [job['task'] for job in self.jobs.values()]
+        self.jobs.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _target(self, loop, at_ms):
+        """Loop time of a server-time instant"""
+        return loop.time() + (at_ms - self.clock.now_ms()) / 1000
+
+    async def _run(self, job_id, at_ms, fire, prepare):
+        loop = asyncio.get_running_loop()
+
+        try:
+            if prepare is not None:
+                await asyncio.sleep(max(0, self._target(loop, at_ms) - self.prewarm_lead - loop.time()))
+                try:
+                    await prepare()
+                except Exception as e:
+                    logger.error(f"Prepare of {job_id} failed: {str(e)}")
+
+            target = self._target(loop, at_ms)
+            await asyncio.sleep(max(0, target - self.spin_ms / 1000 - loop.time()))
+            while loop.time() < target:
+                pass
+
+            woke = loop.time()
+            target_perf = time.perf_counter() - (woke - target)
+            metrics.observe('scheduled_wakeup_error_ms', (woke - target) * 1000)
+
+            await fire(target_perf)
+
+        except asyncio.CancelledError:
+            logger.info(f"Scheduled {job_id} cancelled")
+            raise
+        except Exception as e:
+            logger.error(f"Scheduled {job_id} failed: {str(e)}")
+        finally:
+            job = self.jobs.get(job_id)
+            if job is not None and job['task'] is asyncio.current_task():
+                del self.jobs[job_id]
@@ -0,0 +1,223 @@
+import asyncio
+import hashlib
+import hmac
+import json
+import aiohttp
+from utils.logger import setup_logger
+from utils.metrics import metrics
+from utils.clock import server_clock
+from config.settings import settings
+
+logger = setup_logger('private_stream')
+
+PRIVATE_STREAM_URL = 'wss://stream.bybit.com/v5/private'
+TESTNET_PRIVATE_STREAM_URL = 'wss://stream-testnet.bybit.com/v5/private'
+
+TOPICS = ['position', 'execution', 'order', 'wallet']
+
+class PositionBook:
+    """Live local copy of the account's positions"""
+
+    def __init__(self):
+        # (symbol, positionIdx) -> latest position fields
+        self.positions = {}
+        self.wallet = {}
+
+    def apply(self, position):
+        """Store a position update and return the detected changes"""
+        key = (position.get('symbol'), int(position.get('positionIdx', 0)))
+        previous = self.positions.get(key, {})
+        self.positions[key] = dict(previous, **position)
+
+        old_size = float(previous.get('size') or 0)
+        new_size = float(position.get('size') or 0)
+        changes = []
+
+        if old_size == 0 and new_size > 0:
+            changes.append('opened')
+        elif old_size > 0 and new_size == 0:
+            changes.append('closed')
+        elif old_size != new_size:
+            changes.append('resized')
+
+        if new_size > 0 and previous and (
+            previous.get('stopLoss') != position.get('stopLoss')
+            or previous.get('takeProfit') != position.get('takeProfit')
+        ):
+            changes.append('tpsl')
+
+        return changes
+
+    def seed(self, positions):
+        """Load a REST snapshot without producing change events"""
+        for position in positions:
+            key = (position.get('symbol'), int(position.get('positionIdx', 0)))
+            self.positions[key] = dict(position)
+
+    def open_positions(self):
+        """Return positions with a non-zero size"""
+        return [p for p in self.positions.values() if float(p.get('size') or 0) > 0]
+
+    def get(self, symbol, position_idx=0):
+        """Return the cached position of a symbol"""
+        return self.positions.get((symbol, position_idx))
+
+class PrivateStream:
+    """Authenticated Bybit private stream (position, execution, order, wallet)"""
+
+    def __init__(self, on_event, book=None, url=None, api_key=None, api_secret=None, leverage=None):
+        self.on_event = on_event
+        self.book = book or PositionBook()
+        # Optional LeverageCache kept current from position updates
+        self.leverage = leverage
+        self.url = url or settings.PRIVATE_STREAM_URL or (
+            TESTNET_PRIVATE_STREAM_URL if settings.TESTNET else PRIVATE_STREAM_URL
+        )
+        self.api_key = api_key or settings.API_KEY
+        self.api_secret = api_secret or settings.API_SECRET
+
+        self.connected = False
+        self._ws = None
+        self._task = None
+        self._stopping = False
+
+    def start(self):
+        """Start the stream consumer on the running loop"""
+        if not self.api_key or not self.api_secret:
+            logger.warning("No API credentials, private stream disabled")
+            return
+        if self._task is None or self._task.done():
+            self._stopping = False
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        """Stop the stream consumer"""
+        self._stopping = True
+        if self._ws is not None:
+            await self._ws.close()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def auth_message(self):
+        """Build the auth request for the private stream"""
+        expires = int(server_clock.now_ms() + 10000)
+        signature = hmac.new(
+            self.api_secret.encode(),
+            f'GET/realtime{expires}'.encode(),
+            hashlib.sha256
+        ).hexdigest()
+        return {'op': 'auth', 'args': [self.api_key, expires, signature]}
+
+    async def run(self):
+        """Keep the stream connected, reconnecting with backoff"""
+        delay = 1
+        async with aiohttp.ClientSession() as session:
+            while not self._stopping:
+                try:
+                    await self._consume(session)
+                    delay = 1
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.error(f"Private stream error: {str(e)}")
+
+                self.connected = False
+                if self._stopping:
+                    break
+
+                metrics.incr('private_stream_reconnects')
+                logger.warning(f"Private stream disconnected, reconnecting in {delay}s")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 60)
+
+    async def _consume(self, session):
+        """Authenticate, subscribe and process messages until the connection drops"""
+        async with session.ws_connect(self.url) as ws:
+            self._ws = ws
+            await ws.send_str(json.dumps(self.auth_message()))
+
+            while True:
+                try:
+                    message = await ws.receive(timeout=20)
+                except asyncio.TimeoutError:
+                    await ws.send_str(json.dumps({'op': 'ping'}))
+                    continue
+
+                if message.type == aiohttp.WSMsgType.TEXT:
+                    data = json.loads(message.data)
+
+                    if data.get('op') == 'auth':
+                        if not data.get('success'):
+                            raise RuntimeError(f"Private stream auth failed: {data.get('ret_msg')}")
+                        self.connected = True
+                        logger.info("Private stream authenticated")
+                        await ws.send_str(json.dumps({'op': 'subscribe', 'args': TOPICS}))
+                        continue
+
+                    await self.handle_message(data)
+
+                elif message.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                    break
+
+            self._ws = None
+
+    async def handle_message(self, data):
+        """Update the book and forward change events"""
+        topic = data.get('topic')
+        if not topic:
+            return
+
+        metrics.incr(f'private_stream_{topic}_messages')
+
+        for item in data.get('data', []):
+            if topic == 'position':
+                if self.leverage is not None:
+                    self.leverage.apply(item)
+                for change in self.book.apply(item):
+                    await self._emit({'type': 'position', 'change': change, 'position': self.book.get(
+                        item.get('symbol'), int(item.get('positionIdx', 0))
+                    )})
+
+            elif topic == 'execution':
+                await self._emit({'type': 'execution', 'execution': item})
+
+            elif topic == 'order':
+                await self._emit({'type': 'order', 'order': item})
+
+            elif topic == 'wallet':
+                self.book.wallet = item
+                await self._emit({'type': 'wallet', 'wallet': item})
+
+    async def _emit(self, event):
+        """Hand an event to the consumer without letting its errors kill the stream"""
+        try:
+            await self.on_event(event)
+        except Exception as e:
+            logger.error(f"Error handling {event['type']} event: {str(e)}")
+
+    def reconcile(self, positions):
+        """Compare REST positions with the book and return the changes found"""
+        events = []
+        seen = set()
+
+        for position in positions:
+            key = (position.get('symbol'), int(position.get('positionIdx', 0)))
+            seen.add(key)
+            for change in self.book.apply(position):
+                events.append({'type': 'position', 'change': change, 'position': self.book.positions[key]})
+
+        # Positions the exchange no longer reports have been closed
+        for key, position in list(self.book.positions.items()):
+            if key not in seen and float(position.get('size') or 0) > 0:
+                for change in self.book.apply(dict(position, size='0')):
+                    events.append({'type': 'position', 'change': change, 'position': self.book.positions[key]})
+
+        if events:
+            metrics.incr('position_reconcile_corrections', len(events))
+            logger.warning(f"Reconciliation corrected {len(events)} position changes missed by the stream")
+        return events
@@ -0,0 +1,79 @@
+import json
+import os
+from pathlib import Path
+from utils.logger import setup_logger
+from config.settings import settings
+
+logger = setup_logger('schedule_store')
+
+class ScheduleStore:
+    """Pending scheduled trades on disk, so a restart registers them again
+
+    The file is a JSON object of ``job_id -> {launch_ms, symbol, announcement,
+    chat_ids}``, rewritten atomically on every change. A job stays until it
+    fired or failed; shutting the scheduler down keeps it.
+    """
+
+    def __init__(self, path=None):
+        self.path = Path(path or settings.SCHEDULED_TRADES_FILE)
+        self.jobs = {}
+        self.load()
+
+    def load(self):
+        """Read the pending jobs from disk"""
+        if not self.path.exists():
+            return False
+
+        try:
+            with open(self.path, 'r') as f:
+                self.jobs = json.load(f)
+            logger.info(f"Loaded {len(self.jobs)} scheduled trades")
+            return True
+
+        except Exception as e:
+            logger.error(f"Error loading scheduled trades: {str(e)}")
+            return False
+
+    def add(self, job_id, launch_ms, symbol, announcement, chat_ids=None):
+        """Record a scheduled trade"""
+        self.jobs[job_id] = {
+            'launch_ms': launch_ms,
+            'symbol': symbol,
+            'announcement': announcement,
+            'chat_ids': list(chat_ids) if chat_ids is not None else None
+        }
+        return self.save()
+
+    def remove(self, job_id):
+        """Forget a fired or failed trade"""
+        if self.jobs.pop(job_id, None) is not None:
+            self.save()
+
+    def take_pending(self, now_ms):
+        """Return the jobs still ahead of now_ms and drop the missed ones"""
+        missed = [job_id for job_id, job in self.jobs.items() if job['launch_ms'] <= now_ms]
+        for job_id in missed:
+            logger.warning(f"Scheduled trade {job_id} missed its trading start while stopped")
+            del self.jobs[job_id]
+        if missed:
+            self.save()
+        return dict(self.jobs)
+
+    def save(self):
+        """Persist the pending jobs"""
+        try:
+            os.makedirs(self.path.parent, exist_ok=True)
+            tmp_file = self.path.with_suffix('.tmp')
+            with open(tmp_file, 'w') as f:
+                json.dump(self.jobs, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.path)
+            return True
+
+        except Exception as e:
+            logger.error(f"Error saving scheduled trades: {str(e)}")
+            return False
+
+    def __len__(self):
+        return len(self.jobs)
@@ -0,0 +1,145 @@
+import os
+import threading
+from pathlib import Path
+from utils.logger import setup_logger
+from config.settings import settings
+from utils.clock import server_clock
+
+logger = setup_logger('seen_index')
+
+# Marks a feed whose existing announcements were recorded on its first poll
+FEED_PREFIX = 'feed:'
+
+def announcement_key(announcement):
+    """Stable ID of an announcement (its URL, title and date as a fallback)"""
+    return announcement.get('url') or f"{announcement.get('title', '')}|{announcement.get('dateTimestamp', 0)}"
+
+class SeenIndex:
+    """Append-only index of processed announcements with a server-time watermark
+
+    Each line is ``<dateTimestamp>\\t<key>``. Entries are written and fsynced
+    before the announcement is acted on, so a crash can miss a trade but never
+    repeat one. Feeds seeded on their first poll are recorded as ``feed:<name>``
+    entries so adding a feed later never trades its history. The watermark is
+    the newest server timestamp seen; anything older than the retention window
+    behind it is ignored and compacted away.
+    """
+
+    def __init__(self, path=None, retention_days=None):
+        self.path = Path(path or settings.SEEN_INDEX_FILE)
+        days = retention_days if retention_days is not None else settings.SEEN_INDEX_RETENTION_DAYS
+        self.retention_ms = days * 24 * 3600 * 1000
+        self.entries = {}
+        self.watermark = 0
+        self._lock = threading.Lock()
+        self._file = None
+        self.load()
+
+    def load(self):
+        """Read the index from disk and compact it"""
+        if not self.path.exists():
+            return False
+
+        try:
+            with open(self.path, 'r') as f:
+                for line in f:
+                    date_ms, _, key = line.rstrip('\n').partition('\t')
+                    if key:
+                        self.entries[key] = int(date_ms)
+
+            self.watermark = max(
+                (date_ms for key, date_ms in self.entries.items() if not key.startswith(FEED_PREFIX)),
+                default=0
+            )
+            self.compact()
+            logger.info(f"Seen index loaded {len(self.entries)} announcements, watermark {self.watermark}")
+            return True
+
+        except Exception as e:
+            logger.error(f"Error loading seen index: {str(e)}")
+            return False
+
+    def is_seeded(self, feed):
+        """True once the feed's existing announcements were recorded"""
+        return FEED_PREFIX + feed in self.entries
+
+    def mark_seeded(self, feed):
+        """Record that a feed was seeded (kept through compaction)"""
+        self._append({FEED_PREFIX + feed: self.watermark})
+
+    def is_new(self, announcement):
+        """True for an unprocessed announcement inside the retention window"""
+        date_ms = int(announcement.get('dateTimestamp', 0))
+        # Both ends are server time, a skewed local clock can't hide or revive items
+        if date_ms < max(self.watermark, server_clock.now_ms()) - self.retention_ms:
+            return False
+        return announcement_key(announcement) not in self.entries
+
+    def add(self, announcements):
+        """Durably record announcements as processed"""
+        self._append({announcement_key(a): int(a.get('dateTimestamp', 0)) for a in announcements})
+
+    def _append(self, items):
+        """Write new entries to the log and fsync it"""
+        with self._lock:
+            lines = []
+            for key, date_ms in items.items():
+                if key in self.entries:
+                    continue
+                self.entries[key] = date_ms
+                if not key.startswith(FEED_PREFIX):
+                    self.watermark = max(self.watermark, date_ms)
+                lines.append(f"{date_ms}\t{key}\n")
+
+            if not lines:
+                return
+
+            try:
+                if self._file is None:
+                    os.makedirs(self.path.parent, exist_ok=True)
+                    self._file = open(self.path, 'a')
+                self._file.write(''.join(lines))
+                self._file.flush()
+                os.fsync(self._file.fileno())
+            except Exception as e:
+                logger.error(f"Error writing seen index: {str(e)}")
+
+    def compact(self):
+        """Drop entries outside the retention window and rewrite the file"""
+        cutoff = self.watermark - self.retention_ms
+        with self._lock:
+            expired = [
+                key for key, date_ms in self.entries.items()
+                if date_ms < cutoff and not key.startswith(FEED_PREFIX)
+            ]
+            if not expired:
+                return 0
+
+            for key in expired:
+                del self.entries[key]
+
+            try:
+                if self._file is not None:
+                    self._file.close()
+                    self._file = None
+                tmp_file = self.path.with_suffix('.tmp')
+                with open(tmp_file, 'w') as f:
+                    f.writelines(f"{date_ms}\t{key}\n" for key, date_ms in self.entries.items())
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_file, self.path)
+            except Exception as e:
+                logger.error(f"Error compacting seen index: {str(e)}")
+
+        logger.info(f"Seen index compacted, {len(expired)} expired announcements removed")
+        return len(expired)
+
+    def close(self):
+        """Close the append handle"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __len__(self):
+        return sum(1 for key in self.entries if not key.startswith(FEED_PREFIX))
@@ -0,0 +1,122 @@
+import re
+from utils.logger import setup_logger
+from modules.instruments import instrument_cache
+
+logger = setup_logger('symbol_parser')
+
+# Ordered rule table: (name, pattern with one ticker group, score). All rules are
+# compiled into a single alternation so a text is scanned once.
+RULES = [
+    ('pair', r'\b([A-Z0-9]{2,15})[/-]?(?:USDT|USDC|PERP)\b', 1.0),
+    ('earn', r'\bearn\s+([A-Z0-9]{2,15})\b', 0.9),
+    ('listing', r'\b(?:list(?:s|ing)?(?:\s+of)?|launch(?:es|ing)?)\s*:?\s+([A-Z0-9]{2,15})\b', 0.85),
+    ('parenthesis', r'\(([A-Z0-9]{2,15})\)', 0.8),
+    ('stake', r'\bstak(?:e|ing)\s+([A-Z0-9]{2,15})\b', 0.5),
+    ('ticker', r'\b([A-Z][A-Z0-9]{1,14})\b', 0.3),
+]
+
+# Uppercase words that are never the traded asset
+STOPWORDS = frozenset({
+    'USDT', 'USDC', 'USD', 'PERP', 'BYBIT', 'NEW', 'THE', 'AND', 'FOR', 'API', 'UTC', 'APR',
+    'APY', 'VIP', 'KYC', 'NFT', 'ETF', 'WEB3', 'DEX', 'CEX', 'AMA', 'FAQ', 'TGE', 'IDO',
+    'IEO', 'P2P', 'UTA', 'LAUNCHPOOL', 'LAUNCHPAD', 'SPOT', 'FUTURES', 'LISTING', 'NOTICE',
+    'UPDATE', 'EARN', 'STAKE', 'TO', 'OF', 'ON', 'IN', 'AT', 'BY', 'A', 'AN', 'OR', 'IS',
+})
+
+# Quote suffixes stripped from a matched pair (ABCUSDT → ABC)
+QUOTE_SUFFIXES = ('USDT', 'USDC', 'PERP')
+
+# "Stake BTC, ETH and MNT to earn XYZ": the staked assets are not what gets listed
+_STAKE_PHRASE = re.compile(r'\bstak(?:e|ing)\b[^.;:\n]{0,80}?\bearn\b', re.IGNORECASE)
+# Tickers found by these rules inside a stake phrase (any stake match) are staked assets,
+# dropped unless a stronger rule names them too
+WEAK_RULES = frozenset({'stake', 'ticker'})
+
+# Title matches weigh more than description matches
+FIELD_WEIGHTS = (('title', 1.0), ('description', 0.5))
+
+_RULE_SCORES = {name: score for name, _, score in RULES}
+_PATTERN = re.compile('|'.join(f'(?P<{name}>{pattern})' for name, pattern, _ in RULES), re.IGNORECASE)
+_GROUPS = {name: _PATTERN.groupindex[name] + 1 for name, _, _ in RULES}
+_WEAK_SCORE = max(_RULE_SCORES[name] for name in WEAK_RULES)
+
+class SymbolParser:
+    """Extract the traded symbol from an announcement
+
+    Candidates come from one pass of the precompiled rule table over the title
+    and description, are scored by rule and field, and only kept when
+    ``<TICKER><quote>`` (or its 1000x contract) exists in the instrument cache.
+    Staked assets count against a ticker: only the earned or listed token is traded.
+    """
+
+    def __init__(self, instruments=None, category='linear', quote='USDT'):
+        self.instruments = instruments or instrument_cache
+        self.category = category
+        self.quote = quote
+        self._symbols = frozenset()
+        self._version = None
+
+    def _universe(self):
+        """Tradable symbols, rebuilt only when the instrument cache reloads"""
+        version = (self.instruments.loaded_at.get(self.category), len(self.instruments.instruments))
+        if version != self._version:
+            self._symbols = frozenset(self.instruments.symbols(self.category))
+            self._version = version
+        return self._symbols
+
+    def candidates(self, text):
+        """Return {ticker: best rule score} for a text, staked assets left out"""
+        found, staked = self._scan(text)
+        return {ticker: score for ticker, score in found.items() if ticker not in staked or score > _WEAK_SCORE}
+
+    def _scan(self, text):
+        """Return ({ticker: best rule score}, {staked tickers}) for a text"""
+        found = {}
+        staked = set()
+        spans = [match.span() for match in _STAKE_PHRASE.finditer(text)]
+        for match in _PATTERN.finditer(text):
+            rule = match.lastgroup
+            ticker = match.group(_GROUPS[rule]).upper()
+            for suffix in QUOTE_SUFFIXES:
+                if ticker.endswith(suffix) and len(ticker) > len(suffix) + 1:
+                    ticker = ticker[:-len(suffix)]
+                    break
+            if ticker in STOPWORDS or ticker.isdigit():
+                continue
+            # The catch-all ticker rule only trusts words written in capitals
+            if rule == 'ticker' and not match.group(_GROUPS[rule]).isupper():
+                continue
+            position = match.start(_GROUPS[rule])
+            if rule == 'stake' or (rule in WEAK_RULES and any(start <= position < end for start, end in spans)):
+                staked.add(ticker)
+                continue
+            score = _RULE_SCORES[rule]
+            if score > found.get(ticker, 0):
+                found[ticker] = score
+        return found, staked
+
+    def rank(self, announcement):
+        """Return [(symbol, score)] of tradable candidates, best first"""
+        universe = self._universe()
+        scores = {}
+        scans = [(self._scan(announcement.get(field) or ''), weight) for field, weight in FIELD_WEIGHTS]
+        # Staked in the title also rules out a weak mention in the description
+        staked = set().union(*(field_staked for (_, field_staked), _ in scans))
+
+        for (found, _), weight in scans:
+            for ticker, score in found.items():
+                if ticker in staked and score <= _WEAK_SCORE:
+                    continue
+                for symbol in (f'{ticker}{self.quote}', f'1000{ticker}{self.quote}'):
+                    if symbol in universe:
+                        scores[symbol] = max(scores.get(symbol, 0), score * weight)
+                        break
+
+        return sorted(scores.items(), key=lambda item: -item[1])
+
+    def parse(self, announcement):
+        """Return the best tradable symbol or None"""
+        ranked = self.rank(announcement)
+        if not ranked:
+            return None
+        return ranked[0][0]
@@ -1,5 +1,4 @@
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
-from telegram.constants import ParseMode
 from telegram.ext import (
     Application, CommandHandler, CallbackQueryHandler, 
     MessageHandler, filters, ContextTypes, ConversationHandler
@@ -8,13 +7,22 @@ from telegram.ext import JobQueue
 import requests
 import os
 from utils.logger import setup_logger
+from utils.metrics import metrics
+from utils.clock import server_clock
 from dotenv import load_dotenv
 import asyncio
+import time
 from modules.trade import TradeExecutor
 from modules.announcements import LaunchpoolAnnouncements
+from modules.notifier import NotificationQueue, PRIORITY_TRADE, PRIORITY_ALERT, PRIORITY_STATUS
+from modules.pipeline import AnnouncementPipeline
+from modules.private_stream import PrivateStream
+from modules.archive import AnnouncementArchive
+from modules.instrument_watcher import InstrumentWatcher
 from datetime import datetime
 from config.settings import settings
 import json
+import html
 from telegram.ext import CallbackContext
 
 logger = setup_logger('telegram')
@@ -61,13 +69,27 @@ class TelegramBot:
             raise ValueError("Telegram bot token or chat ID not found!")
         
         # Initialize bot application
-        self.app = Application.builder().token(self.bot_token).build()
+        builder = Application.builder().token(self.bot_token)
+        if settings.TELEGRAM_API_URL:
+            # e.g. a local Bot API server or the benchmark's fake Telegram
+            builder = builder.base_url(settings.TELEGRAM_API_URL)
+        self.app = builder.build()
         
-        # Initialize announcements checker
-        self.announcements = LaunchpoolAnnouncements()
+        # Initialize announcements checker, every polled page is archived for /search
+        self.archive = AnnouncementArchive()
+        self.announcements = LaunchpoolAnnouncements(archive=self.archive)
+        
+        # Outbound messages and the trade-first announcement pipeline
+        self.notifier = NotificationQueue(self.app.bot, self.chat_id)
+        # One long-lived executor (and HTTP connection pool) for every job and handler
+        self.trader = TradeExecutor()
+        self.pipeline = AnnouncementPipeline(self.trader, self.notifier, self.settings)
         
         # Add handlers
         self.app.add_handler(CommandHandler("start", self.start_command))
+        self.app.add_handler(CommandHandler("metrics", self.metrics_command))
+        self.app.add_handler(CommandHandler("search", self.search_command))
+        self.app.add_handler(CommandHandler("kill", self.kill_command))
         self.app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, self.handle_message))
         self.app.add_handler(CallbackQueryHandler(self.menu_actions))
         
@@ -75,27 +97,70 @@ class TelegramBot:
         self.app.post_init = self.post_init
         self.app.post_shutdown = self.post_shutdown
         
-        # Add announcement check job
-        self.app.job_queue.run_repeating(
-            self.check_announcements,
-            interval=30,  # Her 30 saniyede bir kontrol et
-            first=5  # İlk kontrolü 5 saniye sonra başlat
-        )
+        # Announcement polls are started by the adaptive scheduler in post_init
+        self.poll_scheduler = self.announcements.scheduler
+
+        # Live position/execution updates come from the private stream
+        self.private_stream = PrivateStream(self.handle_stream_event, leverage=self.trader.leverage)
+        self.positions_seeded = False
 
-        # Add position monitoring job
+        # Low-frequency reconciliation of the position book with REST
         self.app.job_queue.run_repeating(
             self.check_position_status,
-            interval=60,  # Her 1 dakikada bir kontrol
-            first=5      # İlk kontrol 5 saniye sonra
+            interval=settings.POSITION_RECONCILE_INTERVAL,
+            first=5      # İlk kontrol 5 saniye sonra (book seed)
+        )
+        
+        # New symbols and status flips straight from instruments-info
+        self.instrument_watcher = InstrumentWatcher(self.trader.instruments)
+        self.app.job_queue.run_repeating(
+            self.watch_instruments,
+            interval=settings.INSTRUMENT_WATCH_INTERVAL,
+            first=2
         )
+        
+        # Server clock calibration (signing, watermark, latency metrics)
+        self.app.job_queue.run_repeating(
+            self.sync_clock,
+            interval=settings.CLOCK_SYNC_INTERVAL,
+            first=0
+        )
+        
+        # Instrument cache: bulk download at startup, then refresh when stale
+        self.app.job_queue.run_repeating(
+            self.refresh_instruments,
+            interval=settings.INSTRUMENT_REFRESH_INTERVAL,
+            first=0
+        )
+        
+        # Keep the armed order template fresh in the background
+        if settings.ARMED_MODE:
+            self.app.job_queue.run_repeating(
+                self.refresh_armed_order,
+                interval=settings.ARM_REFRESH_INTERVAL,
+                first=1
+            )
 
     async def post_init(self, application: Application) -> None:
         """Post initialization hook"""
+        self.notifier.start()
+        self.trader.market_data.start()
+        self.private_stream.start()
+        self.poll_scheduler.start(lambda: self.check_announcements(application))
+        await self.pipeline.restore_schedules()
         await self.send_initial_menu()
 
     async def post_shutdown(self, application: Application) -> None:
         """Post shutdown hook"""
         logger.info("Bot shutting down...")
+        await self.poll_scheduler.stop()
+        await self.pipeline.scheduler.stop()
+        await self.pipeline.algos.stop()
+        await self.notifier.stop()
+        await self.trader.market_data.stop()
+        await self.private_stream.stop()
+        await self.announcements.aclose()
+        self.archive.close()
 
     def run(self):
         """Run the bot"""
@@ -246,6 +311,83 @@ class TelegramBot:
             )
             return WAITING_PASSWORD
 
+    async def authorize(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """True for the allowed chat once logged in with the password, replies otherwise"""
+        if str(update.effective_chat.id) != str(self.chat_id):
+            await update.message.reply_text("⛔️ Unauthorized access!")
+            return False
+        
+        if not context.user_data.get('authenticated'):
+            await update.message.reply_text("🔒 Please log in with /start first")
+            return False
+        return True
+
+    async def metrics_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Handle /metrics command"""
+        if not await self.authorize(update, context):
+            return
+        
+        snapshot = metrics.snapshot()
+        lines = ["📈 <b>Metrics</b>\n"]
+        for name, value in sorted(snapshot['gauges'].items()):
+            lines.append(f"• {name}: {value:.2f}" if isinstance(value, float) else f"• {name}: {value}")
+        for name, value in sorted(snapshot['counters'].items()):
+            lines.append(f"• {name}: {value}")
+        for name, stats in sorted(snapshot['samples'].items()):
+            lines.append(
+                f"• {name}: p50 {stats.get('p50', 0):.1f} / p95 {stats.get('p95', 0):.1f} / "
+                f"p99 {stats.get('p99', 0):.1f} (n={stats['count']})"
+            )
+        
+        # Bypass the queue: the answer is what the user is waiting for
+        await update.message.reply_text("\n".join(lines), parse_mode='HTML')
+
+    async def search_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Handle /search <words>: answered from the local archive"""
+        if not await self.authorize(update, context):
+            return
+        
+        query = ' '.join(context.args)
+        if not query:
+            await update.message.reply_text("Usage: /search <words>")
+            return
+        
+        start = time.perf_counter()
+        results = self.archive.search(query, limit=10)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        metrics.observe('archive_search_ms', elapsed_ms)
+        
+        if not results:
+            await update.message.reply_text(f"🔍 No announcements found for <b>{html.escape(query)}</b>", parse_mode='HTML')
+            return
+        
+        lines = [f"🔍 <b>{len(results)} results for {html.escape(query)}</b> ({elapsed_ms:.1f} ms)\n"]
+        for result in results:
+            date = datetime.fromtimestamp(result['dateTimestamp'] / 1000).strftime('%Y-%m-%d')
+            lines.append(f"• {date} [{result['class']}] <a href=\"{result['url']}\">{html.escape(result['title'])}</a>")
+        
+        await update.message.reply_text("\n".join(lines), parse_mode='HTML', disable_web_page_preview=True)
+
+    async def kill_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Handle /kill [job]: stop sliced executions (all of them without a job number)"""
+        if not await self.authorize(update, context):
+            return
+        
+        if context.args:
+            try:
+                job_id = int(context.args[0].lstrip('#'))
+            except ValueError:
+                await update.message.reply_text("Usage: /kill [job number]")
+                return
+            killed = [job_id] if self.pipeline.algos.cancel(job_id, 'killed from Telegram') else []
+        else:
+            killed = self.pipeline.algos.cancel_all('killed from Telegram')
+        
+        if killed:
+            await update.message.reply_text(f"🛑 Stopped {', '.join(f'#{job_id}' for job_id in killed)}")
+        else:
+            await update.message.reply_text("No running executions")
+
     async def handle_message(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle text messages"""
         state = context.user_data.get('state')
@@ -366,6 +508,8 @@ class TelegramBot:
                         self.user_settings['trade_settings'] = {}
                     self.user_settings['trade_settings']['leverage'] = leverage
                     self.save_user_settings(self.user_settings)
+                    # Apply it now rather than on the next trade
+                    await asyncio.to_thread(self.trader.ensure_leverage, leverage)
                     
                     settings_text, markup = self.get_settings_menu()
                     await update.message.reply_text(
@@ -447,14 +591,14 @@ class TelegramBot:
             context.user_data['state'] = SET_LEVERAGE
             return SET_LEVERAGE
     
-    async def send_message(self, message, parse_mode='HTML'):
-        """Send message to Telegram"""
+    async def send_message(self, message, parse_mode='HTML', priority=PRIORITY_ALERT, coalesce_key=None):
+        """Queue a message for Telegram (delivered by the rate-limited outbound queue)"""
         try:
-            await self.app.bot.send_message(
-                chat_id=self.chat_id,
-                text=message,
+            self.notifier.enqueue(
+                message,
                 parse_mode=parse_mode,
-                disable_web_page_preview=True
+                priority=priority,
+                coalesce_key=coalesce_key
             )
             return True
         except Exception as e:
@@ -472,7 +616,7 @@ class TelegramBot:
             f"Stop Loss: {sl}\n"
             f"Take Profit: {tp}"
         )
-        await self.send_message(message)
+        await self.send_message(message, priority=PRIORITY_TRADE)
     
     async def send_error_alert(self, error_message):
         """Send error alert message"""
@@ -480,188 +624,183 @@ class TelegramBot:
             "⚠️ <b>Error Alert</b> ⚠️\n\n"
             f"{error_message}"
         )
-        await self.send_message(message)
+        await self.send_message(message, priority=PRIORITY_ALERT)
 
     async def check_announcements(self, context: ContextTypes.DEFAULT_TYPE):
         """Check for new Launchpool announcements"""
+        chat_ids = context.bot_data.get('authorized_chats', [self.chat_id])
         try:
-            announcement = self.announcements.check_new_listings()
-            
-            if announcement:
-                # Format announcement time
-                timestamp = int(announcement.get('dateTimestamp', 0)) / 1000
-                date_time = datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S')
-                
-                # Get announcement details
-                title = announcement.get('title', 'No Title')
-                description = announcement.get('description', 'No Description')
-                link = announcement.get('url', '#')
-                
-                # Format message
-                message = (
-                    "🔥 <b>New Launchpool Announcement!</b> 🔥\n\n"
-                    f"📌 <b>Title:</b>\n{title}\n\n"
-                    f"📝 <b>Description:</b>\n{description}\n\n"
-                    f"⏰ <b>Time:</b> {date_time}\n"
-                    f"🔗 <b>Link:</b> {link}\n\n"
-                    "➖➖➖➖➖➖➖➖➖➖\n"
-                    "🤖 <b>Bot Action:</b>\n"
-                    f"• Symbol: MNTUSDT\n"
-                    f"• Quantity: {settings.QUANTITY}\n"
-                    f"• Stop Loss: {settings.STOP_LOSS_PCT}%\n"
-                    f"• Take Profit: {settings.TAKE_PROFIT_PCT}%\n"
-                    f"• Leverage: {self.settings['leverage']}x\n\n"
-                    "🚀 Opening LONG position..."
-                )
-                
-                # Send announcement to all chats
-                for chat_id in context.bot_data.get('authorized_chats', [update.effective_chat.id]):
-                    await context.bot.send_message(
-                        chat_id=chat_id,
-                        text=message,
-                        parse_mode='HTML',
-                        disable_web_page_preview=True
-                    )
-                
-                # Execute trade
-                trader = TradeExecutor()
-                try:
-                    trade_result = trader.execute_trade(
-                        quantity=settings.QUANTITY,
-                        stop_loss=settings.STOP_LOSS_PCT,
-                        take_profit=settings.TAKE_PROFIT_PCT,
-                        leverage=self.settings['leverage'],
-                        category="linear"
-                    )
-                    
-                    if trade_result:
-                        trade_message = (
-                            "✅ <b>Trade Executed Successfully!</b>\n\n"
-                            f"💹 <b>Entry Price:</b> {trade_result['price']}\n"
-                            f"📊 <b>Quantity:</b> {trade_result['quantity']} USDT\n"
-                            f"🔻 <b>Stop Loss:</b> {trade_result['stop_loss']}\n"
-                            f"🔼 <b>Take Profit:</b> {trade_result['take_profit']}\n"
-                            "➖➖➖➖➖➖➖➖➖➖\n"
-                            "⚠️ <i>Monitor your position in Bybit!</i>"
-                        )
-                        
-                        for chat_id in context.bot_data.get('authorized_chats', [update.effective_chat.id]):
-                            await context.bot.send_message(
-                                chat_id=chat_id,
-                                text=trade_message,
-                                parse_mode='HTML'
-                            )
-                        
-                except Exception as e:
-                    error_message = (
-                        "❌ <b>Trade Execution Failed!</b>\n\n"
-                        f"Error: {str(e)}\n\n"
-                        "Please check your settings and try again."
-                    )
-                    
-                    for chat_id in context.bot_data.get('authorized_chats', [update.effective_chat.id]):
-                        await context.bot.send_message(
-                            chat_id=chat_id,
-                            text=error_message,
-                            parse_mode='HTML'
-                        )
+            # Feeds are yielded as they answer, a slow one doesn't hold the others
+            async for announcement in self.announcements.iter_new_listings():
+                detected_at = time.perf_counter()
+                # Order first, notifications are queued by the pipeline
+                await self.pipeline.handle(announcement, detected_at, chat_ids=chat_ids)
                     
         except Exception as e:
             logger.error(f"Announcement check error: {str(e)}")
-            error_message = f"⚠️ <b>Announcement Check Error:</b>\n{str(e)}"
-            
-            for chat_id in context.bot_data.get('authorized_chats', [update.effective_chat.id]):
-                await context.bot.send_message(
-                    chat_id=chat_id,
-                    text=error_message,
-                    parse_mode='HTML'
-                )
+            self.notifier.enqueue(
+                f"⚠️ <b>Announcement Check Error:</b>\n{str(e)}",
+                chat_ids=chat_ids,
+                priority=PRIORITY_ALERT,
+                coalesce_key='announcement_error'
+            )
+
+    async def watch_instruments(self, context: ContextTypes.DEFAULT_TYPE):
+        """Diff the instrument universe and handle new listings"""
+        chat_ids = context.bot_data.get('authorized_chats', [self.chat_id])
+        try:
+            events = await asyncio.to_thread(self.instrument_watcher.poll)
+            for event in events:
+                await self.pipeline.handle_instrument_event(event, chat_ids=chat_ids)
+        except Exception as e:
+            logger.error(f"Error watching instruments: {str(e)}")
+
+    async def sync_clock(self, context: ContextTypes.DEFAULT_TYPE):
+        """Re-estimate the offset to Bybit server time"""
+        try:
+            await asyncio.to_thread(server_clock.sync)
+        except Exception as e:
+            logger.error(f"Error syncing clock: {str(e)}")
+
+    async def refresh_instruments(self, context: ContextTypes.DEFAULT_TYPE):
+        """Reload stale instrument metadata"""
+        try:
+            await asyncio.to_thread(self.trader.instruments.refresh_if_stale)
+        except Exception as e:
+            logger.error(f"Error refreshing instruments: {str(e)}")
 
-    async def check_position_status(self, context: ContextTypes.DEFAULT_TYPE, order_id=None):
-        """Check position status and send updates"""
+    async def refresh_armed_order(self, context: ContextTypes.DEFAULT_TYPE):
+        """Re-arm the order with the current settings and a fresh price"""
         try:
-            trader = TradeExecutor()
-            position = trader.get_position_info()
+            # pybit is blocking, keep it off the event loop
+            await asyncio.to_thread(
+                self.trader.arm,
+                self.settings['quantity'],
+                self.settings['stop_loss'],
+                self.settings['take_profit'],
+                self.settings['leverage']
+            )
+        except Exception as e:
+            logger.error(f"Error refreshing armed order: {str(e)}")
+
+    async def check_position_status(self, context: ContextTypes.DEFAULT_TYPE):
+        """Reconcile the live position book with REST (changes are pushed by the private stream)"""
+        try:
+            positions = await asyncio.to_thread(self.trader.get_all_positions)
+            if positions is None:
+                return
+            self.trader.leverage.seed(positions)
             
-            if position:
-                # Pozisyon bilgilerini al
-                entry_price = float(position.get('entryPrice', 0))
-                current_price = float(position.get('markPrice', 0))
-                size = float(position.get('size', 0))
-                unrealized_pnl = float(position.get('unrealisedPnl', 0))
-                
-                # PNL yüzdesini hesapla
-                pnl_percentage = (unrealized_pnl / (entry_price * size)) * 100
+            # First pass only seeds the book, existing positions are not news
+            if not self.positions_seeded:
+                # Flat symbols are not listed, ask for the trading symbol directly
+                await asyncio.to_thread(self.trader.load_leverage)
+                self.private_stream.book.seed(positions)
+                self.positions_seeded = True
+                logger.info(f"Position book seeded with {len(positions)} positions")
+                return
+            
+            for event in self.private_stream.reconcile(positions):
+                await self.handle_stream_event(event)
                 
-                # Pozisyon durumu mesajı
-                status_message = (
-                    "📊 <b>Position Update</b>\n\n"
-                    f"💰 Entry Price: {entry_price:.4f}\n"
-                    f"📈 Current Price: {current_price:.4f}\n"
-                    f"📊 Position Size: {size}\n"
-                    f"💵 Unrealized PNL: {unrealized_pnl:.2f} USDT\n"
-                    f"📈 PNL %: {pnl_percentage:.2f}%\n\n"
+        except Exception as e:
+            logger.error(f"Error checking position: {str(e)}")
+
+    def format_position_update(self, position):
+        """Format a position status message"""
+        entry_price = float(position.get('entryPrice') or position.get('avgPrice') or 0)
+        current_price = float(position.get('markPrice') or 0)
+        size = float(position.get('size') or 0)
+        unrealized_pnl = float(position.get('unrealisedPnl') or 0)
+        
+        # PNL yüzdesini hesapla
+        notional = entry_price * size
+        pnl_percentage = (unrealized_pnl / notional) * 100 if notional else 0
+        
+        status_message = (
+            "📊 <b>Position Update</b>\n\n"
+            f"🎯 Symbol: {position.get('symbol')} ({position.get('side')})\n"
+            f"💰 Entry Price: {entry_price:.4f}\n"
+            f"📈 Current Price: {current_price:.4f}\n"
+            f"📊 Position Size: {size}\n"
+            f"💵 Unrealized PNL: {unrealized_pnl:.2f} USDT\n"
+            f"📈 PNL %: {pnl_percentage:.2f}%\n\n"
+        )
+        
+        # Pozisyon durumuna göre emoji ekle
+        if pnl_percentage > 0:
+            status_message += "🟢 In Profit"
+        elif pnl_percentage < 0:
+            status_message += "🔴 In Loss"
+        else:
+            status_message += "⚪️ Break Even"
+        
+        return status_message
+
+    async def handle_stream_event(self, event):
+        """Turn private stream events into Telegram messages"""
+        if event['type'] == 'position':
+            position = event['position']
+            change = event['change']
+            
+            if change == 'closed':
+                # SL/TP (or a manual close) ended the position, stop adding to it
+                self.pipeline.algos.cancel_symbol(position.get('symbol'), 'position closed')
+                self.notifier.enqueue(
+                    "🔒 <b>Position Closed</b>\n\n"
+                    f"🎯 Symbol: {position.get('symbol')}\n"
+                    f"💰 Realized PNL (cumulative): {float(position.get('cumRealisedPnl') or 0):.2f} USDT",
+                    priority=PRIORITY_TRADE
                 )
-                
-                # Pozisyon durumuna göre emoji ekle
-                if pnl_percentage > 0:
-                    status_message += "🟢 In Profit"
-                elif pnl_percentage < 0:
-                    status_message += "🔴 In Loss"
-                else:
-                    status_message += "⚪️ Break Even"
-                
-                # Mesajı gönder
-                await context.bot.send_message(
-                    chat_id=self.chat_id,
-                    text=status_message,
-                    parse_mode='HTML'
+            elif change == 'tpsl':
+                self.notifier.enqueue(
+                    "🎯 <b>TP/SL Updated</b>\n\n"
+                    f"Symbol: {position.get('symbol')}\n"
+                    f"🔻 Stop Loss: {position.get('stopLoss')}\n"
+                    f"🔼 Take Profit: {position.get('takeProfit')}",
+                    priority=PRIORITY_STATUS,
+                    coalesce_key=f"tpsl:{position.get('symbol')}"
                 )
-                
-                # TP veya SL'ye yakınsa uyarı gönder
-                sl_price = entry_price * (1 - settings.STOP_LOSS_PCT / 100)
-                tp_price = entry_price * (1 + settings.TAKE_PROFIT_PCT / 100)
-                
-                if current_price <= sl_price * 1.01:  # SL'ye %1 kaldıysa
-                    await context.bot.send_message(
-                        chat_id=self.chat_id,
-                        text="⚠️ <b>Warning:</b> Price is near Stop Loss!",
-                        parse_mode='HTML'
-                    )
-                elif current_price >= tp_price * 0.99:  # TP'ye %1 kaldıysa
-                    await context.bot.send_message(
-                        chat_id=self.chat_id,
-                        text="🎯 <b>Alert:</b> Price is near Take Profit!",
-                        parse_mode='HTML'
-                    )
-                
-                # Pozisyon kapandıysa bildir
-                if size == 0 and order_id:
-                    closed_position = trader.get_order_history(order_id)
-                    if closed_position:
-                        realized_pnl = float(closed_position.get('closedPnl', 0))
-                        close_message = (
-                            "🔒 <b>Position Closed</b>\n\n"
-                            f"💰 Realized PNL: {realized_pnl:.2f} USDT\n"
-                            f"📈 Final PNL %: {(realized_pnl / (entry_price * size)) * 100:.2f}%"
-                        )
-                        await context.bot.send_message(
-                            chat_id=self.chat_id,
-                            text=close_message,
-                            parse_mode='HTML'
-                        )
-                
             else:
-                logger.warning("No active position found")
+                # Only the latest state of a position is worth sending
+                self.notifier.enqueue(
+                    self.format_position_update(position),
+                    priority=PRIORITY_STATUS,
+                    coalesce_key=f"position:{position.get('symbol')}"
+                )
                 
-        except Exception as e:
-            logger.error(f"Error checking position: {str(e)}")
+        elif event['type'] == 'order':
+            order = event['order']
+            stop_type = order.get('stopOrderType', '')
+            
+            # SL/TP triggers arrive as conditional orders
+            if order.get('orderStatus') in ('Triggered', 'Filled') and stop_type in (
+                'StopLoss', 'PartialStopLoss', 'TakeProfit', 'PartialTakeProfit', 'TrailingStop'
+            ):
+                emoji = "🔼" if 'TakeProfit' in stop_type else "🔻"
+                self.notifier.enqueue(
+                    f"{emoji} <b>{stop_type} {order.get('orderStatus')}</b>\n\n"
+                    f"Symbol: {order.get('symbol')}\n"
+                    f"Trigger Price: {order.get('triggerPrice')}\n"
+                    f"Quantity: {order.get('qty')}",
+                    priority=PRIORITY_TRADE
+                )
+                
+        elif event['type'] == 'execution':
+            execution = event['execution']
+            if execution.get('execType') == 'Trade':
+                self.notifier.enqueue(
+                    "✅ <b>Order Filled</b>\n\n"
+                    f"{execution.get('symbol')} {execution.get('side')} "
+                    f"{execution.get('execQty')} @ {execution.get('execPrice')}\n"
+                    f"Fee: {execution.get('execFee')}",
+                    priority=PRIORITY_TRADE
+                )
 
     async def show_open_positions(self, query):
         """Show open positions"""
         try:
-            trader = TradeExecutor()
-            positions = trader.get_positions()
+            positions = self.trader.get_positions()
             
             if not positions:
                 await query.message.reply_text(
@@ -697,8 +836,7 @@ class TelegramBot:
     async def show_order_history(self, query):
         """Show order history"""
         try:
-            trader = TradeExecutor()
-            orders = trader.get_order_history()
+            orders = self.trader.get_order_history()
             
             if not orders:
                 await query.message.reply_text(
@@ -733,8 +871,7 @@ class TelegramBot:
     async def show_account_info(self, query):
         """Show account information"""
         try:
-            trader = TradeExecutor()
-            wallet = trader.get_wallet_info()
+            wallet = self.trader.get_wallet_info()
             
             if not wallet:
                 await query.message.reply_text("❌ Error fetching account info!")
@@ -793,8 +930,7 @@ class TelegramBot:
 
             await query.message.edit_text(message, parse_mode='HTML')
 
-            trader = TradeExecutor()
-            result = await trader.execute_trade(
+            result = await self.trader.execute_trade(
                 quantity=current_quantity,
                 stop_loss=current_sl,
                 take_profit=current_tp,
@@ -825,14 +961,3 @@ def run_bot():
     """Run the bot"""
     bot = TelegramBot()
     asyncio.run(bot.run())
-
-# Test message
-bot = TelegramBot()
-print(f"Using chat_id: {os.getenv('TELEGRAM_CHAT_ID')}")
-test_message = (
-    "🤖 <b>Bot Test Message</b>\n\n"
-    "Channel ID: -1002404132090\n"
-    "Status: Connected\n"
-    "Time: Running"
-)
-bot.send_message(test_message) 
\ No newline at end of file
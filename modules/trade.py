@@ -1,8 +1,18 @@
 from pybit.unified_trading import HTTP
+from pybit.exceptions import InvalidRequestError
 import os
 from utils.logger import setup_logger
 from dotenv import load_dotenv
 from config.settings import settings
+from modules.instruments import instrument_cache
+from modules.leverage import leverage_cache
+from modules.normalizer import OrderNormalizer
+from modules.order_registry import order_registry, PENDING, PLACED, FAILED
+from modules.market_data import TickerCache
+from utils.http_pool import configure_session
+from utils.metrics import metrics
+from utils.clock import server_clock
+import asyncio
 import time
 import math
 import sys
@@ -13,16 +23,56 @@ load_dotenv()
 # Configure logger
 logger = setup_logger('trade')
 
+# retCodes that leave the order's fate unknown (checked by link ID, then retried)
+RETRYABLE_CODES = {10000, 10002, 10006, 10016}
+# orderLinkId already used: the order exists
+DUPLICATE_LINK_ID = 110072
+
 class TradeExecutor:
-    def __init__(self):
+    def __init__(self, base_url=None):
         """Initialize TradeExecutor"""
         try:
             self.client = HTTP(
                 testnet=settings.TESTNET,
                 api_key=settings.API_KEY,
-                api_secret=settings.API_SECRET
+                api_secret=settings.API_SECRET,
+                timeout=settings.HTTP_TIMEOUT,
+                # One attempt per call: the order registry retries, after checking the exchange
+                max_retries=1
+            )
+            # Set after construction, an empty set passed in is replaced by pybit's defaults
+            self.client.retry_codes = set()
+            base_url = base_url or settings.BYBIT_BASE_URL
+            if base_url:
+                self.client.endpoint = base_url.rstrip('/')
+            # One bounded keep-alive pool for every REST call of this executor
+            # Order endpoints get a short timeout, their retries are idempotent
+            configure_session(
+                self.client.client,
+                pool_size=settings.HTTP_POOL_SIZE,
+                path_timeouts={'/v5/order/': settings.ORDER_TIMEOUT}
             )
+            # Signed requests use the exchange clock, not the local one
+            server_clock.bind(self.client)
+            server_clock.install()
             self.symbol = settings.SYMBOL
+            # Shared instrument metadata cache
+            self.instruments = instrument_cache
+            self.instruments.bind(self.client)
+            # Exact lot size / tick rounding on the cached instrument filters
+            self.normalizer = OrderNormalizer(self.instruments)
+            # Known leverage per symbol side, set_leverage only on a change
+            self.leverage = leverage_cache
+            self.leverage.bind(self.client)
+            # Stream-fed ticker table; started by the owner's event loop
+            self.market_data = TickerCache(
+                symbols=settings.MARKET_DATA_SYMBOLS,
+                rest_client=self.client
+            )
+            # Pre-built order template used by armed mode
+            self.armed = None
+            # Orders sent per orderLinkId, consulted before any resend
+            self.orders = order_registry
             
             logger.info("TradeExecutor initialized. Testnet: %s", settings.TESTNET)
             
@@ -30,23 +80,22 @@ class TradeExecutor:
             logger.error("TradeExecutor initialization error: %s", str(e))
             raise
             
+    def ensure_leverage(self, leverage, symbol=None):
+        """Apply a leverage ahead of trading (skipped when already set)"""
+        return self.leverage.ensure(symbol or self.symbol, leverage)
+
+    def load_leverage(self, symbol=None):
+        """Seed the leverage cache from the symbol's position"""
+        position = self.get_position_info(symbol)
+        if position:
+            self.leverage.apply(position)
+        return position
+
     def get_min_trading_qty(self):
         """Get minimum trading quantity for symbol"""
-        try:
-            instruments = self.client.get_instruments_info(
-                category="linear",
-                symbol=self.symbol
-            )
-            
-            if instruments and instruments.get('result'):
-                min_qty = float(instruments['result']['list'][0]['lotSizeFilter']['minOrderQty'])
-                logger.info(f"Minimum trading quantity for {self.symbol}: {min_qty}")
-                return min_qty
-            return 1.0
-            
-        except Exception as e:
-            logger.error(f"Error getting min trading qty: {str(e)}")
-            return 1.0
+        min_qty, _, _ = self.instruments.lot_size("linear", self.symbol)
+        logger.info(f"Minimum trading quantity for {self.symbol}: {min_qty}")
+        return min_qty
             
     def check_wallet_balance(self):
         """Check wallet USDT balance"""
@@ -68,129 +117,380 @@ class TradeExecutor:
             logger.error(f"Error checking wallet balance: {str(e)}")
             return 0
             
-    def get_lot_size_rules(self):
+    def get_lot_size_rules(self, symbol=None):
         """Get lot size rules for the symbol"""
-        try:
-            instruments = self.client.get_instruments_info(
-                category="linear",
-                symbol=self.symbol
-            )
-            
-            if instruments and instruments.get('result'):
-                instrument = instruments['result']['list'][0]
-                lot_size_filter = instrument['lotSizeFilter']
-                
-                min_qty = float(lot_size_filter['minOrderQty'])
-                max_qty = float(lot_size_filter['maxOrderQty'])
-                qty_step = float(lot_size_filter['qtyStep'])
-                
-                logger.info(f"Lot size rules - Min: {min_qty}, Max: {max_qty}, Step: {qty_step}")
-                return min_qty, max_qty, qty_step
-                
-            return 1.0, 10000.0, 1.0
-            
-        except Exception as e:
-            logger.error(f"Error getting lot size rules: {str(e)}")
-            return 1.0, 10000.0, 1.0
+        min_qty, max_qty, qty_step = self.instruments.lot_size("linear", symbol or self.symbol)
+        logger.info(f"Lot size rules - Min: {min_qty}, Max: {max_qty}, Step: {qty_step}")
+        return min_qty, max_qty, qty_step
 
-    def normalize_quantity(self, quantity):
+    def normalize_quantity(self, quantity, symbol=None):
         """Normalize quantity according to lot size rules"""
-        min_qty, max_qty, qty_step = self.get_lot_size_rules()
+        return float(self.normalizer.quantity(symbol or self.symbol, quantity))
+
+    def prepare_order(self, quantity, stop_loss, take_profit, leverage, apply_leverage=True, symbol=None):
+        """Build the order template: price, lot size, leverage and order params"""
+        symbol = symbol or self.symbol
         
-        # Ensure quantity is within limits
-        quantity = max(min_qty, min(quantity, max_qty))
+        # Market fiyatını al (stream cache, REST only when stale)
+        mark_price = self.market_data.get_mark_price(symbol)
         
-        # Round to nearest step
-        steps = round(quantity / qty_step)
-        quantity = steps * qty_step
+        if not mark_price:
+            return None
         
-        return quantity
+        normalize_start = time.perf_counter()
+        
+        # USDT miktarını kontrat miktarına çevir (lot size ve min/max sınırları dahil)
+        sized = self.normalizer.size(symbol, quantity, mark_price)
+        mnt_quantity = sized['qty_value']
+        actual_usdt = sized['usdt_value']
+        stop_loss_price = self.normalizer.price(symbol, mark_price * (1 - stop_loss/100))
+        take_profit_price = self.normalizer.price(symbol, mark_price * (1 + take_profit/100))
+        
+        metrics.observe('stage_normalize_ms', (time.perf_counter() - normalize_start) * 1000)
+        
+        logger.info(f"Converting {quantity} USDT to {sized['qty']} {symbol} at price {mark_price}")
+        
+        # Set leverage (no round-trip when the cached state already matches)
+        if apply_leverage:
+            self.leverage.ensure(symbol, leverage)
+        
+        # Order parametreleri
+        order_params = {
+            "category": "linear",
+            "symbol": symbol,
+            "side": "Buy",
+            "orderType": "Market",  # Market emri kullan
+            "qty": sized['qty'],
+            "stopLoss": stop_loss_price,
+            "takeProfit": take_profit_price,
+            "leverage": str(leverage),
+            "positionIdx": 0,
+            "reduceOnly": False,  # Yeni pozisyon açabilir
+            "closeOnTrigger": False  # Stop loss/take profit için
+        }
+        
+        return {
+            'order_params': order_params,
+            'entry_price': mark_price,
+            'mnt_quantity': mnt_quantity,
+            'usdt_value': actual_usdt
+        }
 
-    async def execute_trade(self, quantity, stop_loss, take_profit, leverage):
-        """Execute trade with given parameters"""
+    def arm(self, quantity, stop_loss, take_profit, leverage):
+        """Prepare an order template ahead of time so a trade is a single place_order call"""
         try:
-            symbol = "MNTUSDT"
-            
-            # Market fiyatını al
-            ticker = self.client.get_tickers(
-                category="linear",
-                symbol=symbol
-            )
-            
-            if not ticker or ticker.get('retCode') != 0:
-                return {'success': False, 'error': 'Could not get market price'}
+            key = (quantity, stop_loss, take_profit, leverage)
+            template = self.prepare_order(quantity, stop_loss, take_profit, leverage)
+            if not template:
+                logger.error("Could not arm order: market price unavailable")
+                return False
                 
-            mark_price = float(ticker['result']['list'][0]['markPrice'])
-            
-            # Lot size kurallarını al
-            min_qty, max_qty, qty_step = self.get_lot_size_rules()
-            
-            # USDT miktarını MNT'ye çevir
-            raw_mnt_quantity = quantity / mark_price
-            
-            # MNT miktarını lot size kurallarına göre normalize et
-            steps = round(raw_mnt_quantity / qty_step)
-            mnt_quantity = round(steps * qty_step, 3)
+            template['key'] = key
+            template['armed_at'] = time.monotonic()
+            self.armed = template
             
-            # Minimum ve maksimum sınırları kontrol et
-            mnt_quantity = max(min_qty, min(mnt_quantity, max_qty))
+            logger.info(f"Order armed: {template['order_params']}")
+            return True
             
-            # Gerçek USDT değerini hesapla
-            actual_usdt = round(mnt_quantity * mark_price, 2)
-            
-            logger.info(f"Converting {quantity} USDT to {mnt_quantity} MNT at price {mark_price}")
+        except Exception as e:
+            logger.error(f"Error arming order: {str(e)}")
+            return False
+
+    def refresh_armed_order(self):
+        """Refresh the armed template with a fresh price"""
+        if self.armed is None:
+            return False
+        return self.arm(*self.armed['key'])
+
+    def disarm(self):
+        """Drop the armed order template"""
+        self.armed = None
+        logger.info("Order disarmed")
+
+    def get_armed_order(self, quantity, stop_loss, take_profit, leverage, symbol=None):
+        """Return the armed template if it matches the parameters and is fresh"""
+        if self.armed is None:
+            return None
+        if self.armed['order_params']['symbol'] != (symbol or self.symbol):
+            return None
+        if self.armed['key'] != (quantity, stop_loss, take_profit, leverage):
+            return None
+        if time.monotonic() - self.armed['armed_at'] > settings.ARM_MAX_AGE:
+            logger.warning("Armed order is stale, falling back to a full prepare")
+            return None
+        return self.armed
+
+    async def execute_trade(self, quantity, stop_loss, take_profit, leverage, symbol=None, template=None,
+                            link_id=None):
+        """Execute trade with given parameters (on self.symbol unless a symbol is given)
+
+        A template from prepare_order (e.g. built just before a scheduled start)
+        is sent as is. With a link_id the order is idempotent (see place_template).
+        The blocking REST calls run in a worker thread so the event loop keeps
+        serving the streams, polls and notifications meanwhile.
+        """
+        try:
+            template = template or self.get_armed_order(quantity, stop_loss, take_profit, leverage, symbol)
             
-            # Set leverage
-            try:
-                self.client.set_leverage(
-                    category="linear",
-                    symbol=symbol,
-                    buyLeverage=str(leverage),
-                    sellLeverage=str(leverage)
+            if template:
+                logger.info("Using armed order template")
+            else:
+                template = await asyncio.to_thread(
+                    self.prepare_order, quantity, stop_loss, take_profit, leverage, symbol=symbol
                 )
-            except Exception as e:
-                logger.warning(f"Leverage setting error (might be already set): {str(e)}")
-            
-            # Order parametreleri
-            order_params = {
-                "category": "linear",
-                "symbol": symbol,
-                "side": "Buy",
-                "orderType": "Market",  # Market emri kullan
-                "qty": str(mnt_quantity),
-                "stopLoss": str(round(mark_price * (1 - stop_loss/100), 4)),
-                "takeProfit": str(round(mark_price * (1 + take_profit/100), 4)),
-                "leverage": str(leverage),
-                "positionIdx": 0,
-                "reduceOnly": False,  # Yeni pozisyon açabilir
-                "closeOnTrigger": False  # Stop loss/take profit için
-            }
-            
-            logger.info(f"Placing order with params: {order_params}")
+                if not template:
+                    return {'success': False, 'error': 'Could not get market price'}
             
-            # Pozisyon aç
-            response = self.client.place_order(**order_params)
-            
-            if response and response.get('retCode') == 0:
-                return {
-                    'success': True,
-                    'data': {
-                        'entry_price': mark_price,
-                        'mnt_quantity': mnt_quantity,
-                        'usdt_value': actual_usdt,
-                        'stop_loss': float(order_params['stopLoss']),
-                        'take_profit': float(order_params['takeProfit'])
-                    }
-                }
-            else:
-                error_msg = response.get('retMsg', 'Unknown error')
-                logger.error(f"Trade execution failed: {error_msg}")
-                return {'success': False, 'error': error_msg}
+            return await asyncio.to_thread(self.place_template, template, link_id)
                 
         except Exception as e:
             logger.error(f"Error executing trade: {str(e)}")
             return {'success': False, 'error': str(e)}
 
+    def place_template(self, template, link_id=None):
+        """Send one prepared order and time it
+
+        With a link_id the order carries it as orderLinkId: an order already
+        placed under it is returned instead of resent, and ambiguous failures
+        (timeouts, service errors) are retried after checking the exchange.
+        Retries sleep and look orders up synchronously, so async callers run
+        this in a worker thread (execute_trade, execute_basket, ExecutionAlgos).
+        """
+        if link_id:
+            return self._place_idempotent(template, link_id)
+        
+        order_params = template['order_params']
+        
+        logger.info(f"Placing order with params: {order_params}")
+        
+        # Pozisyon aç
+        sent_at = time.perf_counter()
+        response = self.client.place_order(**order_params)
+        acked_at = time.perf_counter()
+        metrics.observe('stage_order_ms', (acked_at - sent_at) * 1000)
+        
+        if response and response.get('retCode') == 0:
+            return {'success': True, 'data': self._fill_data(template, sent_at, acked_at)}
+        
+        error_msg = response.get('retMsg', 'Unknown error')
+        logger.error(f"Trade execution failed: {error_msg}")
+        return {'success': False, 'error': error_msg}
+
+    def _place_idempotent(self, template, link_id):
+        """place_template for an order with a client order ID"""
+        order_params = dict(template['order_params'], orderLinkId=link_id)
+        symbol = order_params['symbol']
+        
+        previous = self.orders.begin(link_id, symbol)
+        if previous is not None and previous['state'] == PLACED:
+            logger.warning(f"Order {link_id} was already placed, not sending it again")
+            metrics.incr('order_duplicates_avoided')
+            return dict(previous['result'], duplicate=True)
+        if previous is not None and previous['state'] == PENDING:
+            # An earlier attempt never got an answer
+            found = self._resolve_existing(template, link_id)
+            if found:
+                return found
+        
+        error_msg = 'Unknown error'
+        for attempt in range(settings.ORDER_RETRIES + 1):
+            if attempt:
+                metrics.incr('order_retries')
+                time.sleep(settings.ORDER_RETRY_DELAY)
+            
+            logger.info(f"Placing order {link_id} (attempt {attempt + 1}) with params: {order_params}")
+            sent_at = time.perf_counter()
+            try:
+                response = self.client.place_order(**order_params)
+            except InvalidRequestError as e:
+                response = {'retCode': e.status_code, 'retMsg': e.message}
+            except Exception as e:
+                # Timeout or connection error: the order may or may not exist
+                response = None
+                error_msg = str(e)
+            acked_at = time.perf_counter()
+            metrics.observe('stage_order_ms', (acked_at - sent_at) * 1000)
+            
+            ret_code = response.get('retCode') if response else None
+            if ret_code == 0:
+                result = {'success': True, 'data': self._fill_data(template, sent_at, acked_at)}
+                self.orders.resolve(link_id, PLACED, result)
+                return result
+            
+            if response is not None:
+                error_msg = response.get('retMsg', 'Unknown error')
+                if ret_code != DUPLICATE_LINK_ID and ret_code not in RETRYABLE_CODES:
+                    # Definitive rejection, nothing was opened
+                    logger.error(f"Trade execution failed: {error_msg}")
+                    self.orders.resolve(link_id, FAILED)
+                    return {'success': False, 'error': error_msg}
+            
+            logger.warning(f"Order {link_id} outcome unknown ({error_msg}), checking before any retry")
+            found = self._resolve_existing(template, link_id)
+            if found:
+                return found
+        
+        logger.error(f"Trade execution failed after {settings.ORDER_RETRIES + 1} attempts: {error_msg}")
+        return {'success': False, 'error': error_msg, 'link_id': link_id}
+
+    def _resolve_existing(self, template, link_id):
+        """Look an order up by link ID and record it as placed when it exists"""
+        order = self.find_order(link_id, template['order_params']['symbol'])
+        if order is None:
+            return None
+        
+        now = time.perf_counter()
+        result = {'success': True, 'data': self._fill_data(template, now, now)}
+        self.orders.resolve(link_id, PLACED, result)
+        logger.info(f"Order {link_id} found on the exchange ({order.get('orderStatus')})")
+        return result
+
+    def find_order(self, link_id, symbol):
+        """Return the exchange's order with this orderLinkId, None when there is none"""
+        try:
+            response = self.client.get_open_orders(category="linear", symbol=symbol, orderLinkId=link_id)
+            orders = response.get('result', {}).get('list', [])
+            if not orders:
+                response = self.client.get_order_history(category="linear", symbol=symbol, orderLinkId=link_id)
+                orders = response.get('result', {}).get('list', [])
+            return orders[0] if orders else None
+        except Exception as e:
+            logger.error(f"Error looking up order {link_id}: {str(e)}")
+            return None
+
+    def _fill_data(self, template, sent_at, acked_at):
+        """Result data of an accepted order"""
+        order_params = template['order_params']
+        return {
+            'symbol': order_params['symbol'],
+            'entry_price': template['entry_price'],
+            'mnt_quantity': template['mnt_quantity'],
+            'usdt_value': template['usdt_value'],
+            'stop_loss': float(order_params['stopLoss']) if order_params.get('stopLoss') else None,
+            'take_profit': float(order_params['takeProfit']) if order_params.get('takeProfit') else None,
+            'order_sent_at': sent_at,
+            'order_acked_at': acked_at
+        }
+
+    def _prepare_leg(self, leg):
+        """Build the template of one basket leg, timing it"""
+        started = time.perf_counter()
+        args = (leg['quantity'], leg['stop_loss'], leg['take_profit'], leg['leverage'])
+        try:
+            template = self.get_armed_order(*args, leg['symbol']) or self.prepare_order(*args, symbol=leg['symbol'])
+        except Exception as e:
+            logger.error(f"Error preparing {leg['symbol']} leg: {str(e)}")
+            template = None
+        return template, (time.perf_counter() - started) * 1000
+
+    def place_batch(self, templates, link_ids=None):
+        """Send templates through one batch order request, None when the batch itself failed
+
+        A leg whose outcome the batch leaves unknown gets a None result, for
+        the single-order path to check and resend.
+        """
+        link_ids = link_ids or [None] * len(templates)
+        batch = []
+        for template, link_id in zip(templates, link_ids):
+            params = dict(template['order_params'])
+            params.pop('category')
+            if link_id:
+                params['orderLinkId'] = link_id
+                self.orders.begin(link_id, params['symbol'])
+            batch.append(params)
+        
+        try:
+            sent_at = time.perf_counter()
+            response = self.client.place_batch_order(category="linear", request=batch)
+            acked_at = time.perf_counter()
+        except Exception as e:
+            logger.warning(f"Batch order failed, falling back to single orders: {str(e)}")
+            return None
+        
+        if not response or response.get('retCode') != 0:
+            logger.warning(f"Batch order rejected, falling back to single orders: {response}")
+            return None
+        
+        metrics.observe('stage_batch_order_ms', (acked_at - sent_at) * 1000)
+        statuses = response.get('retExtInfo', {}).get('list', [])
+        results = []
+        for index, (template, link_id) in enumerate(zip(templates, link_ids)):
+            status = statuses[index] if index < len(statuses) else {'code': 0}
+            code = status.get('code')
+            if code == 0:
+                result = {'success': True, 'data': self._fill_data(template, sent_at, acked_at)}
+                if link_id:
+                    self.orders.resolve(link_id, PLACED, result)
+            elif link_id and (code == DUPLICATE_LINK_ID or code in RETRYABLE_CODES):
+                result = None
+            else:
+                logger.error(f"Basket leg {template['order_params']['symbol']} rejected: {status.get('msg')}")
+                result = {'success': False, 'error': status.get('msg', 'Unknown error')}
+                if link_id:
+                    self.orders.resolve(link_id, FAILED)
+            results.append(result)
+        return results
+
+    async def execute_basket(self, legs):
+        """Place a basket of legs concurrently, one result per leg in the same order
+
+        Each leg is a dict with symbol, quantity (USDT), stop_loss, take_profit,
+        leverage and an optional link_id. Legs are prepared in parallel, then
+        sent as batch orders (BATCH_ORDERS) or as concurrent single orders.
+        Every result carries its prepare_ms and order_ms.
+        """
+        prepared = await asyncio.gather(*(asyncio.to_thread(self._prepare_leg, leg) for leg in legs))
+        
+        results = [None] * len(legs)
+        ready = []
+        link_ids = [leg.get('link_id') for leg in legs]
+        for index, (template, _) in enumerate(prepared):
+            if template is None:
+                results[index] = {'success': False, 'error': 'Could not get market price'}
+            else:
+                ready.append(index)
+        
+        # Legs sent before (e.g. a retried event) take the single path, which checks them first
+        fresh = [index for index in ready if not link_ids[index] or self.orders.get(link_ids[index]) is None]
+        if settings.BATCH_ORDERS and len(fresh) > 1:
+            limit = max(1, settings.BATCH_ORDER_LIMIT)
+            chunks = [fresh[i:i + limit] for i in range(0, len(fresh), limit)]
+            answers = await asyncio.gather(*(
+                asyncio.to_thread(
+                    self.place_batch,
+                    [prepared[index][0] for index in chunk],
+                    [link_ids[index] for index in chunk]
+                )
+                for chunk in chunks
+            ))
+            for chunk, answer in zip(chunks, answers):
+                if answer is not None:
+                    for index, result in zip(chunk, answer):
+                        if result is not None:
+                            results[index] = dict(result, batched=True)
+        
+        # Whatever was not batched goes out as concurrent single orders
+        single = [index for index in ready if results[index] is None]
+        answers = await asyncio.gather(*(
+            asyncio.to_thread(self.place_template, prepared[index][0], link_ids[index]) for index in single
+        ), return_exceptions=True)
+        for index, answer in zip(single, answers):
+            if isinstance(answer, Exception):
+                logger.error(f"Error placing {legs[index]['symbol']} leg: {str(answer)}")
+                answer = {'success': False, 'error': str(answer)}
+            results[index] = dict(answer, batched=False)
+        
+        for leg, result, (_, prepare_ms) in zip(legs, results, prepared):
+            data = result.get('data') or {}
+            result['symbol'] = leg['symbol']
+            result['prepare_ms'] = prepare_ms
+            if 'order_sent_at' in data:
+                result['order_ms'] = (data['order_acked_at'] - data['order_sent_at']) * 1000
+        
+        metrics.incr('basket_legs', len(legs))
+        logger.info(f"Basket executed: {sum(r['success'] for r in results)}/{len(legs)} legs filled")
+        return results
+
     def transfer_to_unified(self, amount=1000):
         """Transfer from Funding to Unified Trading Account"""
         try:
@@ -238,6 +538,10 @@ class TradeExecutor:
     def get_market_info(self, symbol):
         """Get market information for symbol"""
         try:
+            ticker = self.market_data.get(symbol)
+            if ticker:
+                return {'category': 'linear', 'list': [ticker]}
+            
             response = self.client.get_tickers(
                 category="linear",
                 symbol=symbol
@@ -247,12 +551,12 @@ class TradeExecutor:
             logger.error(f"Error getting market info: {str(e)}")
             return None 
 
-    def get_position_info(self):
+    def get_position_info(self, symbol=None):
         """Get current position information"""
         try:
             response = self.client.get_positions(
                 category="linear",
-                symbol=self.symbol
+                symbol=symbol or self.symbol
             )
             
             if response and response.get('result', {}).get('list'):
@@ -263,10 +567,26 @@ class TradeExecutor:
             logger.error(f"Error getting position info: {str(e)}")
             return None
             
+    def get_all_positions(self):
+        """Get every linear USDT position (None on error)"""
+        try:
+            response = self.client.get_positions(
+                category="linear",
+                settleCoin="USDT"
+            )
+            
+            if response and response.get('retCode') == 0:
+                return response.get('result', {}).get('list', [])
+            return None
+            
+        except Exception as e:
+            logger.error(f"Error getting positions: {str(e)}")
+            return None
+            
     def get_order_history(self):
         """Get recent orders"""
         try:
-            response = self.client.get_orders(
+            response = self.client.get_order_history(
                 category="linear",
                 symbol=self.symbol,
                 limit=5  # Son 5 emir
@@ -283,7 +603,7 @@ class TradeExecutor:
     def get_positions(self):
         """Get all open positions"""
         try:
-            response = self.client.get_position_info(
+            response = self.client.get_positions(
                 category="linear",
                 symbol=self.symbol
             )
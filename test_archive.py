@@ -0,0 +1,42 @@
+import json
+from pathlib import Path
+from modules.archive import AnnouncementArchive
+
+CORPUS = Path(__file__).parent / 'fixtures' / 'announcements_corpus.jsonl'
+
+def load_corpus():
+    with open(CORPUS) as f:
+        return [
+            dict(json.loads(line), url=f'https://x/{i}/', dateTimestamp=i * 1000)
+            for i, line in enumerate(f) if line.strip()
+        ]
+
+def test_archive_is_insert_once_and_searchable(tmp_path):
+    """Test idempotent archiving and full-text search"""
+    archive = AnnouncementArchive(tmp_path / 'announcements.db')
+    corpus = load_corpus()
+
+    assert archive.add_many(corpus, 'en-US') == len(corpus)
+    assert archive.add_many(corpus, 'en-US') == 0
+    assert archive.count() == len(corpus)
+
+    results = archive.search('launchpool ZETA')
+    assert [r['title'] for r in results] == ['Bybit Will List Zeta Network (ZETA) on Spot and Launchpool']
+    assert results[0]['class'] == 'launchpool'
+
+    # User input never reaches FTS as syntax
+    assert archive.search('"maintenance" (') == archive.search('maintenance')
+    assert archive.search('***') == []
+    archive.close()
+
+def test_archive_survives_reopening(tmp_path):
+    """Test that the archive is persistent"""
+    path = tmp_path / 'announcements.db'
+    archive = AnnouncementArchive(path)
+    archive.add_many(load_corpus())
+    archive.close()
+
+    reopened = AnnouncementArchive(path)
+
+    assert reopened.search('delisting')[0]['title'] == 'Delisting of GHIUSDT Perpetual Contract'
+    reopened.close()
@@ -32,7 +32,7 @@ def test_announcements():
         # Telegram'a bildir
         telegram = TelegramBot()
         if result:
-            test_message += f"\n✅ Yeni duyuru bulundu:\n{result.get('title')}"
+            test_message += f"\n✅ Yeni duyuru bulundu:\n{result[-1].get('title')}"
         else:
             test_message += "\n✅ Duyuru kontrolü çalışıyor (yeni duyuru yok)"
             
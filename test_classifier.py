@@ -0,0 +1,42 @@
+import json
+from pathlib import Path
+from modules.classifier import AnnouncementClassifier, DELISTING, LAUNCHPOOL, MAINTENANCE, NEW_LISTING, OTHER
+
+CORPUS = Path(__file__).parent / 'fixtures' / 'announcements_corpus.jsonl'
+
+def load_corpus():
+    with open(CORPUS) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def test_corpus():
+    """Test the class of every corpus announcement"""
+    classifier = AnnouncementClassifier()
+
+    for item in load_corpus():
+        assert classifier.classify(item) == item['class'], item['title']
+
+def test_type_keys_and_tags_win_over_keywords():
+    """Test that the announcement metadata decides before the title"""
+    classifier = AnnouncementClassifier()
+
+    assert classifier.classify({'title': 'Listing update', 'type': {'key': 'delistings'}}) == DELISTING
+    assert classifier.classify({'title': 'Earn rewards', 'tags': ['Launchpool']}) == LAUNCHPOOL
+    assert classifier.classify({'title': 'Wallet upgrade', 'type': {'key': 'maintenance_updates'}}) == MAINTENANCE
+
+def test_classify_many_counts_per_class():
+    """Test bulk classification of a backlog"""
+    classifier = AnnouncementClassifier()
+    corpus = load_corpus() * 100
+
+    classes = classifier.classify_many(corpus)
+
+    assert classes == [item['class'] for item in corpus]
+    assert classifier.counts[NEW_LISTING] == 500
+    assert sum(classifier.counts.values()) == len(corpus)
+
+def test_derivatives_notices_need_a_listing_keyword():
+    """Test that the Derivatives tag alone doesn't make a listing"""
+    classifier = AnnouncementClassifier()
+
+    assert classifier.classify({'title': 'Adjustment of risk limit for BTCUSDT perpetual', 'tags': ['Derivatives']}) == OTHER
+    assert classifier.classify({'title': 'Bybit Will List XYZUSDT Perpetual', 'tags': ['Derivatives']}) == NEW_LISTING
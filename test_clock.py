@@ -0,0 +1,45 @@
+import time
+from utils.clock import ServerClock
+from utils.metrics import metrics
+
+def test_lowest_rtt_sample_wins():
+    """Test NTP-style filtering of offset samples"""
+    clock = ServerClock(window=4)
+
+    # Server is 500 ms ahead; the slow samples are skewed by asymmetric queueing
+    clock.add_sample(1000, 1600, 1100)
+    clock.add_sample(2000, 2540, 2020)
+    clock.add_sample(3000, 3900, 3300)
+
+    assert clock.offset_ms == 530
+    assert clock.rtt_ms == 20
+    assert metrics.gauges['clock_skew_ms'] == 530
+
+def test_old_samples_leave_the_window():
+    """Test that the filter only looks at recent samples"""
+    clock = ServerClock(window=2)
+    clock.add_sample(0, 100, 10)
+    clock.add_sample(1000, 1300, 1100)
+    clock.add_sample(2000, 2300, 2100)
+
+    assert clock.offset_ms == 250
+
+class FakeClient:
+    """Answers /v5/market/time from a shifted local clock"""
+    def __init__(self, offset_ms):
+        self.offset_ms = offset_ms
+
+    def get_server_time(self):
+        now_ms = time.time() * 1000 + self.offset_ms
+        return {'retCode': 0, 'result': {'timeSecond': str(int(now_ms // 1000)), 'timeNano': str(int(now_ms * 1e6))}}
+
+def test_sync_estimates_the_offset():
+    """Test a sync burst against a client whose clock is 2 s ahead"""
+    clock = ServerClock()
+    clock.bind(FakeClient(2000))
+
+    clock.sync(samples=4)
+
+    assert abs(clock.offset_ms - 2000) < 50
+    server_ms = int(clock.client.get_server_time()['result']['timeNano']) / 1e6
+    assert abs(clock.now_ms() - server_ms) < 50
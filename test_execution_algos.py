@@ -0,0 +1,144 @@
+import asyncio
+from modules.execution_algos import ExecutionAlgos, DONE, CANCELLED
+from modules.market_data import OrderBook
+from modules.notifier import NotificationQueue
+from config.settings import settings
+
+class FakeMarketData:
+    """Fixed price and a one-level book of the given USDT depth"""
+    def __init__(self, price=1.0, depth=10000.0):
+        self.price = price
+        self.book = OrderBook()
+        self.book.apply({'b': [[str(price * 0.999), '1000000']], 'a': [[str(price), str(depth / price)]]}, snapshot=True)
+
+    async def add_books(self, symbols):
+        pass
+
+    def get_mark_price(self, symbol):
+        return self.price
+
+    def get_book(self, symbol):
+        return self.book
+
+    def get(self, symbol):
+        return None
+
+class FakeNormalizer:
+    def spec(self, symbol):
+        return {'min_qty': 1.0}
+
+class FakeTrader:
+    """Fills every slice at the mark price"""
+    def __init__(self, market_data):
+        self.market_data = market_data
+        self.normalizer = FakeNormalizer()
+        self.orders = []
+        self.params = []
+
+    def prepare_order(self, quantity, stop_loss, take_profit, leverage, symbol=None):
+        price = self.market_data.price
+        order_params = {'symbol': symbol, 'stopLoss': str(price * 0.98), 'takeProfit': str(price * 1.04)}
+        return {'order_params': order_params, 'entry_price': price,
+                'mnt_quantity': quantity / price, 'usdt_value': quantity}
+
+    def place_template(self, template, link_id=None):
+        self.orders.append((link_id, template['usdt_value']))
+        self.params.append(template['order_params'])
+        price = template['entry_price']
+        return {'success': True, 'data': {
+            'entry_price': price, 'mnt_quantity': template['mnt_quantity'], 'usdt_value': template['usdt_value'],
+            'stop_loss': price * 0.98, 'take_profit': price * 1.04
+        }}
+
+class FakeBot:
+    def __init__(self):
+        self.sent = []
+        self.edits = []
+
+    async def send_message(self, chat_id, text, **kwargs):
+        self.sent.append(text)
+        return type('Message', (), {'message_id': len(self.sent)})()
+
+    async def edit_message_text(self, chat_id, message_id, text, **kwargs):
+        self.edits.append(text)
+
+def run_job(trader, algo, notional, during=None):
+    """Start a job, optionally act on it while it runs, and wait for it to end"""
+    bot = FakeBot()
+
+    async def run():
+        notifier = NotificationQueue(bot, '1', private_chat_rate=1000)
+        notifier.start()
+        algos = ExecutionAlgos(trader, notifier, algo=algo, max_slippage=0.5)
+        job, first = await algos.start('XYZUSDT', notional, 2, 4, 1, link_key='event-1')
+        if during:
+            await during(algos, job)
+        while algos._tasks:
+            await asyncio.sleep(0.01)
+        await notifier.stop()
+        return job, first
+
+    job, first = asyncio.run(run())
+    return job, first, bot
+
+def test_twap_slices_evenly_under_one_edited_message(monkeypatch):
+    """Test TWAP slicing, per-slice link IDs and the single progress message"""
+    monkeypatch.setattr(settings, 'TWAP_SLICES', 4)
+    monkeypatch.setattr(settings, 'TWAP_DURATION', 0.04)
+    trader = FakeTrader(FakeMarketData())
+
+    job, first, bot = run_job(trader, 'twap', 1000)
+
+    assert first['success']
+    assert job.state == DONE
+    assert [usdt for _, usdt in trader.orders] == [250, 250, 250, 250]
+    assert len({link_id for link_id, _ in trader.orders}) == 4
+    # Only the first fill sets the position's SL/TP
+    assert ['stopLoss' in params for params in trader.params] == [True, False, False, False]
+    assert len(bot.sent) == 1
+    assert 'Done' in (bot.edits or bot.sent)[-1]
+
+def test_slices_are_capped_by_book_depth(monkeypatch):
+    """Test that no slice takes more than the depth within the slippage band"""
+    monkeypatch.setattr(settings, 'ICEBERG_CLIP', 500)
+    monkeypatch.setattr(settings, 'ICEBERG_INTERVAL', 0.01)
+    trader = FakeTrader(FakeMarketData(depth=200))
+
+    job, _, _ = run_job(trader, 'iceberg', 1000)
+
+    assert job.state == DONE
+    assert max(usdt for _, usdt in trader.orders) <= 200
+    assert sum(usdt for _, usdt in trader.orders) == 1000
+
+def test_kill_and_stop_loss_cancel_the_rest(monkeypatch):
+    """Test that /kill and a stop loss price stop further slices"""
+    monkeypatch.setattr(settings, 'ICEBERG_CLIP', 100)
+    monkeypatch.setattr(settings, 'ICEBERG_INTERVAL', 0.01)
+
+    async def kill(algos, job):
+        assert algos.cancel_all('killed') == [job.id]
+
+    trader = FakeTrader(FakeMarketData())
+    job, _, bot = run_job(trader, 'iceberg', 1000, during=kill)
+    assert job.state == CANCELLED
+    assert len(trader.orders) == 1
+    assert 'killed' in (bot.edits or bot.sent)[-1]
+
+    async def crash(algos, job):
+        trader.market_data.price = 0.97
+
+    trader = FakeTrader(FakeMarketData())
+    job, _, _ = run_job(trader, 'iceberg', 1000, during=crash)
+    assert job.state == CANCELLED
+    assert 'stop loss' in job.reason
+    assert len(trader.orders) == 1
+
+def test_order_book_depth():
+    """Test snapshot/delta merging and depth within a slippage band"""
+    book = OrderBook()
+    book.apply({'b': [['0.99', '100']], 'a': [['1.00', '100'], ['1.004', '50'], ['1.02', '1000']]}, snapshot=True)
+    book.apply({'a': [['1.004', '0'], ['1.003', '10']]})
+
+    assert book.best_ask() == 1.0
+    assert book.depth('Buy', 0.5) == 100 * 1.0 + 10 * 1.003
+    assert book.depth('Sell', 0.5) == 99.0
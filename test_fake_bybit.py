@@ -0,0 +1,344 @@
+import asyncio
+import time
+from config.settings import settings
+from fake_bybit import FakeBybit
+from modules.announcements import LaunchpoolAnnouncements
+from modules.seen_index import SeenIndex
+from modules.archive import AnnouncementArchive
+from backfill import backfill
+from modules.private_stream import PrivateStream
+from modules.trade import TradeExecutor
+from modules.execution_algos import ExecutionAlgos
+
+def test_announcement_to_order_offline(tmp_path):
+    """Test the detect → trade path against the fake exchange"""
+    exchange = FakeBybit()
+    base_url = exchange.start_in_thread()
+    try:
+        announcements = LaunchpoolAnnouncements(base_url=base_url, seen_index=SeenIndex(tmp_path / 'seen.log'))
+        trader = TradeExecutor(base_url=base_url)
+
+        assert not announcements.check_new_listings()
+
+        exchange.add_announcement(
+            'Bybit Launchpool: Stake MNT to earn XYZ',
+            type_key='latest_activities',
+            tags=['Launchpool'],
+            date_ms=exchange.now_ms() + 1000
+        )
+        assert len(announcements.check_new_listings()) == 1
+
+        result = asyncio.run(trader.execute_trade(quantity=65, stop_loss=2, take_profit=4, leverage=3))
+
+        assert result['success'], result
+        assert exchange.orders[0]['symbol'] == 'MNTUSDT'
+        assert exchange.leverage['MNTUSDT'] == ('3', '3')
+        # Leverage is cached: the second trade sends no set_leverage
+        exchange.leverage['MNTUSDT'] = ('2', '2')
+        asyncio.run(trader.execute_trade(quantity=65, stop_loss=2, take_profit=4, leverage=3))
+        assert exchange.leverage['MNTUSDT'] == ('2', '2')
+        assert float(exchange.positions['MNTUSDT']['size']) > 0
+        announcements.close()
+    finally:
+        exchange.stop_thread()
+
+def test_feeds_are_merged_without_duplicates(tmp_path):
+    """Test concurrent feeds against the fake exchange"""
+    exchange = FakeBybit()
+    base_url = exchange.start_in_thread()
+    try:
+        announcements = LaunchpoolAnnouncements(
+            base_url=base_url,
+            seen_index=SeenIndex(tmp_path / 'seen.log'),
+            feeds=['en-US//Launchpool', 'en-US/new_crypto/', 'zh-TW//Launchpool']
+        )
+        assert not announcements.check_new_listings()
+
+        now = exchange.now_ms()
+        exchange.add_announcement('New listing: XYZUSDT', tags=['Launchpool'], date_ms=now + 1000)
+        exchange.add_announcement('Bybit Launchpool: XYZ', tags=['Launchpool'], date_ms=now + 2000, locale='zh-TW')
+
+        new = announcements.check_new_listings()
+
+        assert sorted(a['title'] for a in new) == ['Bybit Launchpool: XYZ', 'New listing: XYZUSDT']
+        announcements.close()
+    finally:
+        exchange.stop_thread()
+
+def test_hedged_polls_take_the_fastest_valid_host(tmp_path, monkeypatch):
+    """Test hedged announcement requests across mock hosts with different latencies"""
+    monkeypatch.setattr(settings, 'HEDGE_REQUESTS', True)
+    slow, fast = FakeBybit(latency_ms=300), FakeBybit()
+    hosts = [slow.start_in_thread(), fast.start_in_thread()]
+    try:
+        announcements = LaunchpoolAnnouncements(hosts=hosts, seen_index=SeenIndex(tmp_path / 'seen.log'))
+        announcements.check_new_listings()
+
+        for exchange in (slow, fast):
+            exchange.add_announcement('Bybit Launchpool: XYZ', tags=['Launchpool'], url='https://x/1/')
+        new = announcements.check_new_listings()
+
+        assert [a['title'] for a in new] == ['Bybit Launchpool: XYZ']
+        assert announcements.urls[0].startswith(hosts[1])
+
+        # A fast host answering with an error doesn't win the race
+        fast.inject_error('/v5/announcements/index')
+        for exchange in (slow, fast):
+            exchange.add_announcement('Bybit Launchpool: ABC', tags=['Launchpool'], url='https://x/2/')
+
+        assert [a['title'] for a in announcements.check_new_listings()] == ['Bybit Launchpool: ABC']
+        announcements.close()
+    finally:
+        slow.stop_thread()
+        fast.stop_thread()
+
+def test_backfill_and_live_archiving(tmp_path):
+    """Test that backfill pages through the index and the poller keeps the archive current"""
+    exchange = FakeBybit()
+    base_url = exchange.start_in_thread()
+    try:
+        for i in range(45):
+            exchange.add_announcement(f'Historic notice {i}', date_ms=1000 + i)
+        archive = AnnouncementArchive(tmp_path / 'announcements.db')
+
+        added = asyncio.run(backfill(archive, base_url, ['en-US'], limit=10, concurrency=3, rate=100))
+        assert added == 45
+        assert exchange.request_counts['/v5/announcements/index'] == 5
+
+        announcements = LaunchpoolAnnouncements(
+            base_url=base_url, seen_index=SeenIndex(tmp_path / 'seen.log'),
+            feeds=['en-US//Launchpool'], archive=archive
+        )
+        announcements.check_new_listings()
+        exchange.add_announcement('Bybit Launchpool: Stake MNT to earn QRS', tags=['Launchpool'])
+        announcements.check_new_listings()
+
+        assert archive.count() == 46
+        assert archive.search('QRS')[0]['class'] == 'launchpool'
+        announcements.close()
+        archive.close()
+    finally:
+        exchange.stop_thread()
+
+def test_injected_errors_and_latency():
+    """Test per-path error injection"""
+    exchange = FakeBybit()
+    base_url = exchange.start_in_thread()
+    try:
+        exchange.inject_error('/v5/order/create', ret_code=10016, ret_msg='Service error')
+        trader = TradeExecutor(base_url=base_url)
+
+        failed = asyncio.run(trader.execute_trade(quantity=65, stop_loss=2, take_profit=4, leverage=1))
+        retried = asyncio.run(trader.execute_trade(quantity=65, stop_loss=2, take_profit=4, leverage=1))
+
+        assert not failed['success']
+        assert retried['success']
+        assert exchange.request_counts['/v5/order/create'] == 2
+    finally:
+        exchange.stop_thread()
+
+def test_private_stream_receives_fills():
+    """Test that a fill is pushed over the fake private stream"""
+    events = []
+
+    async def on_event(event):
+        events.append(event['type'])
+
+    async def run():
+        exchange = FakeBybit()
+        await exchange.start()
+        stream = PrivateStream(on_event, url=exchange.ws_private_url, api_key='key', api_secret='secret')
+        stream.start()
+        try:
+            for _ in range(100):
+                if exchange.private_clients:
+                    break
+                await asyncio.sleep(0.01)
+
+            exchange.positions.clear()
+            await exchange._publish_fill(
+                {'symbol': 'MNTUSDT', 'side': 'Buy', 'orderId': '1', 'orderLinkId': '', 'avgPrice': '0.65', 'qty': '100'},
+                {'symbol': 'MNTUSDT', 'positionIdx': 0, 'side': 'Buy', 'size': '100'}
+            )
+            for _ in range(100):
+                if 'wallet' in events:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            await stream.stop()
+            await exchange.stop()
+
+    asyncio.run(run())
+    assert events == ['order', 'execution', 'position', 'wallet']
+
+def test_basket_legs_go_out_in_one_batch():
+    """Test batch placement with per-leg results, and the single-order fallback"""
+    exchange = FakeBybit()
+    base_url = exchange.start_in_thread()
+    try:
+        trader = TradeExecutor(base_url=base_url)
+        legs = [
+            {'symbol': 'MNTUSDT', 'quantity': 65, 'stop_loss': 2, 'take_profit': 4, 'leverage': 1},
+            {'symbol': 'BTCUSDT', 'quantity': 700, 'stop_loss': 2, 'take_profit': 4, 'leverage': 1},
+        ]
+
+        results = asyncio.run(trader.execute_basket(legs))
+
+        assert [(r['symbol'], r['success'], r['batched']) for r in results] == [
+            ('MNTUSDT', True, True), ('BTCUSDT', True, True)
+        ]
+        assert all(r['order_ms'] >= 0 and r['prepare_ms'] >= 0 for r in results)
+        assert exchange.request_counts['/v5/order/create-batch'] == 1
+        assert '/v5/order/create' not in exchange.request_counts
+
+        exchange.inject_error('/v5/order/create-batch', http_status=404)
+        results = asyncio.run(trader.execute_basket(legs))
+
+        assert [(r['success'], r['batched']) for r in results] == [(True, False), (True, False)]
+        assert exchange.request_counts['/v5/order/create'] == 2
+    finally:
+        exchange.stop_thread()
+
+def test_orders_with_link_ids_are_never_doubled():
+    """Test check-before-retry and duplicate protection by orderLinkId"""
+    exchange = FakeBybit()
+    base_url = exchange.start_in_thread()
+    try:
+        trader = TradeExecutor(base_url=base_url)
+        trade = dict(quantity=65, stop_loss=2, take_profit=4, leverage=1)
+
+        # A service error is checked by link ID, then retried
+        exchange.inject_error('/v5/order/create', ret_code=10016, ret_msg='Service error')
+        first = asyncio.run(trader.execute_trade(**trade, link_id='lp-test-1'))
+        assert first['success']
+        assert exchange.request_counts['/v5/order/create'] == 2
+        assert len(exchange.orders) == 1
+
+        # The same event again: answered from the registry, nothing sent
+        again = asyncio.run(trader.execute_trade(**trade, link_id='lp-test-1'))
+        assert again['duplicate']
+        assert exchange.request_counts['/v5/order/create'] == 2
+
+        # Placed by an attempt whose answer was lost (e.g. before a restart)
+        exchange.orders.insert(0, dict(exchange.orders[0], orderLinkId='lp-test-2'))
+        lost = asyncio.run(trader.execute_trade(**trade, link_id='lp-test-2'))
+        assert lost['success']
+        assert len(exchange.orders) == 2
+    finally:
+        exchange.stop_thread()
+
+def test_order_path_does_not_block_the_loop():
+    """Test that the event loop keeps running while an order is sent"""
+    exchange = FakeBybit()
+    base_url = exchange.start_in_thread()
+    try:
+        trader = TradeExecutor(base_url=base_url)
+        exchange.set_latency('/v5/order/create', 200)
+
+        async def run():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.01)
+                    ticks += 1
+
+            task = asyncio.create_task(ticker())
+            result = await trader.execute_trade(quantity=65, stop_loss=2, take_profit=4, leverage=1)
+            task.cancel()
+            return result, ticks
+
+        result, ticks = asyncio.run(run())
+
+        assert result['success'], result
+        assert ticks >= 10
+    finally:
+        exchange.stop_thread()
+
+def test_order_retries_do_not_block_the_loop(monkeypatch):
+    """Test that the retry delay and lookups of an idempotent order run off the event loop"""
+    monkeypatch.setattr(settings, 'ORDER_RETRY_DELAY', 0.2)
+    exchange = FakeBybit()
+    base_url = exchange.start_in_thread()
+    try:
+        trader = TradeExecutor(base_url=base_url)
+        exchange.inject_error('/v5/order/create', ret_code=10016, ret_msg='Service error')
+
+        async def run():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.01)
+                    ticks += 1
+
+            task = asyncio.create_task(ticker())
+            result = await trader.execute_trade(quantity=65, stop_loss=2, take_profit=4, leverage=1,
+                                                link_id='lp-test-loop')
+            task.cancel()
+            return result, ticks
+
+        result, ticks = asyncio.run(run())
+
+        assert result['success'], result
+        assert exchange.request_counts['/v5/order/create'] == 2
+        assert ticks >= 10
+    finally:
+        exchange.stop_thread()
+
+def test_rate_limited_orders_are_retried_by_the_registry(monkeypatch):
+    """Test that pybit does not retry on its own, the registry checks first and resends"""
+    monkeypatch.setattr(settings, 'ORDER_RETRY_DELAY', 0)
+    exchange = FakeBybit()
+    base_url = exchange.start_in_thread()
+    try:
+        trader = TradeExecutor(base_url=base_url)
+        exchange.inject_error('/v5/order/create', ret_code=10006, ret_msg='Too many visits!')
+
+        started = time.perf_counter()
+        result = asyncio.run(trader.execute_trade(quantity=65, stop_loss=2, take_profit=4, leverage=1,
+                                                  link_id='lp-test-limit'))
+
+        assert result['success'], result
+        assert exchange.request_counts['/v5/order/create'] == 2
+        # The lookup before the resend proves the registry, not pybit, retried
+        assert exchange.request_counts['/v5/order/realtime'] == 1
+        assert time.perf_counter() - started < 2
+    finally:
+        exchange.stop_thread()
+
+def test_sliced_execution_sets_sl_tp_once(monkeypatch):
+    """Test an iceberg against the fake exchange: REST order book, one SL/TP for the position"""
+    monkeypatch.setattr(settings, 'ICEBERG_CLIP', 30)
+    monkeypatch.setattr(settings, 'ICEBERG_INTERVAL', 0.01)
+    exchange = FakeBybit()
+    base_url = exchange.start_in_thread()
+    try:
+        trader = TradeExecutor(base_url=base_url)
+        progress = []
+
+        class Notifier:
+            def enqueue(self, text, **kwargs):
+                progress.append(kwargs['edit_key'])
+
+        async def run():
+            algos = ExecutionAlgos(trader, Notifier(), algo='iceberg')
+            job, first = await algos.start('MNTUSDT', 90, 2, 4, 1, link_key='event-algo')
+            while algos.running():
+                await asyncio.sleep(0.01)
+            await algos.stop()
+            return job, first
+
+        job, first = asyncio.run(run())
+
+        assert first['success'] and job.state == 'done'
+        assert exchange.request_counts['/v5/market/orderbook'] >= 1
+        orders = list(reversed(exchange.orders))
+        assert len(orders) == 3
+        assert [bool(order['stopLoss']) for order in orders] == [True, False, False]
+        assert exchange.positions['MNTUSDT']['stopLoss'] == orders[0]['stopLoss']
+        assert set(progress) == {f'algo:{job.id}'}
+    finally:
+        exchange.stop_thread()
@@ -0,0 +1,62 @@
+from modules.instruments import InstrumentCache
+from modules.instrument_watcher import InstrumentWatcher, NEW_SYMBOL, STATUS_CHANGE, REMOVED_SYMBOL
+
+def make_instrument(symbol, status='Trading'):
+    return {
+        'symbol': symbol,
+        'status': status,
+        'lotSizeFilter': {'minOrderQty': '1', 'maxOrderQty': '5000', 'qtyStep': '0.1'},
+        'priceFilter': {'tickSize': '0.0001'}
+    }
+
+class FakeClient:
+    """Serves a mutable instrument universe, two symbols per page"""
+    def __init__(self, instruments):
+        self.instruments = instruments
+        self.calls = 0
+
+    def get_instruments_info(self, **params):
+        self.calls += 1
+        items = sorted(self.instruments, key=lambda i: i['symbol'])
+        offset = int(params.get('cursor') or 0)
+        next_offset = offset + 2
+        return {'retCode': 0, 'result': {
+            'list': items[offset:next_offset],
+            'nextPageCursor': str(next_offset) if next_offset < len(items) else ''
+        }}
+
+def make_watcher(instruments, tmp_path):
+    client = FakeClient(instruments)
+    cache = InstrumentCache(cache_file=tmp_path / 'instruments.json')
+    cache.bind(client)
+    return InstrumentWatcher(cache, categories=['linear']), client
+
+def test_first_poll_seeds_and_quiet_polls_emit_nothing(tmp_path):
+    """Test seeding and the unchanged fast path"""
+    watcher, client = make_watcher([make_instrument('BTCUSDT'), make_instrument('MNTUSDT')], tmp_path)
+
+    assert watcher.poll() == []
+    assert watcher.poll() == []
+    assert watcher.known['linear'] == {'BTCUSDT': 'Trading', 'MNTUSDT': 'Trading'}
+
+def test_listing_lifecycle_events(tmp_path):
+    """Test new symbol, status flip and removal events"""
+    instruments = [make_instrument('BTCUSDT'), make_instrument('MNTUSDT'), make_instrument('SOLUSDT')]
+    watcher, client = make_watcher(instruments, tmp_path)
+    watcher.poll()
+
+    instruments.append(make_instrument('NEWUSDT', 'PreLaunch'))
+    events = watcher.poll()
+    assert events == [{'type': NEW_SYMBOL, 'category': 'linear', 'symbol': 'NEWUSDT', 'status': 'PreLaunch'}]
+    assert watcher.cache.get('linear', 'NEWUSDT')['qty_step'] == 0.1
+
+    instruments[-1] = make_instrument('NEWUSDT', 'Trading')
+    events = watcher.poll()
+    assert events == [{
+        'type': STATUS_CHANGE, 'category': 'linear', 'symbol': 'NEWUSDT',
+        'status': 'Trading', 'previous': 'PreLaunch'
+    }]
+
+    del instruments[0]
+    events = watcher.poll()
+    assert events == [{'type': REMOVED_SYMBOL, 'category': 'linear', 'symbol': 'BTCUSDT'}]
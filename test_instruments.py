@@ -0,0 +1,50 @@
+from modules.instruments import InstrumentCache
+
+def make_instrument(symbol, step='0.1', tick='0.0001'):
+    return {
+        'symbol': symbol,
+        'status': 'Trading',
+        'baseCoin': symbol[:-4],
+        'quoteCoin': 'USDT',
+        'lotSizeFilter': {'minOrderQty': '1', 'maxOrderQty': '5000', 'qtyStep': step},
+        'priceFilter': {'tickSize': tick},
+        'leverageFilter': {'minLeverage': '1', 'maxLeverage': '25', 'leverageStep': '0.01'}
+    }
+
+class FakeClient:
+    """Serves two pages of instruments-info"""
+    def __init__(self):
+        self.calls = []
+
+    def get_instruments_info(self, **params):
+        self.calls.append(params)
+        if params.get('cursor') == 'page2':
+            return {'retCode': 0, 'result': {'list': [make_instrument('BTCUSDT', '0.001', '0.1')], 'nextPageCursor': ''}}
+        return {'retCode': 0, 'result': {'list': [make_instrument('MNTUSDT')], 'nextPageCursor': 'page2'}}
+
+def test_bulk_load_and_lookups(tmp_path):
+    """Test paginated bulk load and cached lookups"""
+    client = FakeClient()
+    cache = InstrumentCache(cache_file=tmp_path / 'instruments.json', ttl=3600)
+    cache.bind(client)
+
+    assert cache.load_all('linear')
+    assert len(client.calls) == 2
+    assert cache.lot_size('linear', 'MNTUSDT') == (1.0, 5000.0, 0.1)
+    assert cache.tick_size('linear', 'BTCUSDT') == 0.1
+    assert cache.leverage_filter('linear', 'MNTUSDT') == (1.0, 25.0, 0.01)
+    # Lookups are served from memory
+    assert len(client.calls) == 2
+    assert not cache.is_stale('linear')
+
+def test_warm_restart_from_disk(tmp_path):
+    """Test that a saved cache is usable without any download"""
+    cache_file = tmp_path / 'instruments.json'
+    cache = InstrumentCache(cache_file=cache_file, ttl=3600)
+    cache.bind(FakeClient())
+    cache.load_all('linear')
+
+    restarted = InstrumentCache(cache_file=cache_file, ttl=3600)
+    assert restarted.load()
+    assert restarted.symbols('linear') == {'MNTUSDT', 'BTCUSDT'}
+    assert not restarted.is_stale('linear')
@@ -0,0 +1,59 @@
+import asyncio
+from modules.leverage import LeverageCache
+from modules.private_stream import PrivateStream
+
+class FakeClient:
+    """Answers set_leverage like Bybit, raising on 'not modified'"""
+    def __init__(self):
+        self.calls = []
+        self.leverage = {}
+
+    def set_leverage(self, **params):
+        self.calls.append(params)
+        leverage = (params['buyLeverage'], params['sellLeverage'])
+        if self.leverage.get(params['symbol']) == leverage:
+            raise Exception('leverage not modified (ErrCode: 110043)')
+        self.leverage[params['symbol']] = leverage
+        return {'retCode': 0, 'retMsg': 'OK', 'result': {}}
+
+def test_set_leverage_only_on_change():
+    """Test that a known leverage skips the API call"""
+    client = FakeClient()
+    cache = LeverageCache()
+    cache.bind(client)
+
+    assert cache.ensure('MNTUSDT', 3)
+    assert cache.ensure('MNTUSDT', 3)
+    assert len(client.calls) == 1
+    assert cache.ensure('MNTUSDT', 5)
+    assert len(client.calls) == 2
+
+    # Changed elsewhere: the exchange answers "not modified", which still counts as set
+    cache.invalidate('MNTUSDT')
+    assert cache.ensure('MNTUSDT', 5)
+    assert cache.matches('MNTUSDT', 5)
+
+def test_seeded_from_positions_and_stream():
+    """Test seeding from REST positions and updates from the private stream"""
+    client = FakeClient()
+    cache = LeverageCache()
+    cache.bind(client)
+    cache.seed([
+        {'symbol': 'MNTUSDT', 'positionIdx': 0, 'side': 'Buy', 'size': '10', 'leverage': '3'},
+        {'symbol': 'BTCUSDT', 'positionIdx': 1, 'side': 'Buy', 'size': '1', 'leverage': '10'},
+    ])
+
+    assert cache.matches('MNTUSDT', 3)
+    assert cache.get('BTCUSDT', 'Buy') == 10.0
+    assert cache.get('BTCUSDT', 'Sell') is None
+
+    async def on_event(event):
+        pass
+
+    stream = PrivateStream(on_event, api_key='key', api_secret='secret', leverage=cache)
+    asyncio.run(stream.handle_message({'topic': 'position', 'data': [
+        {'symbol': 'MNTUSDT', 'positionIdx': 0, 'side': 'Buy', 'size': '10', 'leverage': '4'}
+    ]}))
+
+    assert cache.ensure('MNTUSDT', 4)
+    assert client.calls == []
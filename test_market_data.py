@@ -0,0 +1,79 @@
+import asyncio
+import json
+from pathlib import Path
+from aiohttp import web
+from modules.market_data import TickerCache
+
+RECORDED_TICKS = Path(__file__).parent / 'fixtures' / 'tickers_mntusdt.jsonl'
+
+async def start_replay_server(ticks):
+    """Local WebSocket stand-in that replays recorded ticks after a subscribe"""
+    subscriptions = []
+
+    async def stream(request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        async for message in ws:
+            data = json.loads(message.data)
+            if data.get('op') == 'subscribe':
+                subscriptions.append(data['args'])
+                await ws.send_str(json.dumps({'success': True, 'op': 'subscribe'}))
+                for tick in ticks:
+                    await ws.send_str(tick)
+        return ws
+
+    app = web.Application()
+    app.router.add_get('/v5/public/linear', stream)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f'ws://127.0.0.1:{port}/v5/public/linear', subscriptions
+
+class FakeRestClient:
+    """REST fallback that counts get_tickers calls"""
+    def __init__(self):
+        self.calls = 0
+
+    def get_tickers(self, category, symbol):
+        self.calls += 1
+        return {'retCode': 0, 'result': {'list': [{'symbol': symbol, 'markPrice': '0.7000'}]}}
+
+def test_replayed_ticks_are_merged():
+    """Test snapshot + delta merging against the replay server"""
+    ticks = RECORDED_TICKS.read_text().splitlines()
+
+    async def run():
+        runner, url, subscriptions = await start_replay_server(ticks)
+        rest = FakeRestClient()
+        cache = TickerCache(['MNTUSDT'], url=url, max_age=5, rest_client=rest)
+        cache.start()
+        try:
+            for _ in range(200):
+                if cache.tickers.get('MNTUSDT', {}).get('volume24h') == '12716120':
+                    break
+                await asyncio.sleep(0.01)
+            return cache.get_mark_price('MNTUSDT'), cache.get('MNTUSDT'), subscriptions, rest.calls
+        finally:
+            await cache.stop()
+            await runner.cleanup()
+
+    mark_price, ticker, subscriptions, rest_calls = asyncio.run(run())
+
+    assert subscriptions == [['tickers.MNTUSDT']]
+    assert mark_price == 0.6521
+    assert ticker['lastPrice'] == '0.6519'
+    # Snapshot fields survive the deltas
+    assert ticker['fundingRate'] == '0.0001'
+    assert rest_calls == 0
+
+def test_stale_price_falls_back_to_rest():
+    """Test that a stale entry is refreshed over REST"""
+    rest = FakeRestClient()
+    cache = TickerCache(['MNTUSDT'], url='ws://unused', max_age=0, rest_client=rest)
+    cache.handle_message(json.loads(RECORDED_TICKS.read_text().splitlines()[0]))
+
+    assert cache.get('MNTUSDT') is None
+    assert cache.get_mark_price('MNTUSDT') == 0.7
+    assert rest.calls == 1
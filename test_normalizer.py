@@ -0,0 +1,60 @@
+from modules.instruments import InstrumentCache, decimal_scale
+from modules.normalizer import OrderNormalizer, format_units
+
+def make_cache(tmp_path):
+    cache = InstrumentCache(cache_file=tmp_path / 'instruments.json')
+    cache.put('linear', {
+        'symbol': 'MNTUSDT',
+        'lotSizeFilter': {'minOrderQty': '1', 'maxOrderQty': '5000', 'qtyStep': '1'},
+        'priceFilter': {'tickSize': '0.0001'}
+    })
+    cache.put('linear', {
+        'symbol': 'BTCUSDT',
+        'lotSizeFilter': {'minOrderQty': '0.001', 'maxOrderQty': '100', 'qtyStep': '0.001'},
+        'priceFilter': {'tickSize': '0.10'}
+    })
+    cache.put('linear', {
+        'symbol': 'PEPEUSDT',
+        'lotSizeFilter': {'minOrderQty': '100', 'maxOrderQty': '1000000', 'qtyStep': '100'},
+        'priceFilter': {'tickSize': '0.0000001'}
+    })
+    return cache
+
+def test_scale_and_format():
+    """Test the integer scale factors and their exact rendering"""
+    assert decimal_scale('0.005') == (3, 5)
+    assert decimal_scale('0.10') == (1, 1)
+    assert decimal_scale('100') == (0, 100)
+    assert decimal_scale('1e-05') == (5, 1)
+    assert format_units(3, 3) == '0.003'
+    assert format_units(123456, 2) == '1234.56'
+    assert format_units(7, 0) == '7'
+
+def test_sizes_are_on_the_grid(tmp_path):
+    """Test notional → quantity conversion, clamping and tick rounding"""
+    normalizer = OrderNormalizer(make_cache(tmp_path))
+
+    assert normalizer.size('BTCUSDT', 100, 67123.4)['qty'] == '0.001'
+    assert normalizer.size('BTCUSDT', 1000, 67123.4) == {'qty': '0.015', 'qty_value': 0.015, 'usdt_value': 1006.85}
+    assert normalizer.size('PEPEUSDT', 50, 0.0000123)['qty'] == '1000000'
+    assert normalizer.size('PEPEUSDT', 1, 0.0000123)['qty'] == '81300'
+    # Float steps used to leak through as e.g. 0.30000000000000004
+    assert normalizer.quantity('BTCUSDT', 0.3) == '0.300'
+    assert normalizer.price('BTCUSDT', 67123.4 * 0.98) == '65780.9'
+    assert normalizer.price('PEPEUSDT', 0.0000123 * 1.04) == '0.0000128'
+    # Unknown symbols fall back to the default filters
+    assert normalizer.quantity('NEWUSDT', 0.4) == '1'
+
+def test_batched_sizes_match_single(tmp_path):
+    """Test that size_many gives the same answer as size"""
+    normalizer = OrderNormalizer(make_cache(tmp_path))
+    symbols = ['MNTUSDT', 'BTCUSDT', 'PEPEUSDT', 'MNTUSDT']
+    notionals = [65, 1000, 1, 10]
+    prices = [0.65, 67123.4, 0.0000123, 0.66]
+
+    batched = normalizer.size_many(symbols, notionals, prices)
+
+    assert batched == [
+        (sized['qty'], sized['usdt_value'])
+        for sized in map(normalizer.size, symbols, notionals, prices)
+    ]
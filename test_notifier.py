@@ -0,0 +1,87 @@
+import asyncio
+from modules.notifier import NotificationQueue, PRIORITY_TRADE, PRIORITY_STATUS
+
+class RetryAfter(Exception):
+    """Same shape as telegram.error.RetryAfter"""
+    def __init__(self, retry_after):
+        super().__init__(f"Flood control exceeded. Retry in {retry_after} seconds")
+        self.retry_after = retry_after
+
+class FakeBot:
+    def __init__(self, flood_first=False):
+        self.sent = []
+        self.flood_first = flood_first
+
+    async def send_message(self, chat_id, text, **kwargs):
+        if self.flood_first:
+            self.flood_first = False
+            raise RetryAfter(0.05)
+        self.sent.append((chat_id, text))
+
+def run_queue(bot, fill, **rates):
+    """Fill the queue before the worker starts, then flush it"""
+    async def run():
+        queue = NotificationQueue(bot, '1', private_chat_rate=1000, **rates)
+        fill(queue)
+        queue.start()
+        await queue.stop(timeout=5)
+    asyncio.run(run())
+
+def test_trade_lane_goes_first():
+    """Test that trade confirmations overtake queued status messages"""
+    bot = FakeBot()
+
+    def fill(queue):
+        queue.enqueue('status', priority=PRIORITY_STATUS)
+        queue.enqueue('trade', priority=PRIORITY_TRADE)
+
+    run_queue(bot, fill)
+    assert [text for _, text in bot.sent] == ['trade', 'status']
+
+def test_queued_duplicates_are_coalesced():
+    """Test that only the latest update per coalesce key is sent"""
+    bot = FakeBot()
+
+    def fill(queue):
+        for pnl in (1, 2, 3):
+            queue.enqueue(f'pnl {pnl}', priority=PRIORITY_STATUS, coalesce_key='position:MNTUSDT')
+        queue.enqueue('error', chat_ids=['1', '2'])
+        queue.enqueue('error', chat_ids=['1', '2'])
+
+    run_queue(bot, fill)
+    assert sorted(bot.sent) == [('1', 'error'), ('1', 'pnl 3'), ('2', 'error')]
+
+def test_retry_after_requeues_the_message():
+    """Test that flood control pauses and retries instead of dropping"""
+    bot = FakeBot(flood_first=True)
+    run_queue(bot, lambda queue: queue.enqueue('trade', priority=PRIORITY_TRADE))
+    assert bot.sent == [('1', 'trade')]
+
+def test_progress_is_one_edited_message():
+    """Test that updates with an edit key edit the first message"""
+    class EditingBot(FakeBot):
+        def __init__(self):
+            super().__init__()
+            self.edits = []
+
+        async def send_message(self, chat_id, text, **kwargs):
+            await super().send_message(chat_id, text, **kwargs)
+            return type('Message', (), {'message_id': 42})()
+
+        async def edit_message_text(self, chat_id, message_id, text, **kwargs):
+            self.edits.append((message_id, text))
+
+    bot = EditingBot()
+
+    async def run():
+        queue = NotificationQueue(bot, '1', private_chat_rate=1000)
+        queue.start()
+        queue.enqueue('slice 1/3', edit_key='algo:1')
+        await asyncio.wait_for(queue._idle.wait(), 1)
+        queue.enqueue('slice 2/3', edit_key='algo:1')
+        queue.enqueue('slice 3/3', edit_key='algo:1')
+        await queue.stop(timeout=5)
+
+    asyncio.run(run())
+    assert bot.sent == [('1', 'slice 1/3')]
+    assert bot.edits == [(42, 'slice 3/3')]
@@ -0,0 +1,27 @@
+from modules.order_registry import OrderRegistry, order_link_id, PENDING, PLACED, FAILED
+
+def test_link_ids_are_deterministic_and_short():
+    """Test that the same event and leg always give the same valid orderLinkId"""
+    link_id = order_link_id('https://announcements.bybit.com/en/article/abc/', 'XYZUSDT')
+
+    assert link_id == order_link_id('https://announcements.bybit.com/en/article/abc/', 'XYZUSDT')
+    assert link_id != order_link_id('https://announcements.bybit.com/en/article/abc/', 'MNTUSDT')
+    assert len(link_id) <= 36
+    assert all(c.isalnum() or c in '-_' for c in link_id)
+
+def test_registry_states():
+    """Test that only failed orders may be sent again as new"""
+    registry = OrderRegistry()
+
+    assert registry.begin('a', 'XYZUSDT') is None
+    assert registry.in_flight() == ['a']
+    assert registry.begin('a', 'XYZUSDT')['state'] == PENDING
+
+    registry.resolve('a', PLACED, {'success': True})
+    assert registry.begin('a', 'XYZUSDT')['result'] == {'success': True}
+    assert registry.in_flight() == []
+
+    registry.begin('b', 'MNTUSDT')
+    registry.resolve('b', FAILED)
+    assert registry.begin('b', 'MNTUSDT')['state'] == FAILED
+    assert registry.get('b')['state'] == PENDING
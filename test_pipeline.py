@@ -0,0 +1,297 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from modules.pipeline import AnnouncementPipeline, listing_key
+from modules.notifier import NotificationQueue
+from modules.instruments import InstrumentCache
+from modules.schedule_store import ScheduleStore
+from config.settings import settings
+from utils.metrics import metrics
+
+TRADE_SETTINGS = {'quantity': 5.0, 'stop_loss': 2.0, 'take_profit': 4.0, 'leverage': 1}
+
+class FakeBot:
+    """Records messages instead of calling Telegram"""
+    def __init__(self, events):
+        self.events = events
+
+    async def send_message(self, **kwargs):
+        self.events.append(('message', kwargs['text']))
+
+class FakeMarketData:
+    """Records ticker subscriptions"""
+    def __init__(self):
+        self.streamed = set()
+
+    async def add_symbols(self, symbols):
+        self.streamed |= set(symbols)
+
+class FakeTrader:
+    """Records the order instead of calling Bybit"""
+    symbol = 'MNTUSDT'
+
+    def __init__(self, events, symbols=()):
+        self.events = events
+        self.instruments = InstrumentCache(cache_file='unused.json')
+        for symbol in symbols:
+            self.instruments.instruments[('linear', symbol)] = {'symbol': symbol}
+        self.market_data = FakeMarketData()
+        self.symbols = []
+        self.link_ids = []
+
+    async def execute_trade(self, quantity, stop_loss, take_profit, leverage, symbol=None, template=None,
+                            link_id=None):
+        self.events.append(('order', quantity))
+        self.symbols.append(symbol)
+        self.link_ids.append(link_id)
+        now = time.perf_counter()
+        return {
+            'success': True,
+            'data': {
+                'entry_price': 1.0, 'usdt_value': quantity,
+                'stop_loss': 0.98, 'take_profit': 1.04,
+                'order_sent_at': now, 'order_acked_at': now
+            }
+        }
+
+    async def execute_basket(self, legs):
+        results = []
+        for leg in legs:
+            result = await self.execute_trade(
+                leg['quantity'], leg['stop_loss'], leg['take_profit'], leg['leverage'],
+                symbol=leg['symbol'], link_id=leg['link_id']
+            )
+            results.append(dict(result, symbol=leg['symbol'], prepare_ms=0.1, order_ms=1.0))
+        return results
+
+def test_order_is_placed_before_any_notification():
+    """Test trade-first ordering and latency recording"""
+    events = []
+
+    async def run():
+        notifier = NotificationQueue(FakeBot(events), '1')
+        notifier.start()
+        pipeline = AnnouncementPipeline(FakeTrader(events), notifier, TRADE_SETTINGS)
+        result = await pipeline.handle({'title': 'New Launchpool', 'dateTimestamp': 0})
+        await notifier.stop()
+        return result
+
+    result = asyncio.run(run())
+
+    assert result['success']
+    assert events[0] == ('order', 5.0)
+    assert [kind for kind, _ in events[1:]] == ['message', 'message']
+    assert metrics.percentiles('detect_to_order_ack_ms')
+
+def test_announced_symbol_is_traded():
+    """Test that the parsed symbol reaches the executor, with the configured one as fallback"""
+    trader = FakeTrader([], symbols=['MNTUSDT', 'XYZUSDT'])
+
+    async def run():
+        notifier = NotificationQueue(FakeBot([]), '1', private_chat_rate=1000)
+        notifier.start()
+        pipeline = AnnouncementPipeline(trader, notifier, TRADE_SETTINGS)
+        await pipeline.handle({'title': 'New Listing: XYZUSDT Perpetual Contract', 'dateTimestamp': 0})
+        await pipeline.handle({'title': 'Bybit Launchpool: Stake BTC to Earn NOPE', 'dateTimestamp': 0})
+        await notifier.stop()
+
+    asyncio.run(run())
+
+    assert trader.symbols == ['XYZUSDT', 'MNTUSDT']
+    assert trader.market_data.streamed == {'XYZUSDT', 'MNTUSDT'}
+
+def test_listing_without_a_contract_waits_for_it():
+    """Test that a new listing never falls back to TRADE_SYMBOL and trades once its contract is live"""
+    events = []
+    trader = FakeTrader(events, symbols=['MNTUSDT'])
+    announcement = {'id': 'ann-1', 'title': 'New Listing: XYZUSDT Perpetual Contract', 'dateTimestamp': 0}
+    event = {'type': 'status_change', 'category': 'linear', 'symbol': 'XYZUSDT', 'status': 'Trading', 'previous': 'PreLaunch'}
+
+    async def run():
+        notifier = NotificationQueue(FakeBot(events), '1', private_chat_rate=1000)
+        notifier.start()
+        pipeline = AnnouncementPipeline(trader, notifier, TRADE_SETTINGS)
+        waiting = await pipeline.handle(announcement)
+        orders_before = list(trader.symbols)
+        result = await pipeline.handle_instrument_event(event)
+        await notifier.stop()
+        return waiting, orders_before, result, pipeline
+
+    waiting, orders_before, result, pipeline = asyncio.run(run())
+
+    assert waiting is None and orders_before == []
+    assert result['success'] and trader.symbols == ['XYZUSDT']
+    assert trader.link_ids == [pipeline.link_id({'id': listing_key('XYZUSDT')}, 'XYZUSDT')]
+    assert any(kind == 'message' and 'No contract listed yet' in text for kind, text in events)
+
+def test_non_trading_classes_only_notify():
+    """Test that delistings and maintenance notices are routed to notify-only"""
+    events = []
+
+    async def run():
+        notifier = NotificationQueue(FakeBot(events), '1', private_chat_rate=1000)
+        notifier.start()
+        pipeline = AnnouncementPipeline(FakeTrader(events), notifier, TRADE_SETTINGS)
+        results = [
+            await pipeline.handle({'title': 'Delisting of ABCUSDT Perpetual Contract', 'dateTimestamp': 0}),
+            await pipeline.handle({'title': 'Scheduled maintenance', 'type': {'key': 'maintenance_updates'}})
+        ]
+        await notifier.stop()
+        return results, pipeline.classifier.counts
+
+    results, counts = asyncio.run(run())
+
+    assert results == [None, None]
+    assert [kind for kind, _ in events] == ['message', 'message']
+    assert counts == {'delisting': 1, 'maintenance': 1}
+
+def test_announcements_with_a_trading_start_are_scheduled(monkeypatch, tmp_path):
+    """Test that a future trading start schedules the order instead of sending it"""
+    events = []
+    monkeypatch.setattr(settings, 'SCHEDULE_TRADES', True)
+    trader = FakeTrader(events, symbols=['MNTUSDT', 'XYZUSDT'])
+    start = datetime.now(timezone.utc) + timedelta(days=1)
+
+    async def run():
+        notifier = NotificationQueue(FakeBot(events), '1', private_chat_rate=1000)
+        notifier.start()
+        pipeline = AnnouncementPipeline(trader, notifier, TRADE_SETTINGS,
+                                        schedules=ScheduleStore(tmp_path / 'scheduled.json'))
+        result = await pipeline.handle({
+            'title': 'New Listing: XYZUSDT Perpetual Contract',
+            'description': f"Trading starts {start.strftime('%b %d, %Y, %I:%M %p')} UTC",
+            'dateTimestamp': 0
+        })
+        pending = list(pipeline.scheduler.jobs)
+        await pipeline.scheduler.stop()
+        await notifier.stop()
+        return result, pending
+
+    result, pending = asyncio.run(run())
+
+    assert result['scheduled'] and result['symbol'] == 'XYZUSDT'
+    assert result['scheduled_at'] == int(start.replace(second=0, microsecond=0).timestamp() * 1000)
+    assert len(pending) == 1
+    assert [kind for kind, _ in events] == ['message']
+
+def test_scheduled_trades_survive_a_restart(tmp_path):
+    """Test that pending scheduled trades are registered again and missed ones dropped"""
+    events = []
+    path = tmp_path / 'scheduled.json'
+    trader = FakeTrader(events, symbols=['XYZUSDT'])
+    launch_ms = int(time.time() * 1000) + 86400 * 1000
+    announcement = {'title': 'New Listing: XYZUSDT Perpetual Contract', 'url': 'https://example.com/xyz'}
+
+    async def run(restart):
+        notifier = NotificationQueue(FakeBot(events), '1', private_chat_rate=1000)
+        notifier.start()
+        pipeline = AnnouncementPipeline(trader, notifier, TRADE_SETTINGS, schedules=ScheduleStore(path))
+        if restart:
+            restored = await pipeline.restore_schedules()
+        else:
+            pipeline.schedule_trade(announcement, launch_ms, 'XYZUSDT', ['1'])
+            pipeline.schedules.add('missed', 1000, 'XYZUSDT', announcement)
+            restored = None
+        pending = dict(pipeline.scheduler.jobs)
+        await pipeline.scheduler.stop()
+        await notifier.stop()
+        return restored, pending
+
+    asyncio.run(run(restart=False))
+    restored, pending = asyncio.run(run(restart=True))
+
+    assert restored == 1
+    assert list(pending) == ['https://example.com/xyz']
+    assert pending['https://example.com/xyz']['at_ms'] == launch_ms
+    assert list(ScheduleStore(path).jobs) == ['https://example.com/xyz']
+    assert 'XYZUSDT' in trader.market_data.streamed
+    assert [kind for kind, _ in events] == ['message', 'message']
+
+def test_contract_going_live_is_traded_when_enabled(monkeypatch):
+    """Test that instrument events alert, and trade when TRADE_ON_LISTING is on"""
+    events = []
+    trader = FakeTrader(events)
+    event = {'type': 'status_change', 'category': 'linear', 'symbol': 'NEWUSDT', 'status': 'Trading', 'previous': 'PreLaunch'}
+
+    async def run():
+        notifier = NotificationQueue(FakeBot(events), '1', private_chat_rate=1000)
+        notifier.start()
+        pipeline = AnnouncementPipeline(trader, notifier, TRADE_SETTINGS)
+        await pipeline.handle_instrument_event(event)
+        monkeypatch.setattr(settings, 'TRADE_ON_LISTING', True)
+        await pipeline.handle_instrument_event(event)
+        await notifier.stop()
+
+    asyncio.run(run())
+
+    assert trader.symbols == ['NEWUSDT']
+    assert trader.market_data.streamed == {'NEWUSDT'}
+    assert any(kind == 'message' and 'PreLaunch → Trading' in text for kind, text in events)
+
+def test_listing_is_entered_under_one_link_id(monkeypatch):
+    """Test that the announcement and the contract going live share the orderLinkId"""
+    monkeypatch.setattr(settings, 'TRADE_ON_LISTING', True)
+    trader = FakeTrader([], symbols=['XYZUSDT'])
+    event = {'type': 'status_change', 'category': 'linear', 'symbol': 'XYZUSDT', 'status': 'Trading', 'previous': 'PreLaunch'}
+
+    async def run():
+        notifier = NotificationQueue(FakeBot([]), '1', private_chat_rate=1000)
+        notifier.start()
+        pipeline = AnnouncementPipeline(trader, notifier, TRADE_SETTINGS)
+        await pipeline.handle({'id': 'ann-2', 'title': 'New Listing: XYZUSDT Perpetual Contract', 'dateTimestamp': 0})
+        await pipeline.handle_instrument_event(event)
+        await notifier.stop()
+
+    asyncio.run(run())
+
+    assert trader.symbols == ['XYZUSDT', 'XYZUSDT']
+    assert trader.link_ids[0] == trader.link_ids[1]
+
+def test_failed_basket_without_data_is_reported():
+    """Test that a basket whose every leg failed (data None) still reports"""
+    events = []
+    trader = FakeTrader(events, symbols=['XYZUSDT'])
+
+    async def execute_basket(legs):
+        return [{'symbol': leg['symbol'], 'success': False, 'error': 'Insufficient balance', 'data': None}
+                for leg in legs]
+    trader.execute_basket = execute_basket
+
+    async def run():
+        notifier = NotificationQueue(FakeBot(events), '1', private_chat_rate=1000)
+        notifier.start()
+        pipeline = AnnouncementPipeline(trader, notifier, TRADE_SETTINGS)
+        result = await pipeline.execute_basket({'title': 'Listing'}, time.perf_counter(), None, ['XYZUSDT', 'MNTUSDT'])
+        await notifier.stop()
+        return result
+
+    result = asyncio.run(run())
+
+    assert not result['success'] and result['data'] is None
+    assert any(kind == 'message' and '0/2 legs' in text for kind, text in events)
+
+if __name__ == "__main__":
+    test_order_is_placed_before_any_notification()
+
+def test_basket_symbols_are_traded_with_the_announced_one(monkeypatch):
+    """Test that BASKET_SYMBOLS adds legs and the result is reported per leg"""
+    events = []
+    monkeypatch.setattr(settings, 'BASKET_SYMBOLS', ['MNTUSDT'])
+    monkeypatch.setattr(settings, 'SCHEDULE_TRADES', False)
+
+    async def run():
+        notifier = NotificationQueue(FakeBot(events), '1')
+        notifier.start()
+        trader = FakeTrader(events, symbols=['XYZUSDT'])
+        pipeline = AnnouncementPipeline(trader, notifier, TRADE_SETTINGS)
+        result = await pipeline.handle({'title': 'Bybit Launchpool: Stake MNT to earn XYZ', 'dateTimestamp': 0})
+        await notifier.stop()
+        return trader, result
+
+    trader, result = asyncio.run(run())
+
+    assert result['success']
+    assert trader.symbols == ['XYZUSDT', 'MNTUSDT']
+    assert [leg['symbol'] for leg in result['legs']] == ['XYZUSDT', 'MNTUSDT']
+    basket_message = next(text for kind, text in events if kind == 'message' and 'Basket' in text)
+    assert '2/2 legs' in basket_message and 'XYZUSDT' in basket_message
@@ -0,0 +1,111 @@
+import asyncio
+import random
+from datetime import datetime, timezone
+from modules.poll_scheduler import AdaptivePollScheduler
+
+QUIET = datetime(2024, 1, 1, 20, 0, tzinfo=timezone.utc)
+ACTIVE = datetime(2024, 1, 1, 9, 30, tzinfo=timezone.utc)
+
+def make_scheduler(**kwargs):
+    options = dict(
+        interval=30, active_interval=5, min_interval=1, max_interval=300, jitter=0,
+        active_windows=['08:00-12:00', '23:00-01:00'], min_headroom=0.2, pollers=2
+    )
+    options.update(kwargs)
+    return AdaptivePollScheduler(**options)
+
+def test_active_windows_tighten_the_interval():
+    """Test the interval inside and outside the active windows"""
+    scheduler = make_scheduler()
+
+    assert scheduler.next_delay(QUIET) == 30
+    assert scheduler.next_delay(ACTIVE) == 5
+    assert scheduler.in_active_window(datetime(2024, 1, 1, 0, 30, tzinfo=timezone.utc))
+
+def test_errors_back_off_and_recover():
+    """Test exponential backoff capped at max_interval"""
+    scheduler = make_scheduler()
+    scheduler.observe_response(429, {})
+    assert scheduler.next_delay(QUIET) == 60
+
+    for _ in range(10):
+        scheduler.record_error()
+    assert scheduler.next_delay(QUIET) == 300
+
+    scheduler.observe_response(200, {})
+    assert scheduler.next_delay(QUIET) == 300
+    scheduler.record_success()
+    assert scheduler.next_delay(QUIET) == 30
+
+def test_errors_are_counted_per_feed():
+    """Test that 5xx and retCode errors build up and another feed's success doesn't reset them"""
+    scheduler = make_scheduler()
+    scheduler.observe_response(503, {}, 'zh-TW')
+    scheduler.record_error('zh-TW')
+    scheduler.observe_response(200, {}, 'en-US')
+    scheduler.record_success('en-US')
+
+    assert scheduler.errors == 2
+    assert scheduler.next_delay(QUIET) == 120
+
+    scheduler.record_success('zh-TW')
+    assert scheduler.next_delay(QUIET) == 30
+
+def test_low_headroom_waits_for_the_reset():
+    """Test that the rate-limit headers push the next poll after the reset"""
+    scheduler = make_scheduler()
+    scheduler.observe_response(200, {
+        'X-Bapi-Limit': '600',
+        'X-Bapi-Limit-Status': '50',
+        'X-Bapi-Limit-Reset-Timestamp': '1000000'
+    })
+
+    assert scheduler.next_delay(ACTIVE, wall_time=960) == 40
+
+    scheduler.observe_response(200, {'X-Bapi-Limit': '600', 'X-Bapi-Limit-Status': '500'})
+    assert scheduler.next_delay(ACTIVE, wall_time=960) == 5
+
+def test_jitter_stays_within_bounds():
+    """Test the jitter fraction"""
+    scheduler = make_scheduler(jitter=0.1, rng=random.Random(1))
+    delays = [scheduler.next_delay(QUIET) for _ in range(100)]
+
+    assert all(27 <= delay <= 33 for delay in delays)
+    assert len(set(delays)) > 1
+
+def test_slow_polls_overlap_up_to_the_poller_count():
+    """Test that a slow poll doesn't delay the next one"""
+    scheduler = make_scheduler(interval=0.01, active_windows=[], min_interval=0.01)
+    started = []
+
+    async def poll():
+        started.append(scheduler.in_flight)
+        await asyncio.sleep(1)
+
+    async def run():
+        scheduler.start(poll)
+        await asyncio.sleep(0.1)
+        await scheduler.stop()
+
+    asyncio.run(run())
+
+    assert started == [1, 2]
+
+def test_pollers_are_staggered_over_the_interval():
+    """Test that N pollers together poll every interval / N"""
+    scheduler = make_scheduler(interval=0.2, active_windows=[], min_interval=0.01, pollers=4)
+    started = []
+
+    async def poll():
+        started.append(asyncio.get_running_loop().time())
+
+    async def run():
+        scheduler.start(poll)
+        await asyncio.sleep(0.52)
+        await scheduler.stop()
+
+    asyncio.run(run())
+
+    gaps = [b - a for a, b in zip(started, started[1:])]
+    assert len(started) >= 9
+    assert all(0.03 <= gap <= 0.07 for gap in gaps)
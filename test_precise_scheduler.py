@@ -0,0 +1,65 @@
+import asyncio
+import time
+from modules.launch_times import parse_launch_time, parse_times
+from modules.precise_scheduler import PreciseScheduler
+from utils.clock import ServerClock
+
+NOW_MS = 1736000000000  # 2025-01-04 14:13:20 UTC
+
+def test_parse_times_formats():
+    """Test the supported date-time formats"""
+    expected = 1736503200000  # 2025-01-10 10:00 UTC
+
+    assert parse_times('Trading starts Jan 10, 2025, 10:00AM UTC') == [(expected, True)]
+    assert parse_times('Spot trading: 10:00 AM UTC on January 10th, 2025') == [(expected, True)]
+    assert parse_times('2025-01-10 10:00 UTC') == [(expected, False)]
+
+def test_hour_only_times_need_am_pm():
+    """Test "10AM UTC" style times and that bare numbers are not read as times"""
+    expected = 1736503200000  # 2025-01-10 10:00 UTC
+
+    assert parse_times('Trading starts Jan 10, 2025, 10AM UTC') == [(expected, True)]
+    assert parse_times('Listing at 10 a.m. UTC on Jan 10, 2025') == [(expected, True)]
+    assert parse_times('Deposits open Jan 10, 2025, 12PM (UTC)') == [(expected + 2 * 3600 * 1000, True)]
+    assert parse_times('Trading opens Jan 10, 2025 12 am UTC') == [(expected - 10 * 3600 * 1000, True)]
+    assert parse_times('Top 5 on Jan 10, 2025') == []
+    assert parse_times('Jan 10, 2025, 10 amazing prizes') == []
+
+def test_trading_start_wins_over_other_times():
+    """Test that a time introduced by trading wording is preferred"""
+    announcement = {
+        'title': 'Bybit Launchpool: Stake MNT to earn XYZ',
+        'description': 'Staking ends Jan 8, 2025 10:00 UTC. Trading opens Jan 12, 2025 08:00 UTC.'
+    }
+
+    assert parse_launch_time(announcement, now_ms=NOW_MS) == 1736668800000
+
+def test_past_and_far_times_are_ignored():
+    """Test the scheduling horizon"""
+    announcement = {'title': 'Listing on Jan 1, 2025 10:00 UTC and Mar 1, 2025 10:00 UTC'}
+
+    assert parse_launch_time(announcement, now_ms=NOW_MS) is None
+
+def test_prepare_then_fire_on_time():
+    """Test that prepare runs first and fire is on time within the spin window"""
+    events = []
+    clock = ServerClock()
+
+    async def prepare():
+        events.append('prepare')
+
+    async def fire(target_perf):
+        events.append(('fire', (time.perf_counter() - target_perf) * 1000))
+
+    async def run():
+        scheduler = PreciseScheduler(prewarm_lead=0.05, spin_ms=2, clock=clock)
+        scheduler.schedule(clock.now_ms() + 100, fire, prepare)
+        await asyncio.sleep(0.2)
+        return scheduler.jobs
+
+    jobs = asyncio.run(run())
+
+    assert events[0] == 'prepare'
+    assert events[1][0] == 'fire'
+    assert 0 <= events[1][1] < 5
+    assert jobs == {}
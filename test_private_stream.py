@@ -0,0 +1,46 @@
+import asyncio
+from modules.private_stream import PrivateStream
+
+def position(size, stop_loss='0.60', symbol='MNTUSDT'):
+    return {'symbol': symbol, 'positionIdx': 0, 'side': 'Buy', 'size': size,
+            'entryPrice': '0.65', 'markPrice': '0.66', 'stopLoss': stop_loss, 'takeProfit': '0.70'}
+
+def test_stream_updates_produce_change_events():
+    """Test open, TP/SL change and close detection from stream messages"""
+    events = []
+
+    async def on_event(event):
+        events.append((event['type'], event.get('change')))
+
+    async def run():
+        stream = PrivateStream(on_event, api_key='key', api_secret='secret')
+        await stream.handle_message({'topic': 'position', 'data': [position('10')]})
+        # Mark price only: not a change worth reporting
+        await stream.handle_message({'topic': 'position', 'data': [dict(position('10'), markPrice='0.67')]})
+        await stream.handle_message({'topic': 'position', 'data': [position('10', stop_loss='0.62')]})
+        await stream.handle_message({'topic': 'execution', 'data': [{'execType': 'Trade'}]})
+        await stream.handle_message({'topic': 'position', 'data': [position('0')]})
+        return stream
+
+    stream = asyncio.run(run())
+
+    assert events == [
+        ('position', 'opened'),
+        ('position', 'tpsl'),
+        ('execution', None),
+        ('position', 'closed'),
+    ]
+    assert stream.book.open_positions() == []
+
+def test_reconcile_detects_missed_changes():
+    """Test that REST reconciliation catches what the stream missed"""
+    stream = PrivateStream(None, api_key='key', api_secret='secret')
+    stream.book.seed([position('10'), position('5', symbol='BTCUSDT')])
+
+    events = stream.reconcile([position('12')])
+
+    assert [(e['change'], e['position']['symbol']) for e in events] == [
+        ('resized', 'MNTUSDT'),
+        ('closed', 'BTCUSDT'),
+    ]
+    assert stream.reconcile([position('12')]) == []
@@ -0,0 +1,81 @@
+import time
+from modules.announcements import LaunchpoolAnnouncements, parse_feeds
+from modules.seen_index import SeenIndex
+
+DAY_MS = 24 * 3600 * 1000
+# Announcement dates are relative to now, the retention window follows the server clock
+NOW_MS = int(time.time() * 1000)
+
+def response(*announcements):
+    return {'retCode': 0, 'result': {'list': list(announcements)}}
+
+def announcement(slug, date_ms):
+    return {'title': slug, 'url': f'https://announcements.bybit.com/en/article/{slug}/', 'dateTimestamp': NOW_MS + date_ms}
+
+def test_first_poll_seeds_without_signals(tmp_path):
+    """Test that announcements already published at first start are not traded"""
+    announcements = LaunchpoolAnnouncements(seen_index=SeenIndex(tmp_path / 'seen.log'))
+
+    assert announcements._process_response(response(announcement('old', 1000))) == []
+    assert announcements._process_response(response(announcement('old', 1000))) == []
+
+def test_every_new_announcement_is_returned_oldest_first(tmp_path):
+    """Test that several announcements between two polls are all detected"""
+    announcements = LaunchpoolAnnouncements(seen_index=SeenIndex(tmp_path / 'seen.log'))
+    announcements._process_response(response(announcement('old', 1000)))
+
+    new = announcements._process_response(response(
+        announcement('b', 3000), announcement('a', 2000), announcement('old', 1000)
+    ))
+
+    assert [a['title'] for a in new] == ['a', 'b']
+
+def test_restart_neither_repeats_nor_misses(tmp_path):
+    """Test that the index survives a restart"""
+    path = tmp_path / 'seen.log'
+    first = LaunchpoolAnnouncements(seen_index=SeenIndex(path))
+    first._process_response(response(announcement('old', 1000)))
+    first._process_response(response(announcement('a', 2000), announcement('old', 1000)))
+    first.seen.close()
+
+    restarted = LaunchpoolAnnouncements(seen_index=SeenIndex(path))
+    new = restarted._process_response(response(
+        announcement('b', 3000), announcement('a', 2000), announcement('old', 1000)
+    ))
+
+    assert [a['title'] for a in new] == ['b']
+
+def test_compaction_drops_entries_behind_the_watermark(tmp_path):
+    """Test that entries older than the retention window are compacted away"""
+    path = tmp_path / 'seen.log'
+    index = SeenIndex(path, retention_days=1)
+    index.add([announcement('old', -3 * DAY_MS), announcement('new', 0)])
+    index.close()
+
+    reloaded = SeenIndex(path, retention_days=1)
+
+    assert len(reloaded) == 1
+    assert not reloaded.is_new(announcement('old', -3 * DAY_MS))
+    assert path.read_text().count('\n') == 1
+
+def test_feeds_are_seeded_separately_and_deduplicated(tmp_path):
+    """Test that a feed added later is seeded and shared announcements are yielded once"""
+    announcements = LaunchpoolAnnouncements(seen_index=SeenIndex(tmp_path / 'seen.log'))
+    announcements._process_response(response(announcement('old', 1000)), 'en-US//Launchpool')
+
+    assert announcements._process_response(response(announcement('zh', 1500)), 'zh-TW//Launchpool') == []
+
+    shared = announcement('shared', 2000)
+    first = announcements._process_response(response(shared), 'en-US//Launchpool')
+    second = announcements._process_response(response(dict(shared)), 'zh-TW//Launchpool')
+
+    assert [a['title'] for a in first] == ['shared']
+    assert second == []
+
+def test_parse_feeds():
+    """Test locale/type/tag feed specs"""
+    feeds = parse_feeds(['en-US//Launchpool', 'en-US/new_crypto/', 'zh-TW'])
+
+    assert feeds[0] == {'name': 'en-US//Launchpool', 'locale': 'en-US', 'type': None, 'tag': 'Launchpool'}
+    assert feeds[1]['type'] == 'new_crypto' and feeds[1]['tag'] is None
+    assert feeds[2]['locale'] == 'zh-TW'
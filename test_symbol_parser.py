@@ -0,0 +1,56 @@
+import json
+from pathlib import Path
+from modules.instruments import InstrumentCache
+from modules.symbol_parser import SymbolParser
+
+CORPUS = Path(__file__).parent / 'fixtures' / 'announcements_corpus.jsonl'
+
+UNIVERSE = [
+    'MNTUSDT', 'BTCUSDT', 'SOLUSDT', 'XYZUSDT', 'ABCUSDT', 'ZETAUSDT', 'PEPEUSDT', 'DEFUSDT',
+    'GHIUSDT', '1000BONKUSDT', 'JKLUSDT', 'OMNIUSDT', 'MNOUSDT', 'PQRUSDT', 'ETHUSDT', 'TONUSDT'
+]
+
+def load_corpus():
+    with open(CORPUS) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def make_parser(symbols=UNIVERSE):
+    cache = InstrumentCache(cache_file='unused.json')
+    for symbol in symbols:
+        cache.instruments[('linear', symbol)] = {'symbol': symbol}
+    return SymbolParser(cache)
+
+def test_corpus():
+    """Test the ranked symbol of every corpus announcement"""
+    parser = make_parser()
+
+    for item in load_corpus():
+        assert parser.parse(item) == item['expected'], item['title']
+
+def test_candidates_outside_the_universe_are_dropped():
+    """Test validation against the instrument cache"""
+    parser = make_parser(['MNTUSDT'])
+
+    ranked = parser.rank({'title': 'Bybit Lists XYZ with MNT Rewards'})
+
+    assert ranked == [('MNTUSDT', 0.3)]
+
+def test_staked_assets_are_never_candidates():
+    """Test that only the earned token of a stake phrase is ranked"""
+    parser = make_parser()
+
+    assert parser.rank({'title': 'Bybit Launchpool: Stake BTC, ETH and MNT to earn QRS'}) == []
+    assert parser.rank({'title': 'Launchpool: Stake TON to Earn NEWCOIN',
+                        'description': 'TON holders can join from today.'}) == []
+    assert parser.rank({'title': 'Bybit Launchpool: Stake BTC and MNT to earn DEF'}) == [('DEFUSDT', 0.9)]
+    assert parser.candidates('Stake MNT, USDT and XYZ to Earn XYZ') == {'XYZ': 0.9}
+
+def test_universe_follows_cache_reloads():
+    """Test that newly cached instruments become tradable"""
+    parser = make_parser(['MNTUSDT'])
+    announcement = {'title': 'New Listing: XYZUSDT Perpetual Contract'}
+    assert parser.parse(announcement) is None
+
+    parser.instruments.instruments[('linear', 'XYZUSDT')] = {'symbol': 'XYZUSDT'}
+
+    assert parser.parse(announcement) == 'XYZUSDT'
@@ -38,7 +38,7 @@ def test_bybit_connection():
         test_message += f"🎯 Trading Symbol: {symbol}\n"
         
         # Market data check
-        ticker = trader.session.get_tickers(
+        ticker = trader.client.get_tickers(
             category="linear",
             symbol=symbol
         )
@@ -0,0 +1,94 @@
+import threading
+import time
+from collections import deque
+from utils.logger import setup_logger
+from utils.metrics import metrics
+
+logger = setup_logger('clock')
+
+class ServerClock:
+    """Bybit server time estimated from /v5/market/time round trips
+
+    Each sample gives offset = server - local midpoint and the round-trip time.
+    As in NTP's clock filter, the offset of the lowest-RTT sample among the
+    recent ones is used: its midpoint error is bounded by RTT/2 and it is the
+    least affected by queueing delay.
+    """
+
+    def __init__(self, window=8):
+        self.samples = deque(maxlen=window)
+        self.offset_ms = 0.0
+        self.rtt_ms = None
+        self.synced_at = None
+        self.client = None
+        self._lock = threading.Lock()
+
+    def bind(self, client):
+        """Attach the pybit client used for time requests"""
+        self.client = client
+
+    def add_sample(self, sent_ms, server_ms, received_ms):
+        """Record one round trip (local send/receive times and the server time)"""
+        rtt = received_ms - sent_ms
+        offset = server_ms - (sent_ms + received_ms) / 2
+
+        with self._lock:
+            self.samples.append((rtt, offset))
+            best_rtt, best_offset = min(self.samples)
+            self.offset_ms = best_offset
+            self.rtt_ms = best_rtt
+            self.synced_at = time.monotonic()
+
+        metrics.set_gauge('clock_skew_ms', round(self.offset_ms, 2))
+        metrics.set_gauge('clock_rtt_ms', round(self.rtt_ms, 2))
+        return offset
+
+    def sample(self):
+        """Take one server time sample"""
+        sent_ms = time.time() * 1000
+        response = self.client.get_server_time()
+        received_ms = time.time() * 1000
+
+        result = response.get('result', {})
+        if result.get('timeNano'):
+            server_ms = int(result['timeNano']) / 1e6
+        else:
+            server_ms = int(result['timeSecond']) * 1000
+        return self.add_sample(sent_ms, server_ms, received_ms)
+
+    def sync(self, samples=4):
+        """Take a burst of samples, return the offset estimate or None"""
+        if self.client is None:
+            logger.error("Server clock has no client bound")
+            return None
+
+        try:
+            for _ in range(samples):
+                self.sample()
+            logger.info(f"Clock offset {self.offset_ms:.1f} ms (rtt {self.rtt_ms:.1f} ms)")
+            return self.offset_ms
+
+        except Exception as e:
+            logger.error(f"Clock sync error: {str(e)}")
+            return None
+
+    def now_ms(self):
+        """Estimated server time in ms"""
+        return time.time() * 1000 + self.offset_ms
+
+    def now(self):
+        """Estimated server time in seconds"""
+        return self.now_ms() / 1000
+
+    def install(self):
+        """Sign pybit requests with server-anchored timestamps"""
+        try:
+            from pybit import _helpers
+            _helpers.generate_timestamp = lambda: int(self.now_ms())
+            return True
+        except Exception as e:
+            logger.error(f"Could not patch pybit timestamps: {str(e)}")
+            return False
+
+# Shared in-process instance
+server_clock = ServerClock()
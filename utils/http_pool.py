@@ -0,0 +1,56 @@
+from urllib.parse import urlsplit
+from requests.adapters import HTTPAdapter
+from utils.logger import setup_logger
+from utils.metrics import metrics
+
+logger = setup_logger('http')
+
+class PathTimeoutAdapter(HTTPAdapter):
+    """HTTPAdapter that overrides the caller's timeout for some URL path prefixes"""
+
+    def __init__(self, path_timeouts=None, **kwargs):
+        self.path_timeouts = path_timeouts or {}
+        super().__init__(**kwargs)
+
+    def send(self, request, timeout=None, **kwargs):
+        path = urlsplit(request.url).path
+        for prefix, seconds in self.path_timeouts.items():
+            if path.startswith(prefix):
+                timeout = seconds
+                break
+        return super().send(request, timeout=timeout, **kwargs)
+
+def configure_session(session, pool_size=10, path_timeouts=None):
+    """Give a requests session a bounded keep-alive pool and per-call timing logs
+
+    path_timeouts maps path prefixes to timeouts in seconds, e.g. short ones
+    for order endpoints whose retries are safe.
+    """
+    adapter = PathTimeoutAdapter(
+        path_timeouts=path_timeouts,
+        pool_connections=4,
+        pool_maxsize=pool_size,
+        pool_block=True  # Wait for a free connection instead of opening extra ones
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers['Connection'] = 'keep-alive'
+
+    def log_timing(response, *args, **kwargs):
+        elapsed_ms = response.elapsed.total_seconds() * 1000
+        path = urlsplit(response.url).path
+        metrics.observe('http_request_ms', elapsed_ms)
+
+        try:
+            pool = adapter.poolmanager.connection_from_url(response.url)
+            opened, requests_made = pool.num_connections, pool.num_requests
+        except Exception:
+            opened, requests_made = '?', '?'
+
+        logger.info(
+            f"{response.request.method} {path} {response.status_code} in {elapsed_ms:.1f} ms "
+            f"(connections opened: {opened}, requests: {requests_made})"
+        )
+
+    session.hooks['response'].append(log_timing)
+    return session
@@ -0,0 +1,59 @@
+import threading
+from collections import deque, defaultdict
+
+class Metrics:
+    """Small in-process metrics registry (counters, gauges and latency samples)"""
+
+    def __init__(self, max_samples=1000):
+        self.max_samples = max_samples
+        self._lock = threading.Lock()
+        self.counters = defaultdict(int)
+        self.gauges = {}
+        self.samples = defaultdict(lambda: deque(maxlen=self.max_samples))
+
+    def incr(self, name, value=1):
+        """Increment a counter"""
+        with self._lock:
+            self.counters[name] += value
+
+    def set_gauge(self, name, value):
+        """Set a gauge to its current value"""
+        with self._lock:
+            self.gauges[name] = value
+
+    def observe(self, name, value):
+        """Record a sample (e.g. a latency in ms)"""
+        with self._lock:
+            self.samples[name].append(value)
+
+    def percentiles(self, name, points=(50, 95, 99)):
+        """Return the requested percentiles of a sample series"""
+        with self._lock:
+            values = sorted(self.samples.get(name, ()))
+
+        if not values:
+            return {}
+
+        result = {}
+        for point in points:
+            index = min(len(values) - 1, int(round(point / 100 * (len(values) - 1))))
+            result[f'p{point}'] = values[index]
+        return result
+
+    def snapshot(self):
+        """Return all metrics as a plain dict"""
+        with self._lock:
+            names = list(self.samples.keys())
+            data = {
+                'counters': dict(self.counters),
+                'gauges': dict(self.gauges),
+            }
+
+        data['samples'] = {
+            name: dict(self.percentiles(name), count=len(self.samples[name]))
+            for name in names
+        }
+        return data
+
+# Global metrics instance
+metrics = Metrics()